@@ -0,0 +1,467 @@
+"""
+asyncio 시리얼 트랜스포트 모듈
+여러 장비(리그)와 대시보드를 한 프로세스의 이벤트 루프에서 함께 돌리기 위한 asyncio 방식 통신 클래스입니다.
+수신/송신/Heartbeat/재전송 스레드 대신 이벤트 루프가 시리얼 fd를 직접 감시(loop.add_reader)합니다.
+
+- SerialTransport: 시리얼 포트를 asyncio.Transport로 감싼 클래스 (읽기 가능 알림 → protocol.data_received)
+- FrameProtocol: 수신 바이트를 ProtocolHandler 디코더로 프레임 단위로 나누는 asyncio.Protocol
+- AsyncProtocolClient: await request(cmd, data), async for 상태응답 수신, 비동기 Heartbeat 태스크
+
+fd 감시를 지원하지 않는 환경(Windows Proactor 루프 등)에서는 읽기 스레드 하나가 SerialReceiver로 읽어
+call_soon_threadsafe로 이벤트 루프에 넘깁니다.
+
+사용 예:
+    client = await AsyncProtocolClient.open('/dev/ttyUSB0', 9600)
+    client.start_heartbeat({0xF0: 5.0, 0xF1: 5.0})
+    response = await client.request(0xB1, bytes([30, 55, 60, 0, 10]))
+    async for frame, status in client.status_updates(0xF0):
+        print(status['sensor_data']['cold_temp'])
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+
+import serial
+
+from communication import ProtocolHandler
+from poll_clock import PollClock
+from retransmit import RetryPolicy, DEFAULT_POLICIES
+from serial_receiver import SerialReceiver
+from status_schema import SCHEMAS
+
+
+class SerialTransport(asyncio.Transport):
+    """시리얼 포트 asyncio 트랜스포트 (POSIX: add_reader/add_writer, 그 외: 읽기 스레드)"""
+    
+    def __init__(self, loop, port, protocol):
+        """
+        Args:
+            loop: 이벤트 루프
+            port: 열린 serial.Serial 객체 (timeout=0)
+            protocol: asyncio.Protocol
+        """
+        super().__init__(extra={'serial': port})
+        self._loop = loop
+        self._port = port
+        self._protocol = protocol
+        self._write_buffer = bytearray()
+        self._closing = False
+        self._reading = True
+        self._thread = None
+        
+        self._fd = None
+        try:
+            self._fd = port.fileno()
+        except (AttributeError, OSError, NotImplementedError, serial.SerialException):
+            self._fd = None
+        
+        loop.call_soon(protocol.connection_made, self)
+        if self._fd is not None and self._add_reader():
+            return
+        
+        # fd 감시를 사용할 수 없으면 읽기 스레드로 대체
+        self._fd = None
+        self._thread = threading.Thread(target=self._read_worker, daemon=True)
+        self._thread.start()
+    
+    def _add_reader(self):
+        """fd 읽기 감시 등록 (지원하지 않는 이벤트 루프면 False)"""
+        try:
+            self._loop.add_reader(self._fd, self._on_readable)
+            return True
+        except NotImplementedError:
+            return False
+    
+    def _on_readable(self):
+        """fd 읽기 가능 (이벤트 루프에서 호출)"""
+        try:
+            data = os.read(self._fd, 4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            self._fatal_error(e)
+            return
+        if not data:
+            # 읽기 가능하다고 했는데 데이터가 없음 → 장치 분리
+            self._fatal_error(serial.SerialException("장치가 읽기 준비 상태를 알렸지만 데이터가 없습니다"))
+            return
+        self._protocol.data_received(data)
+    
+    def _read_worker(self):
+        """읽기 스레드 (fd 감시를 사용할 수 없는 환경)"""
+        receiver = SerialReceiver(self._port, timeout=0.1)
+        while not self._closing:
+            try:
+                data = receiver.read()
+            except Exception as e:
+                self._loop.call_soon_threadsafe(self._fatal_error, e)
+                return
+            if data is not None and self._reading:
+                self._loop.call_soon_threadsafe(self._protocol.data_received, bytes(data))
+    
+    def write(self, data):
+        """데이터 전송 (다 쓰지 못한 나머지는 쓰기 가능해질 때 이어서 전송)"""
+        if self._closing or not data:
+            return
+        if self._fd is None:
+            self._port.write(data)
+            return
+        
+        if not self._write_buffer:
+            try:
+                written = os.write(self._fd, data)
+            except (BlockingIOError, InterruptedError):
+                written = 0
+            except OSError as e:
+                self._fatal_error(e)
+                return
+            if written == len(data):
+                return
+            data = memoryview(data)[written:]
+            self._loop.add_writer(self._fd, self._on_writable)
+        self._write_buffer += data
+    
+    def _on_writable(self):
+        """fd 쓰기 가능 (버퍼에 남은 데이터 전송)"""
+        try:
+            written = os.write(self._fd, self._write_buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            self._fatal_error(e)
+            return
+        del self._write_buffer[:written]
+        if not self._write_buffer:
+            self._loop.remove_writer(self._fd)
+            if self._closing:
+                self._finish_close(None)
+    
+    def get_write_buffer_size(self):
+        return len(self._write_buffer)
+    
+    def pause_reading(self):
+        if self._reading:
+            self._reading = False
+            if self._fd is not None:
+                self._loop.remove_reader(self._fd)
+    
+    def resume_reading(self):
+        if not self._reading and not self._closing:
+            self._reading = True
+            if self._fd is not None:
+                self._loop.add_reader(self._fd, self._on_readable)
+    
+    def is_reading(self):
+        return self._reading
+    
+    def is_closing(self):
+        return self._closing
+    
+    def close(self):
+        """트랜스포트 닫기 (남은 송신 데이터는 보낸 뒤 닫음)"""
+        if self._closing:
+            return
+        self._closing = True
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+        if not self._write_buffer:
+            self._loop.call_soon(self._finish_close, None)
+    
+    def abort(self):
+        self._fatal_error(None)
+    
+    def _fatal_error(self, exc):
+        """오류로 즉시 닫기"""
+        self._closing = True
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            self._loop.remove_writer(self._fd)
+        self._write_buffer.clear()
+        self._loop.call_soon(self._finish_close, exc)
+    
+    def _finish_close(self, exc):
+        if self._port is None:
+            return
+        try:
+            self._port.close()
+        finally:
+            self._port = None
+            self._protocol.connection_lost(exc)
+
+
+class FrameProtocol(asyncio.Protocol):
+    """수신 바이트를 프레임 단위로 나누어 frame_received 콜백으로 전달하는 프로토콜"""
+    
+    def __init__(self, frame_received, connection_lost=None):
+        """
+        Args:
+            frame_received: 프레임 수신 콜백 (Frame 또는 FrameError)
+            connection_lost: 연결 종료 콜백 (예외 또는 None)
+        """
+        self.handler = ProtocolHandler()
+        self.transport = None
+        self._frame_received = frame_received
+        self._connection_lost = connection_lost
+        self.closed = None  # 연결 종료 시 완료되는 Future (connection_made에서 생성)
+    
+    def connection_made(self, transport):
+        self.transport = transport
+        self.closed = asyncio.get_running_loop().create_future()
+    
+    def data_received(self, data):
+        arrival = time.monotonic_ns()
+        for frame in self.handler.process_received_data(data):
+            if not frame.is_error:
+                frame.timestamp = arrival
+            self._frame_received(frame)
+    
+    def connection_lost(self, exc):
+        if self.closed is not None and not self.closed.done():
+            self.closed.set_result(exc)
+        if self._connection_lost is not None:
+            self._connection_lost(exc)
+
+
+async def open_serial_connection(protocol_factory, port, baudrate=9600):
+    """
+    시리얼 포트를 열고 (transport, protocol) 반환 (loop.create_connection과 같은 형태)
+    
+    Args:
+        protocol_factory: asyncio.Protocol 생성 함수
+        port: 포트 이름 (예: 'COM3', '/dev/ttyUSB0')
+        baudrate: 통신 속도
+    """
+    loop = asyncio.get_running_loop()
+    serial_port = serial.Serial(
+        port=port,
+        baudrate=int(baudrate),
+        bytesize=serial.EIGHTBITS,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        timeout=0
+    )
+    protocol = protocol_factory()
+    transport = SerialTransport(loop, serial_port, protocol)
+    await asyncio.sleep(0)  # connection_made 호출 대기
+    return transport, protocol
+
+
+class AsyncProtocolClient:
+    """asyncio 방식 프로토콜 클라이언트 (장비 1대)"""
+    
+    QUEUE_SIZE = 64     # 구독자별 수신 대기 프레임 수 (가득 차면 가장 오래된 프레임을 버림)
+    
+    def __init__(self, policies=None):
+        """
+        Args:
+            policies: CMD별 재전송 정책 (기본값: retransmit.DEFAULT_POLICIES)
+        """
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.poll_rates = {0xF0: 5.0, 0xF1: 5.0, 0xF2: 0.0}  # 상태조회 CMD별 전송 주기 (Hz, F2는 펌웨어 미응답으로 기본 꺼짐)
+        self.poll_stagger = 0.1  # CMD별 첫 전송 간격 (같은 시점에 몰리지 않도록 분산)
+        self.poll_clock = PollClock(self.poll_stagger)  # 상태조회 예정 시각 격자 / 지터 통계
+        self.transport = None
+        self.protocol = None
+        self._pending = {}          # 응답 CMD → 응답 대기 Future (deque, 먼저 보낸 순서)
+        self._subscribers = []      # (CMD 집합 또는 None, asyncio.Queue)
+        self._heartbeat_task = None
+        self.error_count = 0
+    
+    @classmethod
+    async def open(cls, port, baudrate=9600, **kwargs):
+        """포트를 열고 연결된 클라이언트 반환"""
+        client = cls(**kwargs)
+        client.transport, client.protocol = await open_serial_connection(
+            lambda: FrameProtocol(client._on_frame, client._on_connection_lost), port, baudrate)
+        return client
+    
+    @property
+    def is_connected(self):
+        return self.transport is not None and not self.transport.is_closing()
+    
+    def send(self, cmd, data_field=None, tx_id=None):
+        """패킷 한 번 전송 (응답을 기다리지 않음)"""
+        if not self.is_connected:
+            raise ConnectionError("연결되지 않음")
+        handler = self.protocol.handler
+        self.transport.write(bytes(handler.create_packet(handler.PC_ID if tx_id is None else tx_id, cmd, data_field)))
+    
+    async def request(self, cmd, data_field=None, timeout=None, retry=True, tx_id=None, policy=None):
+        """
+        요청 전송 후 응답 Frame 반환 (응답이 없으면 CMD 재전송 정책에 따라 재전송)
+        
+        Args:
+            cmd: CMD 값
+            data_field: 데이터 필드 (bytes 또는 None)
+            timeout: 응답 대기 최대 시간 (초, 기본값: CMD 재전송 정책의 timeout)
+            retry: 응답이 없으면 재전송 여부
+"            tx_id: TX ID (기본값: PC_ID)
+            policy: 이번 요청의 재전송 정책 (기본값: policies의 CMD 정책, 없으면 RetryPolicy())
+                    CMD 0xB3은 기본 정책이 없으므로 stop_heartbeat() 후 retransmit.TABLE_ROW_POLICY 지정
+        
+        Raises:
+            TimeoutError: 응답 없음
+            ConnectionError: 미연결 또는 응답 대기 중 연결 종료
+            ValueError: CMD 0xB3을 정책 없이 요청
+        """
+        if not self.is_connected:
+            raise ConnectionError("연결되지 않음")
+        if policy is None:
+            policy = self.policies.get(cmd)
+            if policy is None and cmd == 0xB3:
+                # B3 응답(F1)은 상태조회 F1 응답과 구분되지 않아 기본 정책 없음 (에코 응답을 기다리면 항상 타임아웃)
+                raise ValueError("CMD 0xB3은 F1으로 응답하므로 stop_heartbeat() 후 "
+                                 "policy=TABLE_ROW_POLICY로 요청하세요")
+        
+        loop = asyncio.get_running_loop()
+        handler = self.protocol.handler
+        packet = bytes(handler.create_packet(handler.PC_ID if tx_id is None else tx_id, cmd, data_field))
+        policy = policy or RetryPolicy()
+        response_cmd = cmd if policy.response_cmd is None else policy.response_cmd
+        deadline = loop.time() + (policy.timeout if timeout is None else timeout)
+        
+        # 응답이 전송 직후 도착해도 놓치지 않도록 전송 전에 등록
+        future = loop.create_future()
+        waiters = self._pending.setdefault(response_cmd, deque())
+        waiters.append(future)
+        
+        attempts = 0
+        interval = policy.interval
+        try:
+            while True:
+                self.transport.write(packet)
+                attempts += 1
+                
+                remaining = deadline - loop.time()
+                can_retry = retry and (policy.max_attempts is None or attempts < policy.max_attempts)
+                wait = min(interval, remaining) if can_retry else remaining
+                try:
+                    return await asyncio.wait_for(asyncio.shield(future), max(wait, 0))
+                except asyncio.TimeoutError:
+                    if loop.time() >= deadline:
+                        raise TimeoutError(f"CMD 0x{cmd:02X} 응답 없음 ({attempts}회 전송)") from None
+                
+                interval *= policy.backoff
+                if policy.max_interval is not None:
+                    interval = min(interval, policy.max_interval)
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+            future.cancel()
+    
+    def _on_frame(self, frame):
+        """수신 프레임 처리 (응답 대기 요청 완료, 구독자에게 전달)"""
+        if frame.is_error:
+            self.error_count += 1
+            return
+        if frame.tx_id != ProtocolHandler.MAIN_ID:
+            return
+        
+        waiters = self._pending.get(frame.cmd)
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(frame)
+                break
+        
+        for cmds, frames in self._subscribers:
+            if cmds is None or frame.cmd in cmds:
+                if frames.full():
+                    frames.get_nowait()
+                frames.put_nowait(frame)
+    
+    def _on_connection_lost(self, exc):
+        """연결 종료 - 응답 대기 요청과 구독자 종료"""
+        error = ConnectionError(f"연결 종료: {exc}" if exc else "연결 종료")
+        for waiters in self._pending.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(error)
+        self._pending.clear()
+        for _, frames in self._subscribers:
+            if frames.full():
+                frames.get_nowait()
+            frames.put_nowait(None)
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+    
+    async def frames(self, *cmds):
+        """
+        수신 프레임 비동기 반복자 (연결이 종료되면 끝남)
+        
+        Args:
+            cmds: 받을 CMD (생략하면 MAIN에서 온 모든 프레임)
+        """
+        subscriber = (set(cmds) if cmds else None, asyncio.Queue(self.QUEUE_SIZE))
+        self._subscribers.append(subscriber)
+        try:
+            while True:
+                frame = await subscriber[1].get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self._subscribers.remove(subscriber)
+    
+    async def status_updates(self, *cmds):
+        """
+        상태응답(F0/F1/F2) 비동기 반복자 - (Frame, 디코딩 결과 dict) 반환
+        
+        Args:
+            cmds: 받을 상태응답 CMD (생략하면 F0, F1)
+        """
+        async for frame in self.frames(*(cmds or (0xF0, 0xF1))):
+            schema = SCHEMAS.get(frame.cmd)
+            if schema is None or frame.data_length < schema.data_length:
+                continue
+            yield frame, schema.decode(frame.data_field)
+    
+    def start_heartbeat(self, rates=None):
+        """
+        상태조회 태스크 시작
+        
+        Args:
+            rates: CMD별 전송 주기 (Hz, 기본값: self.poll_rates)
+        """
+        if rates is not None:
+            self.poll_rates = dict(rates)
+        self.stop_heartbeat()
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat())
+        return self._heartbeat_task
+    
+    def stop_heartbeat(self):
+        """상태조회 태스크 중지"""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+    
+    async def _heartbeat(self):
+        """상태조회 태스크 (CMD별 monotonic_ns 격자 예정 시각에 전송, 밀린 예정 시각은 몰아서 보내지 않고 건너뜀)"""
+        clock = self.poll_clock
+        clock.stagger = self.poll_stagger
+        clock.reset()
+        while self.is_connected:
+            now_ns = time.monotonic_ns()
+            wake_ns = now_ns + 100_000_000  # 주기 변경을 반영하기 위한 최대 대기시간 (100ms)
+            for cmd, rate in list(self.poll_rates.items()):
+                if rate <= 0:
+                    clock.remove(cmd)
+                    continue
+                slot = clock.due(cmd, rate, now_ns)
+                if slot <= now_ns:
+                    self.send(cmd)
+                    written_ns = time.monotonic_ns()
+                    slot = clock.advance(cmd, now_ns)
+                    clock.on_written(cmd, written_ns)
+                wake_ns = min(wake_ns, slot)
+            await asyncio.sleep(max(0.0, (wake_ns - time.monotonic_ns()) / 1e9))
+    
+    async def close(self):
+        """상태조회 중지 후 포트 닫기"""
+        self.stop_heartbeat()
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.close()
+        if self.protocol is not None and self.protocol.closed is not None:
+            await self.protocol.closed
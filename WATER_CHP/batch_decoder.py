@@ -0,0 +1,138 @@
+"""
+상태응답 (CMD 0xF0 / 0xF1) 일괄 디코딩 모듈 - 오프라인 분석용
+여러 프레임의 DATA FIELD가 이어진 버퍼를 NumPy 구조화 배열(프레임당 1행, 필드당 1열)로 한 번에 변환합니다.
+필드 정의는 status_schema의 FieldSpec을 그대로 사용하며, 부호-크기 바이트와 HIGH/LOW 2바이트 조합은
+배치 전체에 대해 벡터 연산으로 처리합니다.
+
+사용 예:
+    payloads = join_payloads(frames, 0xF0)
+    table = decode_batch(F0_SCHEMA, payloads)
+    table['sensor_data.cold_temp']      # 냉수 온도 열 (float64)
+"""
+import numpy as np
+
+from status_schema import FLAG_MAP, SCHEMAS
+
+
+def column_name(field):
+    """필드 경로를 열 이름으로 변환 (예: ('valve_states', 'nos', 1) → 'valve_states.nos.1')"""
+    return '.'.join(str(key) for key in field.path)
+
+
+def column_dtype(field):
+    """
+    필드의 열 타입
+    - 스케일 지정: float64 (단일 프레임 디코딩과 같은 값)
+    - FLAG_MAP 표시값: bool
+    - 부호-크기: int16
+    - 그 외 (표시값 테이블 포함): 원시값 uint8 / uint16 (표시 문자열은 label_column으로 변환)
+    """
+    if field.scale is not None:
+        return np.float64
+    if field.enum is FLAG_MAP:
+        return np.bool_
+    if field.signed:
+        return np.int16
+    return np.uint8 if field.width == 1 else np.uint16
+
+
+def batch_dtype(schema):
+    """스키마의 구조화 배열 dtype"""
+    return np.dtype([(column_name(f), column_dtype(f)) for f in schema.fields])
+
+
+def payload_rows(schema, buffer, offset=0, stride=None):
+    """
+    버퍼를 (프레임 수, DATA FIELD 길이) uint8 2차원 뷰로 변환 (복사 없음)
+    
+    Args:
+        schema: StatusSchema
+        buffer: DATA FIELD(또는 프레임)가 이어진 버퍼 (bytes / bytearray / memoryview / ndarray)
+        offset: 첫 DATA FIELD 시작 위치 (프레임 전체가 이어진 캡처라면 4)
+        stride: 프레임 간격 (기본값: DATA FIELD 길이, 프레임 전체 캡처라면 DATA FIELD 길이 + 7)
+    """
+    length = schema.data_length
+    if stride is None:
+        stride = length
+    if stride < length:
+        raise ValueError(f"프레임 간격({stride})이 DATA FIELD 길이({length})보다 짧습니다")
+    
+    raw = np.frombuffer(buffer, dtype=np.uint8)[offset:]
+    count = (len(raw) - length) // stride + 1 if len(raw) >= length else 0
+    return np.lib.stride_tricks.as_strided(raw, shape=(count, length), strides=(stride, 1), writeable=False)
+
+
+def decode_batch(schema, buffer, offset=0, stride=None):
+    """
+    DATA FIELD가 이어진 버퍼를 구조화 배열로 일괄 디코딩
+    
+    Args:
+        schema: StatusSchema (F0_SCHEMA / F1_SCHEMA) 또는 CMD 값 (0xF0 / 0xF1)
+        buffer / offset / stride: payload_rows 참고
+    
+    Returns:
+        numpy.ndarray: 프레임당 1행, 필드당 1열인 구조화 배열
+    """
+    if isinstance(schema, int):
+        schema = SCHEMAS[schema]
+    
+    rows = payload_rows(schema, buffer, offset, stride)
+    result = np.empty(len(rows), dtype=batch_dtype(schema))
+    
+    for field in schema.fields:
+        # 원시값 (2바이트는 HIGH/LOW 조합)
+        if field.width == 1:
+            raw = rows[:, field.offset]
+        else:
+            first = rows[:, field.offset].astype(np.uint16)
+            second = rows[:, field.offset + 1].astype(np.uint16)
+            raw = (first << 8) | second if field.endian == 'big' else (second << 8) | first
+        
+        # 부호-크기 변환 (MSB=1이면 음수)
+        if field.signed:
+            sign_bit = 0x80 << (8 * (field.width - 1))
+            magnitude = (raw & (sign_bit - 1)).astype(np.int32)
+            raw = np.where(raw & sign_bit, -magnitude, magnitude)
+        
+        name = column_name(field)
+        if field.scale is not None:
+            result[name] = raw / field.scale
+        elif field.enum is FLAG_MAP:
+            result[name] = raw == 1
+        else:
+            result[name] = raw
+    
+    return result
+
+
+def label_column(schema, table, name):
+    """
+    표시값 테이블이 있는 열을 단일 프레임 디코딩과 같은 표시 문자열 배열로 변환
+    
+    Args:
+        schema: StatusSchema 또는 CMD 값
+        table: decode_batch 결과
+        name: 열 이름
+    """
+    if isinstance(schema, int):
+        schema = SCHEMAS[schema]
+    
+    for field in schema.fields:
+        if column_name(field) == name:
+            break
+    else:
+        raise KeyError(name)
+    
+    values = table[name]
+    if field.enum is None or field.enum is FLAG_MAP:
+        return values
+    
+    lookup = np.array([field.enum.get(raw, field.default) for raw in range(1 << (8 * field.width))], dtype=object)
+    return lookup[values]
+
+
+def join_payloads(frames, cmd):
+    """수신 Frame 목록에서 해당 CMD의 DATA FIELD만 이어 붙인 버퍼 생성 (decode_batch 입력용)"""
+    length = SCHEMAS[cmd].data_length
+    return b''.join(frame.data_field[:length] for frame in frames
+                    if not frame.is_error and frame.cmd == cmd and frame.data_length >= length)
@@ -7,8 +7,27 @@ import threading
 import time
 import queue
 import struct
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime
 
+import crc16
+import protocol_spec
+from frame import (Frame, FrameError, StatusUnchanged, ERR_PACKET_TOO_SHORT, ERR_LENGTH_MISMATCH,
+                   ERR_INVALID_STX, ERR_INVALID_ETX, ERR_CRC_MISMATCH, ERR_PARSE_EXCEPTION)
+from frame_decoder import FrameDecoder
+from serial_receiver import SerialReceiver
+from status_schema import F0_SCHEMA, F1_SCHEMA, F2_SCHEMA
+from poll_scheduler import PollScheduler
+from poll_clock import PollClock
+from port_watcher import scan_ports
+from retransmit import RetransmitManager, TABLE_ROW_POLICY
+from latency_histogram import LatencyRecorder
+from event_channel import EventChannel, ChannelClass, KEEP, SAMPLE
+from raw_capture import RawCapture, RX as CAPTURE_RX, TX as CAPTURE_TX
+from io_reactor import IoReactor
+from tx_scheduler import TxScheduler, PRIORITY_COMMAND, PRIORITY_NORMAL, PRIORITY_POLL
+
 
 class ProtocolHandler:
     """프로토콜 데이터 처리 클래스"""
@@ -24,19 +43,19 @@ class ProtocolHandler:
     
     # CMD와 DATA FIELD LENGTH 매핑 (PC → 메인)
     # 주의: 0xF0, 0xF1은 PC → MAIN으로 보낼 때는 Datafield Length가 0
-    #       MAIN → PC로 올 때는 각각 40바이트, 76바이트
-    CMD_LENGTH_MAP = {
-        0xF0: 0,   # 공통 상태조회 (PC → MAIN: 0바이트, MAIN → PC: 40바이트)
-        0xF1: 0,   # 냉동상태조회 (PC → MAIN: 0바이트, MAIN → PC: 76바이트)
-        0xB1: 5,   # 냉각운전 변경 (TARGET RPS, 냉각 ON 온도, 냉각 OFF 온도, 추가시간 High, 추가시간 Low)
-        0xB2: 5,   # 제빙운전 변경 (TARGET RPS, 입수용량 HIGH, 입수용량 LOW, 스윙바 ON, 스윙바 OFF)
-        0xB3: 93,  # 제빙테이블 적용 (DATA1: 행인덱스 1바이트, DATA2~93: 테이블 46개x2바이트)
-        0xB4: 4,   # 보냉운전 변경 (TARGET RPS, TARGET TEMP, TARGET TEMP FIRST, TRAY POSITION)
-        0xC0: 7    # 센서값 변경
+    # 사양서에서 생성된 protocol_spec.py 사용 (수정은 사양서 → py protocol_codegen.py)
+    CMD_LENGTH_MAP = dict(protocol_spec.CMD_LENGTH_MAP)
+    
+    # 상태조회 CMD와 응답(MAIN → PC) DATA FIELD LENGTH 매핑
+    STATUS_RESPONSE_LENGTHS = {
+        0xF0: F0_SCHEMA.data_length,    # 공통 상태조회
+        0xF1: F1_SCHEMA.data_length,    # 냉동상태조회
+        0xF2: F2_SCHEMA.data_length     # 순간온수상태조회
     }
     
     def __init__(self):
-        self.receive_buffer = bytearray()
+        # 수신 링버퍼 디코더
+        self.decoder = FrameDecoder(self.STX, self.ETX, self.CMD_LENGTH_MAP.keys())
     
     @staticmethod
     def int_to_signed_byte(value):
@@ -81,19 +100,11 @@ class ProtocolHandler:
         CRC16-CCITT 계산 (STX ~ DATA FIELD)
         초기값: 0x0000
         다항식: 0x1021
+        
+        256개 엔트리 테이블 방식으로 계산 (crc16 모듈 참고)
+        data는 bytes / bytearray / memoryview 모두 가능
         """
-        wCRCin = 0x0000  # 초기값 변경: 0xFFFF -> 0x0000
-        wCPoly = 0x1021
-        
-        for wChar in data:
-            wCRCin ^= (wChar << 8)
-            for i in range(8):
-                if wCRCin & 0x8000:
-                    wCRCin = (wCRCin << 1) ^ wCPoly
-                else:
-                    wCRCin = wCRCin << 1
-                wCRCin &= 0xFFFF
-        return wCRCin
+        return crc16.update(crc16.CRC16_INIT, data)
     
     def create_packet(self, tx_id, cmd, data_field=None):
         """
@@ -138,13 +149,13 @@ class ProtocolHandler:
         return self.create_packet(tx_id, cmd)
     
     def parse_packet(self, packet_data):
-        """패킷 파싱 (RX ID 제거) - 에러 정보 포함"""
+        """패킷 파싱 (RX ID 제거) - 에러 정보 포함
+        
+        Returns:
+            Frame (성공) 또는 FrameError (실패)
+        """
         if len(packet_data) < 7:  # 최소 패킷 크기 (RX ID 제거로 1바이트 감소)
-            return {
-                'error': 'PACKET_TOO_SHORT',
-                'detail': f'패킷 길이 부족: {len(packet_data)}바이트 (최소 7바이트 필요)',
-                'raw_data': ' '.join([f'{b:02X}' for b in packet_data])
-            }
+            return FrameError(ERR_PACKET_TOO_SHORT, bytes(packet_data), received=len(packet_data), expected=7)
         
         try:
             stx = packet_data[0]
@@ -155,16 +166,9 @@ class ProtocolHandler:
             expected_total = 7 + data_length  # STX(1) + TX_ID(1) + CMD(1) + LEN(1) + DATA(N) + CRC16(2) + ETX(1)
             
             if len(packet_data) != expected_total:
-                return {
-                    'error': 'LENGTH_MISMATCH',
-                    'detail': f'패킷 길이 불일치: 예상 {expected_total}바이트, 실제 {len(packet_data)}바이트 (DATA_LEN={data_length})',
-                    'raw_data': ' '.join([f'{b:02X}' for b in packet_data]),
-                    'stx': f'0x{stx:02X}',
-                    'tx_id': f'0x{tx_id:02X}',
-                    'cmd': f'0x{cmd:02X}'
-                }
-            
-            data_field = packet_data[4:4+data_length]
+                return FrameError(ERR_LENGTH_MISMATCH, bytes(packet_data), tx_id=tx_id, cmd=cmd,
+                                  data_length=data_length, received=len(packet_data), expected=expected_total)
+            
             # CRC_HIGHBYTE와 CRC_LOWBYTE를 읽어서 CRC 값 구성
             crc_high = packet_data[4+data_length]
             crc_low = packet_data[4+data_length+1]
@@ -173,159 +177,38 @@ class ProtocolHandler:
             
             # STX 검증
             if stx != self.STX:
-                return {
-                    'error': 'INVALID_STX',
-                    'detail': f'잘못된 STX: 0x{stx:02X} (예상: 0x{self.STX:02X})',
-                    'raw_data': ' '.join([f'{b:02X}' for b in packet_data])
-                }
+                return FrameError(ERR_INVALID_STX, bytes(packet_data), received=stx, expected=self.STX)
             
             # ETX 검증
             if etx != self.ETX:
-                return {
-                    'error': 'INVALID_ETX',
-                    'detail': f'잘못된 ETX: 0x{etx:02X} (예상: 0x{self.ETX:02X})',
-                    'raw_data': ' '.join([f'{b:02X}' for b in packet_data])
-                }
+                return FrameError(ERR_INVALID_ETX, bytes(packet_data), received=etx, expected=self.ETX)
             
             # CRC 검증 (STX ~ DATA FIELD까지 계산)
             crc_data = packet_data[:4+data_length]  # STX(1) + TX_ID(1) + CMD(1) + LEN(1) + DATA(N)
             crc_calculated = self.calculate_crc16(crc_data)
             
             if crc_received != crc_calculated:
-                return {
-                    'error': 'CRC_MISMATCH',
-                    'detail': f'CRC 불일치: 수신 0x{crc_received:04X}, 계산 0x{crc_calculated:04X}',
-                    'raw_data': ' '.join([f'{b:02X}' for b in packet_data]),
-                    'tx_id': f'0x{tx_id:02X}',
-                    'cmd': f'0x{cmd:02X}',
-                    'data_field': ' '.join([f'{b:02X}' for b in data_field])
-                }
+                return FrameError(ERR_CRC_MISMATCH, bytes(packet_data), tx_id=tx_id, cmd=cmd,
+                                  data_length=data_length, received=crc_received, expected=crc_calculated)
             
             # 성공
-            return {
-                'tx_id': tx_id,
-                'cmd': cmd,
-                'data_length': data_length,
-                'data_field': data_field,
-                'crc': crc_received
-            }
+            return Frame(tx_id, cmd, data_length, crc_received, bytes(packet_data))
             
         except Exception as e:
-            return {
-                'error': 'PARSE_EXCEPTION',
-                'detail': f'파싱 중 예외 발생: {str(e)}',
-                'raw_data': ' '.join([f'{b:02X}' for b in packet_data])
-            }
+            return FrameError(ERR_PARSE_EXCEPTION, bytes(packet_data), received=str(e))
     
     def process_received_data(self, new_data):
-        """수신 버퍼에서 패킷 추출 - 엄격한 프로토콜 검증"""
-        self.receive_buffer.extend(new_data)
-        packets = []
-        
-        while len(self.receive_buffer) > 0:
-            # 1단계: STX(0x02) 확인 - 첫 바이트가 STX가 아니면 버퍼 초기화
-            if self.receive_buffer[0] != self.STX:
-                invalid_byte = self.receive_buffer[0]
-                buffer_preview = self.receive_buffer[:min(10, len(self.receive_buffer))]
-                packets.append({
-                    'error': 'INVALID_START',
-                    'detail': f'통신 시작 오류: 첫 바이트가 STX(0x02)가 아님 (수신: 0x{invalid_byte:02X})',
-                    'raw_data': ' '.join([f'{b:02X}' for b in buffer_preview])
-                })
-                # 버퍼 초기화
-                self.receive_buffer.clear()
-                break
-            
-            # 최소 헤더 크기 확인 (STX + TX_ID + CMD + DATA_LEN = 4바이트)
-            if len(self.receive_buffer) < 4:
-                # 아직 헤더가 다 안 옴, 대기
-                break
-            
-            # 2단계: CMD 확인 - 세 번째 데이터가 정의된 CMD인지 확인
-            stx = self.receive_buffer[0]
-            tx_id = self.receive_buffer[1]
-            cmd = self.receive_buffer[2]
-            data_length = self.receive_buffer[3]
-            
-            if cmd not in self.CMD_LENGTH_MAP:
-                buffer_preview = self.receive_buffer[:min(10, len(self.receive_buffer))]
-                packets.append({
-                    'error': 'UNDEFINED_CMD',
-                    'detail': f'정의되지 않은 CMD: 0x{cmd:02X} (TX_ID: 0x{tx_id:02X})',
-                    'raw_data': ' '.join([f'{b:02X}' for b in buffer_preview])
-                })
-                # 버퍼 초기화
-                self.receive_buffer.clear()
-                break
-            
-            # 3단계: DATA_LENGTH로 전체 패킷 길이 계산
-            # 패킷 구조: STX(1) + TX_ID(1) + CMD(1) + DATA_LEN(1) + DATA(N) + CRC_HIGH(1) + CRC_LOW(1) + ETX(1)
-            # 전체 길이 = 4 + DATA_LEN + 3 = 7 + DATA_LEN
-            expected_total = 7 + data_length
-            
-            # CRC와 ETX 위치 예상
-            crc_high_pos = 4 + data_length
-            crc_low_pos = 5 + data_length
-            etx_pos = 6 + data_length
-            
-            # 패킷이 완전히 도착했는지 확인
-            if len(self.receive_buffer) < expected_total:
-                # 아직 패킷이 다 안 옴, 대기
-                break
-            
-            # 4단계: ETX 위치 확인
-            actual_etx = self.receive_buffer[etx_pos]
-            if actual_etx != self.ETX:
-                packets.append({
-                    'error': 'ETX_POSITION_MISMATCH',
-                    'detail': f'ETX 위치 오류: 예상 위치[{etx_pos}]에 ETX(0x03) 없음 (수신: 0x{actual_etx:02X})',
-                    'raw_data': ' '.join([f'{b:02X}' for b in self.receive_buffer[:expected_total]]),
-                    'expected_length': expected_total,
-                    'cmd': f'0x{cmd:02X}',
-                    'data_length': data_length
-                })
-                # 버퍼 초기화
-                self.receive_buffer.clear()
-                break
-            
-            # CRC 계산 및 확인
-            packet_data = self.receive_buffer[:expected_total]
-            crc_data = packet_data[:crc_high_pos]  # STX ~ DATA FIELD
-            crc_calculated = self.calculate_crc16(crc_data)
-            
-            crc_high_received = self.receive_buffer[crc_high_pos]
-            crc_low_received = self.receive_buffer[crc_low_pos]
-            crc_received = (crc_high_received << 8) | crc_low_received
-            
-            if crc_received != crc_calculated:
-                packets.append({
-                    'error': 'CRC_MISMATCH',
-                    'detail': f'CRC 불일치: 수신 0x{crc_received:04X}, 계산 0x{crc_calculated:04X}',
-                    'raw_data': ' '.join([f'{b:02X}' for b in packet_data]),
-                    'tx_id': f'0x{tx_id:02X}',
-                    'cmd': f'0x{cmd:02X}',
-                    'data_length': data_length
-                })
-                # 버퍼 초기화
-                self.receive_buffer.clear()
-                break
-            
-            # 정상 패킷 - DATA FIELD 추출
-            data_field = packet_data[4:4+data_length]
-            
-            # 성공 패킷 추가
-            packets.append({
-                'tx_id': tx_id,
-                'cmd': cmd,
-                'data_length': data_length,
-                'data_field': data_field,
-                'crc': crc_received
-            })
-            
-            # 처리한 패킷만큼 버퍼에서 제거
-            self.receive_buffer = self.receive_buffer[expected_total:]
+        """수신 버퍼에서 패킷 추출 - 엄격한 프로토콜 검증
         
-        return packets
+        링버퍼 디코더(FrameDecoder)를 사용하며, STX/CMD/ETX/CRC 오류가 나면 버퍼 전체를 버리지 않고
+        다음 STX + 정의된 CMD 헤더까지만 건너뛰어 뒤에 이미 수신된 정상 패킷을 살립니다.
+        Frame / FrameError 목록을 반환하며, FrameError.skipped에 건너뛴 바이트 수가 들어갑니다.
+        """
+        return self.decoder.feed(new_data)
+    
+    def get_decoder_stats(self):
+        """수신 디코더 통계 (정상 프레임 수, 재동기화 횟수, 건너뛴 바이트 수 등)"""
+        return self.decoder.get_stats()
 
 
 class SerialCommunication:
@@ -890,39 +773,8 @@ class StatusResponseHandler:
             return result
         
         try:
-            # ========== 1. 센서류 (DATA1-13, 인덱스 0-12) ==========
-            if len(data_field) >= 13:
-                result['sensor_data'] = {
-                    'outdoor_temp1': float(self.protocol.signed_byte_to_int(data_field[0])),
-                    'hot_inlet_temp': float(self.protocol.signed_byte_to_int(data_field[1])),
-                    'purified_temp': float(self.protocol.signed_byte_to_int(data_field[2])),
-                    'outdoor_temp2': float(self.protocol.signed_byte_to_int(data_field[3])),
-                    'cold_temp': float(self.protocol.signed_byte_to_int(data_field[4])),
-                    'hot_internal_temp': float(self.protocol.signed_byte_to_int(data_field[5])),
-                    'hot_outlet_temp': float(self.protocol.signed_byte_to_int(data_field[6]))
-                }
-            
-            # ========== 2. 밸브 상태 (DATA14-38, 인덱스 13-37) ==========
-            # NOS 밸브 (1~5): DATA14-18 (인덱스 13-17)
-            if len(data_field) >= 18:
-                for i in range(1, 6):
-                    valve_state = data_field[12 + i]
-                    result['valve_states']['nos'][i] = (valve_state == 1)
-            
-            # FEED 밸브 (1~15): DATA19-33 (인덱스 18-32)
-            if len(data_field) >= 33:
-                for i in range(1, 16):
-                    valve_state = data_field[17 + i]
-                    result['valve_states']['feed'][i] = (valve_state == 1)
-            
-            # ========== 3. 필터리드 (DATA39, 인덱스 38) ==========
-            if len(data_field) >= 39:
-                result['filter_detected'] = (data_field[38] == 1)
-            
-            # ========== 4. 전면커버 (DATA40, 인덱스 39) ==========
-            if len(data_field) >= 40:
-                result['front_cover_detected'] = (data_field[39] == 1)
-        
+            # 스키마(status_schema.F0_FIELDS)에 정의된 필드를 한 번에 디코딩
+            result = F0_SCHEMA.decode(data_field)
         except Exception:
             pass
         
@@ -962,80 +814,52 @@ class StatusResponseHandler:
             return result
         
         try:
-            # ========== 1. 공조시스템 (DATA1-15, 인덱스 0-14) ==========
-            if len(data_field) >= 15:
-                valve1_map = {0: '냉각', 1: '제빙', 2: '핫가스', 3: '보냉'}
-                valve2_map = {0: '냉각', 1: '제빙', 2: '핫가스', 3: '보냉'}
-                
-                result['hvac_data'] = {
-                    'refrigerant_valve_state_1': valve1_map.get(data_field[0], '핫가스'),
-                    'refrigerant_valve_state_2': valve2_map.get(data_field[1], '핫가스'),
-                    'compressor_state': '동작중' if data_field[2] == 1 else '미동작',
-                    'stabilization_time': (data_field[3] << 8) | data_field[4],
-                    'current_rps': data_field[5],
-                    'error_code': data_field[6],
-                    'dc_fan1': 'ON' if data_field[7] == 1 else 'OFF',
-                    'dc_fan2': 'ON' if data_field[8] == 1 else 'OFF'
-                }
-            
-            # ========== 2. 냉각 데이터 (DATA16-26, 인덱스 15-25) ==========
-            if len(data_field) >= 26:
-                result['cooling_data'] = {
-                    'operation_state': '가동' if data_field[15] == 1 else '대기',
-                    'initial_startup': (data_field[16] == 1),
-                    'target_rps': data_field[17],
-                    'on_temp': data_field[18] / 10.0,
-                    'off_temp': data_field[19] / 10.0,
-                    'cooling_additional_time': (data_field[20] << 8) | data_field[21]
-                }
-            
-            # ========== 3. 제빙 데이터 (DATA27-46, 인덱스 26-45) ==========
-            if len(data_field) >= 46:
-                ice_step = data_field[26]
-                
-                result['icemaking_data'] = {
-                    'ice_step': ice_step,
-                    'target_rps': data_field[27],
-                    'icemaking_time': (data_field[28] << 8) | data_field[29],
-                    'water_capacity': (data_field[30] << 8) | data_field[31],
-                    'swing_on_time': int(data_field[32]),
-                    'swing_off_time': int(data_field[33]),
-                    'tray_position': data_field[34],
-                    'ice_jam_state': data_field[35]
-                }
-            
-            # ========== 4. 보냉 데이터 (DATA47-61, 인덱스 46-60) ==========
-            if len(data_field) >= 61:
-                result['refrigeration_data'] = {
-                    'target_rps': data_field[47],
-                    'target_temp': float(self.protocol.signed_byte_to_int(data_field[48])) / 10.0,
-                    'target_first_temp': float(self.protocol.signed_byte_to_int(data_field[49])) / 10.0,
-                    'cur_tray_position': data_field[50]  # 트레이 위치 (0:제빙, 1:탈빙, 2:이동중, 3:에러)
-                }
-            
-            # ========== 5. 드레인 탱크 (DATA62-70, 인덱스 61-69) ==========
-            if len(data_field) >= 70:
-                water_level_map = {0: '비어있음', 1: '저수위', 2: '중수위', 3: '만수위', 4: '에러'}
-                result['drain_tank_data'] = {
-                    'low_level': '감지' if data_field[61] == 1 else '미감지',
-                    'high_level': '감지' if data_field[62] == 1 else '미감지',
-                    'water_level_state': water_level_map.get(data_field[63], '비어있음')
-                }
-                result['drain_pump_data'] = {
-                    'operation_state': 'ON' if data_field[64] == 1 else 'OFF'
-                }
-            
-            # ========== 6. 얼음탱크 커버 (DATA71, 인덱스 70) ==========
-            if len(data_field) >= 71:
-                result['tank_cover_data'] = {
-                    'state': data_field[70]
-                }
-        
+            # 스키마(status_schema.F1_FIELDS)에 정의된 필드를 한 번에 디코딩
+            result = F1_SCHEMA.decode(data_field)
         except Exception:
             pass
         
         return result
     
+    def parse_heating_status(self, data_field, tx_id=None):
+        """
+        CMD 0xF2 (순간온수상태조회) 데이터 파싱 - 1바이트
+        
+        Datafield 1: 온수 운전상태 (펌웨어 u8HeatingOpStatus)
+        
+        Returns:
+            dict: 파싱된 데이터를 담은 딕셔너리
+        """
+        result = {
+            'heating_data': {}
+        }
+        
+        if not data_field or len(data_field) == 0:
+            return result
+        
+        if tx_id != 0x02:  # MAIN_ID
+            return result
+        
+        if len(data_field) < F2_SCHEMA.data_length:
+            return result
+        
+        try:
+            # 스키마(status_schema.F2_FIELDS)에 정의된 필드를 한 번에 디코딩
+            result = F2_SCHEMA.decode(data_field)
+        except Exception:
+            pass
+        
+        return result
+
+# 이벤트 채널 등급 (SerialCommunication.receive_queue / status_queue)
+_RECEIVE_EVENT_CLASSES = {'UNCHANGED': 'status', 'SENT_BATCH': 'log', 'SENT': 'log'}
+
+
+def _classify_status(item):
+    """status_queue 이벤트 등급 (시스템 / 오류 메시지는 로그, 연결 / 해제는 기본 등급)"""
+    return 'log' if item[0] in ('SYSTEM', 'ERROR') else None
+
+
 class SerialCommunication:
     def __init__(self):
         self.serial_connection = None
@@ -1045,11 +869,26 @@ class SerialCommunication:
         self.heartbeat_thread = None
         self.stop_thread = False
         
-        # 데이터 큐들
-        self.receive_queue = queue.Queue()
-        self.send_queue = queue.Queue()
-        self.priority_send_queue = queue.Queue()  # 우선순위 전송 큐
-        self.status_queue = queue.Queue()
+        # 이벤트 채널 - 등급별 용량 / 초과 시 처리 (GUI가 멈춰도 이벤트가 끝없이 쌓이지 않음, 통계는 get_channel_stats())
+        # 상태응답은 버리지 않고 용량을 넘으면 상태조회를 일시 중지, 송신 / 시스템 로그는 일부만 받음
+        self.receive_queue = EventChannel({
+            'status': ChannelClass(KEEP, capacity=256, backpressure=True),
+            'log': ChannelClass(SAMPLE, capacity=1000)
+        }, self._classify_received, on_backpressure=self._on_status_backlog)
+        self.status_queue = EventChannel({
+            'log': ChannelClass(SAMPLE, capacity=200)
+        }, _classify_status)
+        
+        # 송신 스케줄러 (우선순위 / 전송 마감 시각 / 중복 상태조회 제외, 송신 스레드는 조건 변수로 대기)
+        self.tx = TxScheduler()
+        self.tx.on_expired = self._on_tx_expired
+        
+        # 송신 묶음 - 송신 스레드가 깨어날 때 대기 중인 프레임을 함께 꺼내 전송하고 'SENT_BATCH' 이벤트 1개로 알림
+        # tx_frame_gap이 0이면 묶음 전체를 write 1회로 전송, 0보다 크면 프레임마다 (전송 시간 + 간격)만큼 띄워서 전송
+        # (메인 보드 App_Comm.c는 응답을 보내기 전까지 들어온 바이트를 버리므로 기본값은 간격을 둠)
+        self.tx_frame_gap = 0.01  # 프레임 사이 최소 간격 (초)
+        self.tx_batch_frames = 16  # 묶음 최대 프레임 수
+        self.tx_batch_bytes = 1024  # 묶음 최대 바이트 수
         
         # 연결 정보
         self.current_port = None
@@ -1058,45 +897,92 @@ class SerialCommunication:
         # 프로토콜 핸들러
         self.protocol = ProtocolHandler()
         
-        # Heartbeat 설정
-        self.heartbeat_interval = 0.2  # 200ms
+        # 수신 설정
+        self.receiver = None  # 연결 중 수신 엔진 (SerialReceiver)
+        self.reactor = None  # 연결 중 I/O 리액터 (io_reactor.IoReactor, None이면 수신/송신/Heartbeat/재전송 스레드 사용)
+        # True: connect()에서 reactor를 지정하지 않으면 포트 전용 리액터 스레드 1개로 수신/송신/상태조회/재전송 처리
+        # False: 수신 / 송신 / Heartbeat / 재전송 타이머 스레드를 따로 사용 (이전 방식)
+        self.use_reactor = True
+        self._own_reactor = None  # connect()에서 만든 포트 전용 리액터 (연결 해제 시 종료)
+        self.receive_timeout = 0.1  # 데이터 대기 최대 시간 (연결 해제 확인 주기)
+        self.capture = None  # 원시 바이트 캡처 (raw_capture.RawCapture, start_capture / stop_capture, None이면 기록 안 함)
+        
+        # Heartbeat 설정 - 상태조회 CMD별 전송 주기 (Hz, 0이면 전송 안 함)
+        # 기본값: F0 5Hz, F1 5Hz, F2 0Hz (9600bps 기준 링크 사용률은 estimate_poll_load()로 확인)
+        # F2는 현재 메인보드 펌웨어가 F2 응답을 보내지 않으므로 (test_uart_comm.c: F0 응답, App_Comm_Protocol.c: cmd 0x00)
+        # 펌웨어가 응답할 때까지 set_poll_rate(0xF2, 주기)로 켰을 때만 전송
+        self.poll_rates = {0xF0: 5.0, 0xF1: 5.0, 0xF2: 0.0}
+        self.poll_stagger = 0.1  # CMD별 첫 전송 간격 (같은 시점에 몰리지 않도록 100ms씩 분산)
+        # 상태조회 전송 시각 격자 (monotonic_ns 기준 예정 시각, 지터 / 건너뛴 주기 통계는 get_poll_clock_stats())
+        self.poll_clock = PollClock(self.poll_stagger)
+        
+        # 적응형 상태조회 - poll_rates를 상한으로, 측정한 RTT / 전송 시간으로 링크를 넘치지 않는 주기 사용
+        # (poll.mode: 'stop-and-wait' / 'windowed', poll.window, poll.target_load, 통계는 get_poll_stats())
+        self.poll_adaptive = True
+        self.poll = PollScheduler(self.protocol.CMD_LENGTH_MAP, self.protocol.STATUS_RESPONSE_LENGTHS)
         self.heartbeat_active = False
         self.heartbeat_paused = False  # Heartbeat 일시 중지 플래그
+        self._poll_holds = set()  # 상태조회 일시 중지를 요청한 주체 (모두 재개해야 상태조회 재개)
         
-        # CMD 0xB1 재전송 설정
-        self.b1_retry_active = False
-        self.b1_retry_packet = None
-        self.b1_retry_interval = 0.2  # 200ms 간격으로 재전송
-        self.b1_retry_thread = None
-        self.b1_retry_timeout = 5.0  # 5초 후 타임아웃
-        self.b1_retry_start_time = None
+        # 중복 상태응답 필터 - 직전 응답과 바이트 단위로 같은 F0/F1/F2 응답은
+        # 'PACKET' 대신 'UNCHANGED' 이벤트(StatusUnchanged)만 전달하여 파싱/화면 갱신을 생략
+        self.dedup_status = True
+        self._last_status_frames = {}  # CMD별 직전 응답 프레임 (STX ~ ETX)
+        self._status_repeat = {}  # CMD별 연속 중복 횟수
         
-        # CMD 0xB2 재전송 설정
-        self.b2_retry_active = False
-        self.b2_retry_packet = None
-        self.b2_retry_interval = 0.2  # 200ms 간격으로 재전송
-        self.b2_retry_thread = None
-        self.b2_retry_timeout = 5.0  # 5초 후 타임아웃
-        self.b2_retry_start_time = None
+        # 응답을 받을 때까지 재전송하는 명령 관리 (B1/B2/B3/B4, 타이머 스레드 하나로 처리)
+        # CMD별 재전송 간격 / 타임아웃은 retransmit.set_policy()로 변경
+        self.retransmit = RetransmitManager(self._resend_packet, on_timeout=self._on_retransmit_timeout)
         
-        # CMD 0xB4 재전송 설정
-        self.b4_retry_active = False
-        self.b4_retry_packet = None
-        self.b4_retry_interval = 0.2  # 200ms 간격으로 재전송
-        self.b4_retry_thread = None
-        self.b4_retry_timeout = 5.0  # 5초 후 타임아웃
-        self.b4_retry_start_time = None
+        # CMD별 왕복 시간 히스토그램 - 요청을 포트에 쓴 시각 ~ 응답 첫 바이트 도착 시각 (get_latency_stats / latency.export_csv)
+        response_cmds = {cmd: policy.response_cmd for cmd, policy in self.retransmit.policies.items()
+                         if policy.response_cmd is not None}
+        response_cmds[0xB3] = TABLE_ROW_POLICY.response_cmd    # 제빙테이블 행 (TableUploader가 정책 직접 지정)
+        self.latency = LatencyRecorder(response_cmds=response_cmds)
+        self._rx_partial_ns = None  # 디코더에 남은 미완성 프레임의 첫 바이트를 읽은 시각
+        
+        # 자동 재연결 - 수신/송신 중 포트 오류(USB 시리얼 분리 등)가 나면 포트를 닫고 지수 백오프로 다시 열기
+        # (is_connected는 사용자가 연결한 세션 유지 여부, link_up은 포트가 실제로 열려 I/O 가능한 상태)
+        self.auto_reconnect = True
+        self.reconnect_initial_delay = 0.5  # 첫 재연결 시도까지 대기 (초)
+        self.reconnect_max_delay = 30.0  # 재연결 대기 상한 (초, 실패할 때마다 2배)
+        self.link_up = False
+        self._link_generation = 0  # 포트를 열 때마다 증가 (이전 포트의 수신/송신 스레드 종료 판별용)
+        self._link_lock = threading.Lock()
+        self._reconnect_stop = threading.Event()
+        self._reconnect_thread = None
+        self._link_lost_at = None  # 현재 끊김 시작 시각 (time.monotonic)
+        self.reconnect_count = 0  # 재연결 성공 횟수
+        self.downtime_total = 0.0  # 끊겨 있던 시간 합계 (초)
+        self.link_gaps = deque(maxlen=100)  # 최근 끊김 구간 {'start', 'end', 'duration', 'reason'} (datetime / 초)
+        
+        # 포트 목록 - port_watcher(port_watcher.PortWatcher)를 지정하면 캐시된 목록 사용 (조회 / 포트 열기 없음)
+        self.port_watcher = None
     
     def get_available_ports(self):
-        """사용 가능한 시리얼 포트 목록 반환"""
-        ports = serial.tools.list_ports.comports()
-        return [f"{port.device} - {port.description}" for port in ports]
+        """사용 가능한 시리얼 포트 목록 반환 (port_watcher가 있으면 캐시된 목록, 없으면 1회 조회)"""
+        ports = self.port_watcher.ports() if self.port_watcher is not None else scan_ports()
+        return [port.label() for port in ports]
     
-    def check_port_availability(self, port_info):
-        """포트 사용 가능성 확인"""
+    def check_port_availability(self, port_info, probe=False):
+        """
+        포트 사용 가능성 확인
+        
+        Args:
+            port_info: 포트 이름 또는 'COM3 - 설명' 형식 문자열
+            probe: True이면 포트를 실제로 열었다 닫아서 확인 (동작 중인 보드를 방해할 수 있음),
+                   False이면 포트 목록에 있는지만 확인
+        """
+        port = port_info.split(" - ")[0] if " - " in port_info else port_info
+        if not probe:
+            if self.is_connected and port == self.current_port:
+                return False, "이미 연결된 포트입니다"
+            ports = self.port_watcher.ports() if self.port_watcher is not None else scan_ports()
+            if any(info.device == port for info in ports):
+                return True, "포트 있음 (열어서 확인하지 않음)"
+            return False, "포트를 찾을 수 없습니다"
+        
         try:
-            port = port_info.split(" - ")[0] if " - " in port_info else port_info
-            
             test_connection = serial.Serial(
                 port=port,
                 baudrate=115200,
@@ -1117,37 +1003,41 @@ class SerialCommunication:
         except Exception as e:
             return False, f"알 수 없는 오류: {str(e)}"
     
-    def connect(self, port_info, baudrate):
-        """시리얼 포트 연결"""
+    def connect(self, port_info, baudrate, reactor=None):
+        """시리얼 포트 연결
+        
+        Args:
+            port_info: 포트 이름 또는 'COM3 - 설명' 형식 문자열
+            baudrate: 통신 속도
+            reactor: 공유 I/O 리액터 (IoReactor, 여러 포트를 리액터 하나로 처리할 때 지정,
+                     None이면 use_reactor에 따라 포트 전용 리액터 또는 수신/송신/Heartbeat 스레드 사용)
+        """
         try:
             if self.is_connected:
                 self.disconnect()
             
             port = port_info.split(" - ")[0] if " - " in port_info else port_info
             
-            self.serial_connection = serial.Serial(
-                port=port,
-                baudrate=int(baudrate),
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=1
-            )
+            if reactor is None and self.use_reactor:
+                reactor = self._own_reactor = IoReactor()
+            self.serial_connection = self._open_port(port, baudrate, reactor)
             
             self.is_connected = True
             self.stop_thread = False
             self.current_port = port
             self.current_baudrate = baudrate
-            
-            # 수신 스레드 시작
-            self.receive_thread = threading.Thread(target=self._receive_worker, daemon=True)
-            self.receive_thread.start()
-            
-            # 송신 스레드 시작
-            self.send_thread = threading.Thread(target=self._send_worker, daemon=True)
-            self.send_thread.start()
-            
-            # Heartbeat 스레드 시작
+            self.reset_status_cache()
+            self.tx.open()
+            self.poll.baudrate = int(baudrate)
+            self.poll.reset()
+            self.latency.forget_waiting()
+            self._rx_partial_ns = None
+            self._reconnect_stop.clear()
+            
+            self.reactor = reactor
+            self._start_io()
+            
+            # Heartbeat 시작
             self.start_heartbeat()
             
             self.status_queue.put(('CONNECTED', f"{port} ({baudrate} bps)"))
@@ -1156,23 +1046,173 @@ class SerialCommunication:
             
         except Exception as e:
             self.is_connected = False
+            self._close_own_reactor()
             error_msg = f"연결 오류: {str(e)}"
             self.status_queue.put(('ERROR', error_msg))
             return False, error_msg
     
+    def _close_own_reactor(self):
+        """connect()에서 만든 포트 전용 리액터 종료"""
+        if self._own_reactor is not None:
+            self._own_reactor.close()
+            self._own_reactor = None
+    
+    def _open_port(self, port, baudrate, reactor):
+        """시리얼 포트 열기 (리액터 사용 시 읽기 타임아웃 0)"""
+        return serial.Serial(
+            port=port,
+            baudrate=int(baudrate),
+            bytesize=serial.EIGHTBITS,
+            parity=serial.PARITY_NONE,
+            stopbits=serial.STOPBITS_ONE,
+            timeout=0 if reactor is not None else 1
+        )
+    
+    def _start_io(self):
+        """열린 포트의 수신 / 송신 시작 (연결 / 재연결 시)"""
+        with self._link_lock:
+            self._link_generation += 1
+            self.link_up = True
+        
+        if self.reactor is not None:
+            # 리액터에 등록 (수신 / 송신 / Heartbeat / 재전송을 리액터 스레드에서 처리)
+            self.reactor.attach(self)
+        else:
+            # 재전송은 타이머 스레드에서 처리 (이전에 리액터로 연결했던 경우 되돌림)
+            self.retransmit.set_external_loop(None)
+            
+            # 수신 스레드 시작
+            self.receive_thread = threading.Thread(target=self._receive_worker, args=(self._link_generation,),
+                                                   daemon=True)
+            self.receive_thread.start()
+            
+            # 송신 스레드 시작
+            self.send_thread = threading.Thread(target=self._send_worker, args=(self._link_generation,),
+                                                daemon=True)
+            self.send_thread.start()
+    
+    def _io_alive(self, generation):
+        """수신 / 송신 스레드가 계속 동작해야 하는지 (연결 해제 / 포트 끊김 / 재연결 후 이전 스레드이면 False)"""
+        return (not self.stop_thread and self.is_connected and self.link_up
+                and generation == self._link_generation)
+    
+    def _on_link_lost(self, reason):
+        """
+        수신 / 송신 중 포트 오류 처리 (수신 / 송신 스레드 또는 리액터에서 호출, 같은 끊김은 한 번만 처리)
+        auto_reconnect이면 포트를 닫고 재연결 스레드를 시작, 아니면 오류만 알림
+        """
+        with self._link_lock:
+            if not self.is_connected or not self.link_up:
+                return
+            self.link_up = False
+            self._link_lost_at = time.monotonic()
+            lost_wall = datetime.now()
+        
+        self.receive_queue.put(('ERROR', reason))
+        if not self.auto_reconnect:
+            return
+        
+        # 재연결까지 응답 대기 명령의 재전송 / 타임아웃 보류, 끊김 시작을 시계열에 표시
+        self.retransmit.hold()
+        self.receive_queue.put(('LINK_LOST', {'time': lost_wall, 'reason': reason}))
+        self.status_queue.put(('SYSTEM', f"포트 끊김 감지 - 자동 재연결 시도: {reason}"))
+        
+        self._reconnect_thread = threading.Thread(target=self._reconnect_worker, args=(lost_wall, reason),
+                                                  daemon=True)
+        self._reconnect_thread.start()
+    
+    def _reconnect_worker(self, lost_wall, reason):
+        """재연결 스레드 (포트 닫기 → 지수 백오프로 다시 열기 → 수신/송신 재시작 → 응답 대기 명령 재전송)"""
+        # 이전 포트 정리
+        if self.reactor is not None:
+            self.reactor.detach(self)
+        try:
+            self.serial_connection.close()
+        except Exception:
+            pass
+        for thread in (self.receive_thread, self.send_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=2.0)
+        
+        delay = self.reconnect_initial_delay
+        attempt = 0
+        while True:
+            if self._reconnect_stop.wait(delay) or not self.is_connected:
+                return
+            attempt += 1
+            try:
+                connection = self._open_port(self.current_port, self.current_baudrate, self.reactor)
+                break
+            except Exception as e:
+                delay = min(delay * 2, self.reconnect_max_delay)
+                self.status_queue.put(('SYSTEM', f"재연결 실패 ({attempt}회, {delay:.1f}초 후 재시도): {str(e)}"))
+        
+        if not self.is_connected:
+            connection.close()
+            return
+        
+        # 새 포트로 재시작 (수신 버퍼 / 중복 상태응답 / 상태조회 응답 대기 초기화)
+        self.serial_connection = connection
+        self.protocol.decoder.reset()
+        self.reset_status_cache()
+        self.poll.reset()
+        self.latency.forget_waiting()
+        self._start_io()
+        
+        restored_wall = datetime.now()
+        downtime = time.monotonic() - self._link_lost_at
+        self._link_lost_at = None
+        self.reconnect_count += 1
+        self.downtime_total += downtime
+        gap = {'start': lost_wall, 'end': restored_wall, 'duration': downtime, 'reason': reason}
+        self.link_gaps.append(gap)
+        
+        reissued = self.retransmit.release(reissue=True)
+        self.receive_queue.put(('LINK_RESTORED', gap))
+        self.status_queue.put(('SYSTEM', f"재연결 성공 ({attempt}회 시도, 끊김 {downtime:.1f}초, "
+                                         f"응답 대기 명령 {len(reissued)}개 재전송)"))
+    
+    def get_link_stats(self):
+        """
+        포트 끊김 / 재연결 통계
+        
+        Returns:
+            dict: {'link_up', 'reconnect_count', 'downtime_total'(초, 현재 끊김 포함), 'current_downtime'(초),
+                   'gaps'(최근 끊김 구간 목록)}
+        """
+        lost_at = self._link_lost_at
+        current = time.monotonic() - lost_at if lost_at is not None else 0.0
+        return {
+            'link_up': self.link_up,
+            'reconnect_count': self.reconnect_count,
+            'downtime_total': self.downtime_total + current,
+            'current_downtime': current,
+            'gaps': list(self.link_gaps)
+        }
+    
     def disconnect(self):
         """시리얼 포트 연결 해제"""
         try:
             self.stop_thread = True
             self.is_connected = False
+            self.link_up = False
+            self._reconnect_stop.set()
+            
+            # 송신 대기 프레임 정리 및 송신 스레드 깨우기
+            self.tx.close()
             
             # Heartbeat 중지
             self.stop_heartbeat()
             
-            # CMD 0xB1, 0xB2, 0xB4 재전송 중지
-            self.stop_b1_retry()
-            self.stop_b2_retry()
-            self.stop_b4_retry()
+            # 응답 대기 중인 명령 재전송 중지 (재연결 대기 중이었으면 보류도 해제)
+            self.retransmit.cancel_all()
+            self.retransmit.release(reissue=False)
+            
+            # 리액터에서 제거 (포트를 닫기 전에 감시 해제, 포트 전용 리액터는 종료)
+            if self.reactor is not None:
+                self.reactor.detach(self)
+                self.reactor = None
+            self._close_own_reactor()
             
             if self.serial_connection and self.serial_connection.is_open:
                 self.serial_connection.close()
@@ -1190,11 +1230,75 @@ class SerialCommunication:
             return False, error_msg
     
     def start_heartbeat(self):
-        """상태조회 전송 시작 (CMD 0xF0, 0xF1 순차 전송)"""
+        """상태조회 전송 시작 (CMD 0xF0, 0xF1, 0xF2를 CMD별 주기로 전송)"""
         self.heartbeat_active = True
-        self.heartbeat_thread = threading.Thread(target=self._heartbeat_worker, daemon=True)
-        self.heartbeat_thread.start()
-        self.status_queue.put(('SYSTEM', "상태조회 시작 (CMD 0xF0/0xF1, 200ms 간격)"))
+        self.poll_clock.stagger = self.poll_stagger
+        self.poll_clock.reset()
+        if self.reactor is not None:
+            self.reactor.wakeup()
+        else:
+            self.heartbeat_thread = threading.Thread(target=self._heartbeat_worker, daemon=True)
+            self.heartbeat_thread.start()
+        
+        schedule = ", ".join(f"0x{cmd:02X} {rate:.3g}Hz" for cmd, rate in self.get_effective_poll_rates().items()
+                             if rate > 0)
+        mode = f"적응형 {self.poll.mode}" if self.poll_adaptive else "고정 주기"
+        self.status_queue.put(('SYSTEM', f"상태조회 시작 ({mode}, {schedule}, "
+                                         f"설정 주기 기준 링크 사용률 약 {self.estimate_poll_load():.0%})"))
+    
+    def set_poll_rate(self, cmd, rate):
+        """
+        상태조회 CMD의 전송 주기 변경 (동작 중에도 다음 주기부터 반영, poll_adaptive이면 상한 주기)
+        
+        Args:
+            cmd: 상태조회 CMD (0xF0 / 0xF1 / 0xF2)
+            rate: 초당 전송 횟수 (Hz, 0이면 전송 안 함)
+        """
+        if cmd not in self.protocol.STATUS_RESPONSE_LENGTHS:
+            raise ValueError(f"상태조회 CMD가 아닙니다: 0x{cmd:02X}")
+        if rate < 0:
+            raise ValueError(f"전송 주기는 0 이상이어야 합니다: {rate}")
+        self.poll_rates[cmd] = float(rate)
+    
+    def estimate_poll_load(self, baudrate=None):
+        """
+        현재 상태조회 주기로 예상되는 링크 사용률 (0.0 ~ 1.0, 요청 + 응답, 1바이트 = 10비트)
+        
+        Args:
+            baudrate: 통신 속도 (기본값: 연결된 속도, 미연결 시 9600)
+        """
+        baudrate = int(baudrate or self.current_baudrate or 9600)
+        frame_overhead = 7  # STX + TX_ID + CMD + LEN + CRC(2) + ETX
+        bytes_per_second = sum(
+            rate * (frame_overhead + frame_overhead + self.protocol.STATUS_RESPONSE_LENGTHS[cmd])
+            for cmd, rate in self.poll_rates.items() if rate > 0
+        )
+        return bytes_per_second * 10 / baudrate
+    
+    def get_effective_poll_rates(self):
+        """실제로 사용할 CMD별 상태조회 주기 (poll_adaptive이면 poll_rates를 상한으로 한 안전 주기)"""
+        if self.poll_adaptive:
+            return self.poll.safe_rates(self.poll_rates)
+        return dict(self.poll_rates)
+    
+    def get_poll_stats(self):
+        """
+        CMD별 상태조회 통계 (PollScheduler.get_stats 참고)
+        
+        Returns:
+            dict: {CMD: {'ceiling', 'rate', 'achieved', 'rtt_ms', 'rttvar_ms', 'wire_ms', 'sent', 'lost'}}
+        """
+        return self.poll.get_stats(self.poll_rates)
+    
+    def get_poll_clock_stats(self):
+        """
+        CMD별 상태조회 전송 시각 통계 (PollClock.get_stats 참고)
+        
+        Returns:
+            dict: {CMD: {'period_ms', 'issued', 'missed', 'deferred', 'issue_p50_ms', ..., 'write_max_ms',
+                         'mean_interval_ms'}} (지터 = 예정 시각부터 늦은 시간)
+        """
+        return self.poll_clock.get_stats()
     
     def stop_heartbeat(self):
         """상태조회 전송 중지"""
@@ -1203,41 +1307,124 @@ class SerialCommunication:
             self.heartbeat_thread.join(timeout=1.0)
         self.status_queue.put(('SYSTEM', "상태조회 중지"))
     
-    def pause_heartbeat(self):
-        """상태조회 일시 중지 (CMD 0xB3 전송 중 사용)"""
+    def pause_heartbeat(self, owner='user'):
+        """
+        상태조회 일시 중지 (CMD 0xB3 전송 중 사용, 송신 대기 중인 상태조회도 버림)
+        
+        Args:
+            owner: 일시 중지를 요청한 주체 (여러 곳에서 일시 중지하면 모두 resume_heartbeat해야 재개)
+        """
+        self._poll_holds.add(owner)
         self.heartbeat_paused = True
+        self.tx.discard(PRIORITY_POLL)
     
-    def resume_heartbeat(self):
-        """상태조회 재개"""
+    def resume_heartbeat(self, owner='user'):
+        """
+        상태조회 재개 (재개 후 첫 상태응답은 중복 여부와 관계없이 처리)
+        
+        Returns:
+            bool: 재개했으면 True, 다른 주체가 아직 일시 중지 중이면 False
+        """
+        self._poll_holds.discard(owner)
+        if self._poll_holds:
+            return False
+        self.reset_status_cache()
+        self.poll.reset()
         self.heartbeat_paused = False
+        return True
+    
+    def wait_poll_quiet(self, timeout=2.0):
+        """
+        일시 중지 후 이미 보낸 상태조회의 응답이 더 오지 않을 때까지 대기
+        (F1 응답 개수로 B3 완료를 판단하는 제빙테이블 전송 전에 호출)
+        
+        Args:
+            timeout: 최대 대기 시간 (초)
+        
+        Returns:
+            bool: 조용해졌으면 True, timeout까지 응답 대기 시간이 끝나지 않았으면 False
+        """
+        end = time.monotonic() + timeout
+        while True:
+            # 일시 중지 직전에 Heartbeat가 넣은 상태조회가 남아 있으면 버림
+            self.tx.discard(PRIORITY_POLL)
+            now = time.monotonic()
+            remaining = self.poll.quiet_at() - now
+            if remaining <= 0:
+                return True
+            if now + remaining > end:
+                return False
+            time.sleep(remaining)
     
     def _heartbeat_worker(self):
-        """상태조회 전송 작업자 (CMD 0xF0과 0xF1을 순차 전송)"""
-        current_cmd = 0xF0  # 0xF0부터 시작
+        """상태조회 전송 작업자 (CMD별 주기로 전송, poll_adaptive이면 응답 대기 수를 제한하고 안전 주기 사용)"""
         while self.heartbeat_active and self.is_connected:
             try:
-                # 상태조회가 일시 중지되었으면 대기
-                if not self.heartbeat_paused:
-                    # CMD 0xF0과 0xF1을 순차 전송
-                    packet = self.protocol.create_heartbeat_packet(cmd=current_cmd)
-                    self.send_queue.put(packet)
-                    # 다음 CMD로 전환 (0xF0 <-> 0xF1)
-                    current_cmd = 0xF1 if current_cmd == 0xF0 else 0xF0
-                time.sleep(self.heartbeat_interval)
+                wake = self._heartbeat_step()
+                
+                # 다음 전송 시각까지 대기 (상태응답을 받으면 미뤄둔 조회를 바로 전송하도록 깨어남)
+                self.poll.wait(max(0.0, wake - time.monotonic()))
             except Exception as e:
                 if self.heartbeat_active:
                     self.status_queue.put(('ERROR', f"상태조회 전송 오류: {str(e)}"))
                 break
     
-    def send_packet(self, cmd, data_field=None, tx_id=None, priority=False, retry_until_response=False):
+    def _heartbeat_step(self):
+        """
+        예정 시각이 된 상태조회를 송신 스케줄러에 추가 (Heartbeat 스레드 / 리액터에서 호출)
+        예정 시각은 poll_clock의 monotonic_ns 격자를 따르므로 처리 / 대기 시간이 주기에 누적되지 않음
+        
+        Returns:
+            float: 다시 호출할 시각 (time.monotonic 기준)
+        """
+        now_ns = time.monotonic_ns()
+        wake_ns = now_ns + 100_000_000  # 주기 변경을 반영하기 위한 최대 대기시간 (100ms)
+        
+        for cmd, rate in self.get_effective_poll_rates().items():
+            if rate <= 0:
+                self.poll_clock.remove(cmd)
+                continue
+            
+            slot = self.poll_clock.due(cmd, rate, now_ns)
+            if slot <= now_ns:
+                # 상태조회가 일시 중지되었거나 포트 재연결 중이면 전송만 건너뜀 (격자는 유지)
+                issued = False
+                if not self.heartbeat_paused and self.link_up:
+                    # 응답 대기 중인 조회가 가득 찼으면 응답(또는 응답 제한 시간)까지 전송을 미룸
+                    if self.poll_adaptive and not self.poll.try_acquire(cmd):
+                        self.poll_clock.defer(cmd)
+                        continue
+                    
+                    # 추가한 시각부터 1주기 안에 보내지 못한 상태조회는 버리고, 같은 요청이 대기 중이면 추가하지 않음
+                    # (마감 시각은 예정 시각이 아닌 추가 시각 기준 - 응답 대기로 미룬 조회는 예정 시각이 이미 지났음)
+                    packet = self.protocol.create_heartbeat_packet(cmd=cmd)
+                    issued = self.tx.submit(packet, PRIORITY_POLL, deadline=now_ns + round(1e9 / rate), dedup=True)
+                    if not issued and self.poll_adaptive:
+                        # 중복 / 대기열 닫힘으로 추가하지 못함 - 보내지 않은 조회의 응답 대기 해제
+                        self.poll.release(cmd)
+                
+                # 다음 예정 시각 (밀린 예정 시각은 몰아서 보내지 않고 건너뜀)
+                slot = self.poll_clock.advance(cmd, now_ns, issued)
+            
+            wake_ns = min(wake_ns, slot)
+        
+        wake = wake_ns / 1e9
+        expiry = self.poll.next_expiry() if self.poll_adaptive else None
+        if expiry is not None:
+            wake = min(wake, expiry)
+        return wake
+    
+    def send_packet(self, cmd, data_field=None, tx_id=None, priority=False, retry_until_response=False,
+                    send_within=None):
         """프로토콜 패킷 전송 (RX ID 제거)
         
         Args:
             cmd: CMD 값
             data_field: 데이터 필드 (bytes 또는 None)
             tx_id: TX ID (기본값: PC_ID)
-            priority: 우선순위 전송 여부 (True: 우선순위 큐, False: 일반 큐)
+            priority: 우선순위 전송 여부 (True: 제어 명령 우선순위, False: 일반 우선순위)
             retry_until_response: 응답을 받을 때까지 재전송 여부 (True: 재전송, False: 한 번만 전송)
+            send_within: 전송 마감 시간 (초, 이 시간 안에 전송하지 못하면 버림, None이면 마감 없음)
         """
         if not self.is_connected:
             return False, "연결되지 않음"
@@ -1257,245 +1444,373 @@ class SerialCommunication:
             if packet[-1] != self.protocol.ETX:
                 return False, f"패킷 끝이 ETX(0x{self.protocol.ETX:02X})가 아닙니다: 0x{packet[-1]:02X}"
             
-            # 우선순위에 따라 적절한 큐에 추가
+            # 재전송 옵션이 활성화된 경우 응답 CMD를 받을 때까지 재전송 (CMD별 정책은 retransmit.policies)
+            # 응답이 전송 직후 도착해도 놓치지 않도록 대기열 추가 전에 등록
+            if retry_until_response:
+                self.retransmit.track(cmd, packet)
+            
+            # 우선순위에 따라 송신 스케줄러에 추가
+            deadline = None if send_within is None else time.monotonic_ns() + int(send_within * 1e9)
             if priority:
-                self.priority_send_queue.put(packet)
+                self.tx.submit(packet, PRIORITY_COMMAND, deadline=deadline)
                 result_msg = "패킷 우선순위 전송 대기열 추가"
             else:
-                self.send_queue.put(packet)
+                self.tx.submit(packet, PRIORITY_NORMAL, deadline=deadline)
                 result_msg = "패킷 전송 대기열 추가"
             
-            # CMD 0xB1, 0xB2, 0xB4이고 재전송 옵션이 활성화된 경우 재전송 시작
-            if cmd == 0xB1 and retry_until_response:
-                self.start_b1_retry(packet)
-            elif cmd == 0xB2 and retry_until_response:
-                self.start_b2_retry(packet)
-            elif cmd == 0xB4 and retry_until_response:
-                self.start_b4_retry(packet)
+            # 제어 명령 후에는 다음 상태응답을 변경 여부와 관계없이 화면에 반영
+            if cmd not in self.protocol.STATUS_RESPONSE_LENGTHS:
+                self.reset_status_cache()
             
             return True, result_msg
         except Exception as e:
             return False, f"패킷 생성 오류: {str(e)}"
     
-    def start_b1_retry(self, packet):
-        """CMD 0xB1 재전송 시작 (응답을 받을 때까지 재전송)"""
-        # 기존 재전송이 있으면 중지
-        self.stop_b1_retry()
+    def send_request(self, cmd, data_field=None, tx_id=None, timeout=None, retry=True, priority=True, policy=None):
+        """
+        요청 패킷 전송 후 응답을 기다리는 Future 반환 (응답은 수신 스레드에서 CMD로 매칭)
         
-        self.b1_retry_active = True
-        self.b1_retry_packet = packet
-        self.b1_retry_start_time = time.time()
+        Args:
+            cmd: CMD 값
+            data_field: 데이터 필드 (bytes 또는 None)
+            tx_id: TX ID (기본값: PC_ID)
+            timeout: 응답 대기 최대 시간 (초, 기본값: CMD 재전송 정책의 timeout)
+            retry: 응답이 없으면 재전송 여부 (False이면 한 번만 전송하고 timeout까지 대기)
+            priority: 우선순위 전송 여부 (True: 제어 명령 우선순위, False: 일반 우선순위)
+            policy: 재전송 정책 (RetryPolicy, 기본값: retransmit의 CMD 정책, timeout / retry는 이 정책에 적용)
         
-        # 재전송 스레드 시작
-        self.b1_retry_thread = threading.Thread(target=self._b1_retry_worker, daemon=True)
-        self.b1_retry_thread.start()
+        Returns:
+            concurrent.futures.Future: 응답 Frame으로 완료
+                - 응답 없음: TimeoutError
+                - 미연결 / 패킷 생성 오류: ConnectionError / ValueError
+                - 같은 CMD의 새 요청으로 대체되거나 연결 해제: 취소됨 (CancelledError)
+            완료 콜백은 수신 / 타이머 스레드에서 호출되므로 화면 갱신은 root.after로 넘겨서 처리
+        """
+        future = Future()
+        if not self.is_connected:
+            future.set_exception(ConnectionError("연결되지 않음"))
+            return future
+        
+        try:
+            packet = self.protocol.create_packet(self.protocol.PC_ID if tx_id is None else tx_id, cmd, data_field)
+        except Exception as e:
+            future.set_exception(ValueError(f"패킷 생성 오류: {str(e)}"))
+            return future
+        
+        if policy is None:
+            policy = self.retransmit.policy_for(cmd)
+        changes = {}
+        if timeout is not None:
+            changes['timeout'] = timeout
+        if not retry:
+            changes['max_attempts'] = 1
+        if changes:
+            policy = policy.replace(**changes)
+        
+        # 응답이 전송 직후 도착해도 놓치지 않도록 대기열 추가 전에 등록
+        entry = self.retransmit.track(cmd, packet, policy)
+        self.tx.submit(packet, PRIORITY_COMMAND if priority else PRIORITY_NORMAL)
+        
+        # 제어 명령 후에는 다음 상태응답을 변경 여부와 관계없이 화면에 반영
+        if cmd not in self.protocol.STATUS_RESPONSE_LENGTHS:
+            self.reset_status_cache()
+        
+        return entry.future
+    
+    def _resend_packet(self, packet, interval):
+        """재전송 타이머에서 호출 - 제어 명령 우선순위로 재전송 (이전 재전송이 대기 중이면 추가하지 않음)"""
+        self.latency.mark_retry(packet)
+        self.tx.submit(packet, PRIORITY_COMMAND, deadline=time.monotonic_ns() + int(interval * 1e9), dedup=True)
+    
+    def _on_retransmit_timeout(self, entry):
+        """재전송 타임아웃 알림"""
+        self.status_queue.put(('SYSTEM', f"CMD 0x{entry.cmd:02X} 재전송 타임아웃 ({entry.policy.timeout}초, "
+                                         f"{entry.attempts}회 전송)"))
+    
+    def start_b1_retry(self, packet):
+        """CMD 0xB1 재전송 시작 (응답을 받을 때까지 재전송)"""
+        self.retransmit.track(0xB1, packet)
     
     def stop_b1_retry(self):
         """CMD 0xB1 재전송 중지"""
-        self.b1_retry_active = False
-        self.b1_retry_packet = None
-        self.b1_retry_start_time = None
-    
-    def _b1_retry_worker(self):
-        """CMD 0xB1 재전송 작업자 스레드"""
-        while self.b1_retry_active and self.is_connected:
-            try:
-                # 타임아웃 체크
-                if self.b1_retry_start_time is not None:
-                    elapsed = time.time() - self.b1_retry_start_time
-                    if elapsed >= self.b1_retry_timeout:
-                        self.b1_retry_active = False
-                        self.status_queue.put(('SYSTEM', f"CMD 0xB1 재전송 타임아웃 ({self.b1_retry_timeout}초)"))
-                        break
-                
-                # 패킷 재전송
-                if self.b1_retry_packet:
-                    self.priority_send_queue.put(self.b1_retry_packet)
-                
-                # 재전송 간격만큼 대기
-                time.sleep(self.b1_retry_interval)
-                
-            except Exception as e:
-                if self.b1_retry_active:
-                    self.status_queue.put(('ERROR', f"CMD 0xB1 재전송 오류: {str(e)}"))
-                break
+        self.retransmit.cancel(0xB1)
     
     def start_b2_retry(self, packet):
         """CMD 0xB2 재전송 시작 (응답을 받을 때까지 재전송)"""
-        # 기존 재전송이 있으면 중지
-        self.stop_b2_retry()
-        
-        self.b2_retry_active = True
-        self.b2_retry_packet = packet
-        self.b2_retry_start_time = time.time()
-        
-        # 재전송 스레드 시작
-        self.b2_retry_thread = threading.Thread(target=self._b2_retry_worker, daemon=True)
-        self.b2_retry_thread.start()
+        self.retransmit.track(0xB2, packet)
     
     def stop_b2_retry(self):
         """CMD 0xB2 재전송 중지"""
-        self.b2_retry_active = False
-        self.b2_retry_packet = None
-        self.b2_retry_start_time = None
-    
-    def _b2_retry_worker(self):
-        """CMD 0xB2 재전송 작업자 스레드"""
-        while self.b2_retry_active and self.is_connected:
-            try:
-                # 타임아웃 체크
-                if self.b2_retry_start_time is not None:
-                    elapsed = time.time() - self.b2_retry_start_time
-                    if elapsed >= self.b2_retry_timeout:
-                        self.b2_retry_active = False
-                        self.status_queue.put(('SYSTEM', f"CMD 0xB2 재전송 타임아웃 ({self.b2_retry_timeout}초)"))
-                        break
-                
-                # 패킷 재전송
-                if self.b2_retry_packet:
-                    self.priority_send_queue.put(self.b2_retry_packet)
-                
-                # 재전송 간격만큼 대기
-                time.sleep(self.b2_retry_interval)
-                
-            except Exception as e:
-                if self.b2_retry_active:
-                    self.status_queue.put(('ERROR', f"CMD 0xB2 재전송 오류: {str(e)}"))
-                break
+        self.retransmit.cancel(0xB2)
     
     def start_b4_retry(self, packet):
         """CMD 0xB4 재전송 시작 (응답을 받을 때까지 재전송)"""
-        # 기존 재전송이 있으면 중지
-        self.stop_b4_retry()
-        
-        self.b4_retry_active = True
-        self.b4_retry_packet = packet
-        self.b4_retry_start_time = time.time()
-        
-        # 재전송 스레드 시작
-        self.b4_retry_thread = threading.Thread(target=self._b4_retry_worker, daemon=True)
-        self.b4_retry_thread.start()
+        self.retransmit.track(0xB4, packet)
     
     def stop_b4_retry(self):
         """CMD 0xB4 재전송 중지"""
-        self.b4_retry_active = False
-        self.b4_retry_packet = None
-        self.b4_retry_start_time = None
+        self.retransmit.cancel(0xB4)
     
-    def _b4_retry_worker(self):
-        """CMD 0xB4 재전송 작업자 스레드"""
-        while self.b4_retry_active and self.is_connected:
-            try:
-                # 타임아웃 체크
-                if self.b4_retry_start_time is not None:
-                    elapsed = time.time() - self.b4_retry_start_time
-                    if elapsed >= self.b4_retry_timeout:
-                        self.b4_retry_active = False
-                        self.status_queue.put(('SYSTEM', f"CMD 0xB4 재전송 타임아웃 ({self.b4_retry_timeout}초)"))
-                        break
-                
-                # 패킷 재전송
-                if self.b4_retry_packet:
-                    self.priority_send_queue.put(self.b4_retry_packet)
-                
-                # 재전송 간격만큼 대기
-                time.sleep(self.b4_retry_interval)
-                
-            except Exception as e:
-                if self.b4_retry_active:
-                    self.status_queue.put(('ERROR', f"CMD 0xB4 재전송 오류: {str(e)}"))
-                break
+    def get_retransmit_stats(self):
+        """
+        CMD별 재전송 통계 반환 (RetransmitManager.get_stats 참고)
+        
+        Returns:
+            dict: {CMD: {'tracked', 'acked', 'attempts', 'timeouts', 'cancelled', 'pending', 'avg_ack_ms', 'max_ack_ms'}}
+        """
+        return self.retransmit.get_stats()
     
-    def _receive_worker(self):
-        """데이터 수신 스레드"""
-        while not self.stop_thread and self.is_connected:
+    def _receive_worker(self, generation):
+        """데이터 수신 스레드 (OS에서 도착을 대기하고 도착한 바이트를 한 번에 읽어 파싱)"""
+        receiver = SerialReceiver(self.serial_connection, timeout=self.receive_timeout)
+        self.receiver = receiver
+        
+        while self._io_alive(generation):
             try:
-                if self.serial_connection and self.serial_connection.in_waiting > 0:
-                    data = self.serial_connection.read(self.serial_connection.in_waiting)
-                    
-                    # RAW 데이터 로깅 (디버그용)
-                    if len(data) > 0:
-                        raw_hex = ' '.join([f'{b:02X}' for b in data])
-                        self.receive_queue.put(('RAW_DATA', {
-                            'data': data.hex().upper(),
-                            'length': len(data),
-                            'bytes': raw_hex
-                        }))
-                    
-                    # 프로토콜 패킷 파싱
-                    packets = self.protocol.process_received_data(data)
-                    
-                    for packet_info in packets:
-                        self.receive_queue.put(('PACKET', packet_info))
+                data = receiver.read()
+                if data is None:
+                    continue
                 
-                time.sleep(0.01)
+                # data는 수신 버퍼의 뷰이므로 다음 read() 전에 처리
+                self._handle_received(data, receiver.last_arrival_ns)
                 
             except Exception as e:
-                if self.is_connected:
-                    self.receive_queue.put(('ERROR', f"수신 오류: {str(e)}"))
+                if self._io_alive(generation):
+                    self._on_link_lost(f"수신 오류: {str(e)}")
                 break
     
-    def _send_worker(self):
-        """데이터 송신 스레드 (우선순위 큐를 먼저 처리)"""
-        while not self.stop_thread and self.is_connected:
+    def _handle_received(self, data, arrival_ns):
+        """
+        수신 바이트 처리 - 프레임 파싱, 응답 매칭, 중복 상태응답 필터 후 receive_queue로 전달
+        (수신 스레드 / 리액터에서 호출)
+        
+        Args:
+            data: 수신 바이트 (bytes / memoryview)
+            arrival_ns: 도착 시각 (time.monotonic_ns)
+        """
+        # 상태조회 응답 없음 판단용 수신 시각 (응답 뒤 수신이 끊기면 응답 대기 해제)
+        self.poll.on_rx(arrival_ns)
+        
+        # 원시 바이트 캡처 (켜져 있을 때만 읽은 바이트를 그대로 기록)
+        capture = self.capture
+        if capture is not None:
+            capture.write(CAPTURE_RX, data, arrival_ns)
+        
+        # 프로토콜 패킷 파싱 (이전 읽기에서 시작된 미완성 프레임이 있으면 그 읽기 시각이 첫 프레임의 시작)
+        start_ns = self._rx_partial_ns if self.protocol.decoder.buffered else arrival_ns
+        packets = self.protocol.process_received_data(data)
+        self._rx_partial_ns = ((arrival_ns if packets else start_ns)
+                               if self.protocol.decoder.buffered else None)
+        
+        for packet_info in packets:
+            if not packet_info.is_error:
+                packet_info.timestamp = arrival_ns
+                # 첫 바이트 도착 시각 = 시작 바이트(STX)를 읽은 시각 (프레임이 여러 번에 나눠 읽혔으면 첫 읽기)
+                packet_info.first_byte_ns = start_ns
+                # 응답 대기 중인 명령 완료 (중복 상태응답 필터 전에 확인)
+                if packet_info.tx_id == self.protocol.MAIN_ID:
+                    self.latency.on_response(packet_info.cmd, packet_info.first_byte_ns)
+                    self.retransmit.on_response(packet_info)
+                    if packet_info.cmd in self.protocol.STATUS_RESPONSE_LENGTHS:
+                        self.poll.on_response(packet_info.cmd, packet_info.timestamp)
+            start_ns = arrival_ns   # 같은 읽기의 다음 프레임은 이 읽기에서 시작
+            unchanged = self._filter_status_frame(packet_info) if self.dedup_status else None
+            if unchanged is not None:
+                self.receive_queue.put(('UNCHANGED', unchanged))
+            else:
+                self.receive_queue.put(('PACKET', packet_info))
+    
+    def start_capture(self, path, max_bytes=None):
+        """
+        원시 바이트 캡처 시작 (이미 캡처 중이면 이전 파일을 닫고 새로 시작, 연결 해제 후에도 stop_capture까지 유지)
+        
+        Args:
+            path: 캡처 파일 경로 (raw_capture 형식, py raw_capture.py <파일>로 보기)
+            max_bytes: 기록할 최대 바이트 수 (None이면 제한 없음)
+        """
+        self.stop_capture()
+        self.capture = RawCapture(path, max_bytes)
+    
+    def stop_capture(self):
+        """
+        원시 바이트 캡처 종료
+        
+        Returns:
+            dict: 캡처 통계 (path, chunks, rx_bytes, tx_bytes, skipped_bytes), 캡처 중이 아니었으면 None
+        """
+        capture, self.capture = self.capture, None
+        if capture is None:
+            return None
+        capture.close()
+        return capture.get_stats()
+    
+    def get_receive_stats(self):
+        """수신 읽기 통계 (읽기 횟수, 1회 읽기 바이트 수, 최근 읽기 간격 등, 미연결 시 None)"""
+        return self.receiver.get_stats() if self.receiver else None
+    
+    def _filter_status_frame(self, frame):
+        """
+        상태응답(F0/F1/F2) 중복 확인 - 직전 같은 CMD 응답과 프레임 바이트 비교
+        
+        Returns:
+            StatusUnchanged: 직전 응답과 같은 경우
+            None: 새 응답이거나 상태응답이 아닌 경우 (그대로 'PACKET'으로 전달)
+        """
+        if frame.is_error or frame.cmd not in self.protocol.STATUS_RESPONSE_LENGTHS:
+            return None
+        
+        cmd = frame.cmd
+        if self._last_status_frames.get(cmd) == frame.raw:
+            repeat = self._status_repeat.get(cmd, 0) + 1
+            self._status_repeat[cmd] = repeat
+            return StatusUnchanged(frame.tx_id, cmd, frame.timestamp, repeat)
+        
+        self._last_status_frames[cmd] = frame.raw
+        self._status_repeat[cmd] = 0
+        return None
+    
+    def reset_status_cache(self):
+        """중복 상태응답 필터 초기화 (다음 상태응답은 변경 여부와 관계없이 'PACKET'으로 전달)"""
+        self._last_status_frames.clear()
+        self._status_repeat.clear()
+    
+    def _send_worker(self, generation):
+        """데이터 송신 스레드 (송신 스케줄러에서 우선순위 순으로 꺼내 전송, 대기 프레임이 없으면 잠듦)"""
+        while self._io_alive(generation):
             try:
-                data = None
-                
-                # 우선순위 큐를 먼저 확인 (non-blocking)
-                try:
-                    data = self.priority_send_queue.get_nowait()
-                except queue.Empty:
-                    # 우선순위 큐가 비어있으면 일반 큐에서 가져오기 (짧은 timeout으로 우선순위 큐를 자주 확인)
-                    try:
-                        data = self.send_queue.get(timeout=0.01)  # timeout을 0.01초로 줄여서 우선순위 큐를 자주 확인
-                    except queue.Empty:
-                        # 둘 다 비어있으면 잠시 대기 후 다시 확인
-                        time.sleep(0.01)
-                        continue
+                # 프레임이 추가되거나 연결 해제(tx.close)될 때까지 대기 후 이미 대기 중인 프레임까지 함께 꺼냄
+                batch = self.tx.get_batch(self.tx_batch_frames, timeout=1.0, max_bytes=self.tx_batch_bytes)
+                if not batch or not self._io_alive(generation):
+                    continue
                 
-                # 패킷 전송 처리
-                if data and self.serial_connection and self.serial_connection.is_open:
-                    # 패킷 검증: STX와 ETX가 포함되어 있는지 확인
-                    if len(data) >= 2:
-                        if data[0] != self.protocol.STX:
-                            self.receive_queue.put(('ERROR', f"전송 패킷 시작이 STX가 아닙니다: 0x{data[0]:02X}"))
-                        elif data[-1] != self.protocol.ETX:
-                            self.receive_queue.put(('ERROR', f"전송 패킷 끝이 ETX가 아닙니다: 0x{data[-1]:02X}"))
-                        else:
-                            # STX와 ETX가 포함된 전체 패킷 전송
-                            self.serial_connection.write(data)
-                            self.receive_queue.put(('SENT', data))
-                    else:
-                        self.receive_queue.put(('ERROR', f"전송 패킷이 너무 짧습니다: {len(data)}바이트"))
+                self._write_batch(batch)
                 
-            except queue.Empty:
-                continue
             except Exception as e:
-                if self.is_connected:
-                    self.receive_queue.put(('ERROR', f"송신 오류: {str(e)}"))
+                if self._io_alive(generation):
+                    self._on_link_lost(f"송신 오류: {str(e)}")
                 break
     
+    def _write_packet(self, data):
+        """패킷 1개 검증 후 포트에 쓰기"""
+        self._write_batch([data])
+    
+    def _write_batch(self, packets):
+        """
+        패킷 묶음 검증 후 포트에 쓰기 (송신 스레드 / 리액터에서 호출)
+        tx_frame_gap이 0이면 write 1회, 0보다 크면 프레임 사이에 (전송 시간 + tx_frame_gap)만큼 대기
+        """
+        if not (self.serial_connection and self.serial_connection.is_open):
+            return
+        
+        valid = [data for data in packets if self._check_tx_packet(data)]
+        if not valid:
+            return
+        
+        if self.tx_frame_gap <= 0:
+            # 묶음 전체를 한 번에 쓰고, 상태조회 전송 시각은 앞 프레임의 전송 시간만큼 늦춰서 기록
+            byte_time_ns = 10 * 1e9 / self.serial_connection.baudrate
+            self.serial_connection.write(b''.join(valid))
+            sent_ns = time.monotonic_ns()
+            for data in valid:
+                self._on_packet_written(data, sent_ns)
+                sent_ns += int(len(data) * byte_time_ns)
+        else:
+            for index, data in enumerate(valid):
+                if index:
+                    time.sleep(self.tx_frame_spacing(valid[index - 1]))
+                self.serial_connection.write(data)
+                self._on_packet_written(data, time.monotonic_ns())
+        
+        self.receive_queue.put(('SENT_BATCH', valid))
+    
+    def _check_tx_packet(self, data):
+        """전송 패킷 검증 (STX ~ ETX), 잘못된 패킷은 오류 이벤트 후 False"""
+        if len(data) < 2:
+            self.receive_queue.put(('ERROR', f"전송 패킷이 너무 짧습니다: {len(data)}바이트"))
+        elif data[0] != self.protocol.STX:
+            self.receive_queue.put(('ERROR', f"전송 패킷 시작이 STX가 아닙니다: 0x{data[0]:02X}"))
+        elif data[-1] != self.protocol.ETX:
+            self.receive_queue.put(('ERROR', f"전송 패킷 끝이 ETX가 아닙니다: 0x{data[-1]:02X}"))
+        else:
+            return True
+        return False
+    
+    def _on_tx_expired(self, packet, priority):
+        """마감 시각이 지나 송신 대기열에서 버린 프레임 처리 (상태조회는 응답 대기 해제)"""
+        if priority == PRIORITY_POLL and self.poll_adaptive:
+            self.poll.release(packet[2])
+    
+    def _on_packet_written(self, data, sent_ns):
+        """포트에 쓴 패킷 기록 (응답 시간 히스토그램 / 상태조회 RTT 측정용 전송 시각, 원시 바이트 캡처)"""
+        capture = self.capture
+        if capture is not None:
+            capture.write(CAPTURE_TX, data, sent_ns)
+        self.latency.on_sent(data, sent_ns)
+        if data[2] in self.protocol.STATUS_RESPONSE_LENGTHS:
+            self.poll.on_sent(data[2], sent_ns)
+            self.poll_clock.on_written(data[2], sent_ns)
+    
+    def tx_frame_spacing(self, data):
+        """tx_frame_gap > 0일 때 data 다음 프레임까지의 최소 간격 (초, 전송 시간 + tx_frame_gap)"""
+        return len(data) * 10 / self.serial_connection.baudrate + self.tx_frame_gap
+    
+    def get_latency_stats(self):
+        """
+        CMD별 왕복 시간 통계 (LatencyRecorder.get_stats 참고, 요청 쓰기 ~ 응답 첫 바이트)
+        
+        Returns:
+            list: [{'cmd', 'context', 'sent', 'recorded', 'retried', 'lost', 'count', 'min_ms', 'p50_ms',
+                    'p90_ms', 'p99_ms', 'max_ms', 'mean_ms'}, ...]
+        """
+        return self.latency.get_stats()
+    
+    def get_send_stats(self):
+        """
+        CMD별 송신 대기 통계 반환 (TxScheduler.get_stats 참고)
+        
+        Returns:
+            dict: {CMD: {'sent', 'deduped', 'expired', 'avg_wait_ms', 'max_wait_ms'}}
+        """
+        return self.tx.get_stats()
+    
     def get_received_data(self):
-        """수신된 데이터 가져오기"""
-        received_data = []
-        try:
-            while True:
-                data = self.receive_queue.get_nowait()
-                received_data.append(data)
-        except queue.Empty:
-            pass
-        return received_data
+        """수신된 데이터 가져오기 (버리거나 합친 이벤트가 있으면 끝에 'CHANNEL_DROPPED' 이벤트 포함)"""
+        return self.receive_queue.drain()
     
     def get_status_updates(self):
-        """상태 업데이트 가져오기"""
-        status_updates = []
-        try:
-            while True:
-                status = self.status_queue.get_nowait()
-                status_updates.append(status)
-        except queue.Empty:
-            pass
-        return status_updates
+        """상태 업데이트 가져오기 (버린 메시지가 있으면 끝에 'CHANNEL_DROPPED' 이벤트 포함)"""
+        return self.status_queue.drain()
+    
+    def _classify_received(self, item):
+        """receive_queue 이벤트 등급 (상태응답 / RAW / 로그, 그 외 명령 응답 / 연결 이벤트는 기본 등급)"""
+        kind, payload = item
+        if kind == 'PACKET':
+            if payload.is_error:
+                return 'log'
+            return 'status' if payload.cmd in self.protocol.STATUS_RESPONSE_LENGTHS else None
+        return _RECEIVE_EVENT_CLASSES.get(kind)
+    
+    def _on_status_backlog(self, active):
+        """수신 채널에 상태응답이 용량보다 많이 쌓이면 상태조회 일시 중지, 절반 이하로 줄면 재개"""
+        if active:
+            self.pause_heartbeat('backpressure')
+            self.status_queue.put(('SYSTEM', "수신 처리 지연 - 상태응답이 처리될 때까지 상태조회 일시 중지"))
+        elif self.resume_heartbeat('backpressure'):
+            self.status_queue.put(('SYSTEM', "수신 처리 지연 해소 - 상태조회 재개"))
+    
+    def get_channel_stats(self):
+        """
+        이벤트 채널 통계
+        
+        Returns:
+            dict: {'receive': {등급: 통계}, 'status': {등급: 통계}} (등급별 pending, high_water, put, dropped,
+                  coalesced, backpressure 등, 채널이 아닌 객체로 바꿨으면 해당 항목 없음)
+        """
+        result = {}
+        for name, channel in (('receive', self.receive_queue), ('status', self.status_queue)):
+            if isinstance(channel, EventChannel):
+                result[name] = channel.get_stats()
+        return result
 
 
 class DataParser:
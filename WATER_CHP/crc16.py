@@ -0,0 +1,80 @@
+"""
+CRC16-CCITT 계산 모듈 (테이블 방식)
+프로토콜 패킷의 CRC (STX ~ DATA FIELD) 계산에 사용합니다.
+
+초기값: 0x0000
+다항식: 0x1021 (MSB first, 입출력 반사 없음)
+"""
+import binascii
+
+
+# CRC 초기값 / 다항식 (ProtocolHandler.calculate_crc16과 동일)
+CRC16_INIT = 0x0000
+CRC16_POLY = 0x1021
+
+
+def _build_table(poly):
+    """상위 바이트 값(0~255)별 CRC 나머지 테이블 생성"""
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ poly) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+        table.append(crc)
+    return tuple(table)
+
+
+# 256개 엔트리 CRC 테이블 (모듈 로드 시 1회 생성)
+CRC16_TABLE = _build_table(CRC16_POLY)
+
+
+def update(crc, chunk):
+    """
+    CRC 값을 chunk 만큼 누적 계산 (증분 계산)
+    
+    binascii.crc_hqx는 동일한 다항식(0x1021)의 테이블 방식 CRC를 C로 구현한 것이므로
+    기본 경로로 사용합니다.
+    
+    Args:
+        crc: 이전까지 계산된 CRC 값 (처음에는 CRC16_INIT)
+        chunk: bytes / bytearray / memoryview
+    
+    Returns:
+        int: 누적된 CRC16 값
+    """
+    return binascii.crc_hqx(chunk, crc)
+
+
+def update_table(crc, chunk):
+    """
+    CRC 값을 chunk 만큼 누적 계산 (순수 파이썬 테이블 방식)
+    update()와 결과가 동일하며, 비교/검증용으로 사용합니다.
+    """
+    table = CRC16_TABLE
+    for byte in chunk:
+        crc = ((crc << 8) & 0xFF00) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+def update_bitwise(crc, chunk):
+    """
+    CRC 값을 chunk 만큼 누적 계산 (기존 비트 단위 방식)
+    바이트마다 8번 반복하는 기존 구현으로, 벤치마크 기준값으로만 사용합니다.
+    """
+    for byte in chunk:
+        crc ^= (byte << 8)
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = (crc << 1) ^ CRC16_POLY
+            else:
+                crc = crc << 1
+            crc &= 0xFFFF
+    return crc
+
+
+def crc16(data):
+    """data 전체의 CRC16 값 계산 (초기값 0x0000)"""
+    return update(CRC16_INIT, data)
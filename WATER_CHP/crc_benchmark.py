@@ -0,0 +1,69 @@
+"""
+CRC16 계산 벤치마크 - 기존 비트 단위 방식과 테이블 방식 비교
+실제 프로토콜 프레임 크기(F0/F1 요청, F0/F1 응답, B3 제빙테이블)로 측정합니다.
+
+실행: py crc_benchmark.py [반복횟수]
+"""
+import os
+import sys
+import timeit
+
+import crc16
+
+
+# 측정 대상 프레임 (CRC 계산 범위 = STX ~ DATA FIELD = 4 + DATA 길이)
+FRAME_SIZES = [
+    ('F0/F1 요청 (DATA 0)', 4),
+    ('B4 보냉 변경 (DATA 4)', 8),
+    ('B1/B2 변경 (DATA 5)', 9),
+    ('F0 응답 (DATA 40)', 44),
+    ('F1 응답 (DATA 76)', 80),
+    ('B3 제빙테이블 (DATA 93)', 97),
+]
+
+# 비교 구현 (이름, 함수)
+IMPLEMENTATIONS = [
+    ('기존 비트 단위', crc16.update_bitwise),
+    ('테이블 (파이썬)', crc16.update_table),
+    ('테이블 (crc_hqx)', crc16.update),
+]
+
+
+def run_benchmark(number=20000):
+    """프레임 크기별로 각 구현의 1회 계산 시간(us)을 측정하여 출력"""
+    print(f"CRC16-CCITT 벤치마크 (초기값 0x{crc16.CRC16_INIT:04X}, 다항식 0x{crc16.CRC16_POLY:04X}, 반복 {number}회)")
+    print("-" * 78)
+    header = f"{'프레임':<24}" + "".join(f"{name:>16}" for name, _ in IMPLEMENTATIONS) + f"{'개선율':>10}"
+    print(header)
+    print("-" * 78)
+    
+    for label, size in FRAME_SIZES:
+        frame = os.urandom(size)
+        
+        # 결과 일치 확인 (bytes / bytearray / memoryview 모두)
+        expected = crc16.update_bitwise(crc16.CRC16_INIT, frame)
+        for _, func in IMPLEMENTATIONS:
+            for data in (frame, bytearray(frame), memoryview(frame)):
+                if func(crc16.CRC16_INIT, data) != expected:
+                    raise AssertionError(f"CRC 불일치: {func.__name__} ({label})")
+        
+        # 증분 계산 결과 확인 (헤더 + DATA FIELD 분할 계산)
+        if crc16.update(crc16.update(crc16.CRC16_INIT, frame[:4]), frame[4:]) != expected:
+            raise AssertionError(f"증분 CRC 불일치 ({label})")
+        
+        timings = []
+        for _, func in IMPLEMENTATIONS:
+            seconds = timeit.timeit(lambda: func(crc16.CRC16_INIT, frame), number=number)
+            timings.append(seconds / number * 1e6)
+        
+        row = f"{label:<24}" + "".join(f"{t:>14.2f}us" for t in timings)
+        row += f"{timings[0] / timings[-1]:>9.1f}x"
+        print(row)
+    
+    print("-" * 78)
+
+
+# 독립 실행용
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    run_benchmark(count)
@@ -0,0 +1,523 @@
+"""
+메인 보드 시뮬레이터 모듈
+Linux pty를 열고 메인 보드(ZIG_MAIN test_uart_comm.c / App_Comm_Protocol.c)와 같은 바이너리 프로토콜로 응답합니다.
+하드웨어 없이 gui_main.py / rig_manager.py / 부하 시험을 실행할 때 사용합니다.
+
+- 응답: F0 → F0, F1 / B3 → F1 (B3는 제빙테이블 행 적용 후), B1 / B2 / B4 → 받은 DATA FIELD 그대로 에코,
+        그 외 CMD → F0 (test_uart_comm.c의 default 처리)
+- 상태: 센서값은 기준값 주변에서 천천히 변하고, 제빙 STEP은 255(초기화) → 0 → 5 ... 22 → 30 → 31 ... 51 → 0 순서로 진행
+        STEP 22에서는 PC가 B3(제빙테이블 행)을 보낼 때까지 대기 (최대 STEP22_TIMEOUT초)
+- 결함 주입: 응답 지연 / 지터, 응답 누락, 바이트 변조(CRC 오류), 프레임 사이 잡음 바이트, 최대 응답 주기
+- 부하 시험: stream_rate를 지정하면 요청 없이 F0 / F1을 번갈아 전송 (inf이면 쉬지 않고 전송)
+
+사용 예:
+    py device_simulator.py                          # pty 경로 출력 후 대기 (gui_main.py에서 해당 경로로 연결)
+    py device_simulator.py --delay 0.01 --jitter 0.005 --corrupt 0.01 --step-scale 0.1
+    py device_simulator.py --stream max             # 수신 경로 부하 시험
+"""
+import argparse
+import os
+import pty
+import random
+import select
+import threading
+import time
+import tty
+
+import crc16
+from communication import ProtocolHandler
+from frame_decoder import FrameDecoder
+
+
+STX = ProtocolHandler.STX
+ETX = ProtocolHandler.ETX
+MAIN_ID = ProtocolHandler.MAIN_ID
+
+F0_LENGTH = ProtocolHandler.STATUS_RESPONSE_LENGTHS[0xF0]
+F1_LENGTH = ProtocolHandler.STATUS_RESPONSE_LENGTHS[0xF1]
+
+# 제빙 STEP 진행 순서 (STEP, 유지 시간(초)) - 31(제빙중)은 적용된 제빙시간, 22는 B3 수신까지 대기
+ICE_STEP_SEQUENCE = (
+    (255, 2.0),                                 # 초기화
+    (0, 3.0),                                   # 대기
+    (5, 1.0), (6, 1.0), (7, 1.0),               # 예열
+    (10, 2.0),                                  # 트레이 상승
+    (11, 1.0), (12, 1.0), (13, 1.0), (14, 1.0), # 입수 전 준비
+    (20, 3.0),                                  # 트레이 입수
+    (22, None),                                 # 시간 적용 (B3 대기)
+    (30, 1.0),                                  # 시간 확정
+    (31, None),                                 # 제빙중
+    (40, 2.0),                                  # 트레이 하강
+    (41, 1.0), (42, 1.0), (43, 1.0), (44, 1.0), # 탈빙중
+    (50, 1.0),                                  # 얼음양 체크
+    (51, 2.0),                                  # 제빙 완료
+)
+STEP_TABLE_WAIT = 22        # 제빙테이블(B3) 수신을 기다리는 STEP
+STEP_ICEMAKING = 31         # 제빙시간만큼 유지하는 STEP
+STEP22_TIMEOUT = 15.0       # STEP 22 최대 대기 시간 (초, B3를 받지 못하면 기본 제빙시간으로 진행)
+DEFAULT_ICEMAKING_TIME = 60 # 제빙테이블 미적용 시 제빙시간 (초)
+
+
+def build_frame(cmd, data_field=b'', tx_id=MAIN_ID):
+    """메인 → PC 프레임 생성 (STX ~ ETX, CRC16은 STX ~ DATA 범위)"""
+    frame = bytearray((STX, tx_id, cmd, len(data_field)))
+    frame += data_field
+    crc = crc16.crc16(frame)
+    frame += bytes(((crc >> 8) & 0xFF, crc & 0xFF, ETX))
+    return bytes(frame)
+
+
+def _sign_magnitude(value):
+    """온도값을 부호-크기 1바이트로 변환 (MSB=1이면 음수, 크기 최대 127)"""
+    value = int(round(value))
+    if value < 0:
+        return 0x80 | min(-value, 0x7F)
+    return min(value, 0x7F)
+
+
+class SimulatedDevice:
+    """메인 보드 상태 모델 (센서값, 밸브, 공조 / 냉각 / 제빙 / 보냉 / 드레인 상태)"""
+    
+    def __init__(self, step_scale=1.0, rng=None):
+        """
+        Args:
+            step_scale: 제빙 STEP 유지 시간 배율 (0.1이면 10배 빠르게 진행)
+            rng: random.Random (재현 가능한 시험용, 기본값: 새 인스턴스)
+        """
+        self.step_scale = step_scale
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        
+        # 센서 기준값 (℃) - F0 DATA1~7 순서
+        self.base_temps = [25.0, 15.0, 22.0, 30.0, 5.0, 80.0, 85.0]
+        self.temps = list(self.base_temps)
+        self.nos_valves = [1, 1, 1, 1, 1]   # 1: CLOSE
+        self.feed_valves = [0] * 15         # 1: OPEN
+        self.filter_reed = 1
+        self.front_reed = 1
+        
+        # 공조 / 냉각 (B1로 변경)
+        self.compressor_on = 1
+        self.current_rps = 50
+        self.error_code = 0
+        self.cooling_target_rps = 55
+        self.cooling_on_temp = 70           # 0.1℃ 단위
+        self.cooling_off_temp = 40
+        self.cooling_delay_time = 0
+        
+        # 제빙 (B2 / B3로 변경)
+        self.ice_target_rps = 60
+        self.tray_in_hz = 900
+        self.swing_on = 2
+        self.swing_off = 6
+        self.freezing_table = {}            # 행 인덱스 → 46개 값
+        self.icemaking_time = DEFAULT_ICEMAKING_TIME
+        
+        # 보냉 (B4로 변경)
+        self.keep_target_rps = 0
+        self.keep_target_temp = 0
+        self.keep_first_temp = 0
+        self.keep_tray_position = 0
+        
+        # 드레인
+        self.drain_low = 0
+        self.drain_high = 0
+        self.drain_pump = 0
+        self.tank_cover = 0
+        
+        self._step_index = 0
+        self._step_started = time.monotonic()
+        self._table_applied = False
+    
+    @property
+    def ice_step(self):
+        return ICE_STEP_SEQUENCE[self._step_index][0]
+    
+    def tick(self, now=None):
+        """시간 경과 반영 (센서값 변화, 제빙 STEP 진행)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for i, base in enumerate(self.base_temps):
+                drift = self.temps[i] + self.rng.uniform(-0.3, 0.3)
+                self.temps[i] = min(base + 3.0, max(base - 3.0, drift))
+            self._advance_step_locked(now)
+    
+    def _advance_step_locked(self, now):
+        """유지 시간이 지난 STEP을 다음 STEP으로 진행"""
+        while True:
+            step, duration = ICE_STEP_SEQUENCE[self._step_index]
+            if step == STEP_TABLE_WAIT:
+                if not self._table_applied:
+                    duration = STEP22_TIMEOUT
+                else:
+                    duration = 0.0
+            elif step == STEP_ICEMAKING:
+                duration = self.icemaking_time
+            
+            if now - self._step_started < duration * self.step_scale:
+                return
+            if step == STEP_TABLE_WAIT:
+                self._step_started = now    # B3 수신 시각부터 다음 STEP 시작
+            else:
+                self._step_started += duration * self.step_scale
+            self._step_index = (self._step_index + 1) % len(ICE_STEP_SEQUENCE)
+            if self._step_index == 0:
+                self._step_index = 1        # 초기화(255)는 시작 시 한 번만
+            if self.ice_step == STEP_TABLE_WAIT:
+                self._table_applied = False
+    
+    def apply_command(self, cmd, data_field):
+        """제어 CMD 반영 (App_Comm_Protocol.c의 Parse_Bx_Protocol과 같은 위치)"""
+        data = bytes(data_field)
+        with self._lock:
+            if cmd == 0xB1 and len(data) >= 5:
+                self.cooling_target_rps = data[0]
+                self.cooling_on_temp = data[1]
+                self.cooling_off_temp = data[2]
+                self.cooling_delay_time = (data[3] << 8) | data[4]
+            elif cmd == 0xB2 and len(data) >= 5:
+                self.ice_target_rps = data[0]
+                self.tray_in_hz = (data[1] << 8) | data[2]
+                self.swing_on = data[3]
+                self.swing_off = data[4]
+            elif cmd == 0xB3 and len(data) >= 93:
+                self._apply_table_locked(data)
+            elif cmd == 0xB4 and len(data) >= 4:
+                self.keep_target_rps = data[0]
+                self.keep_target_temp = data[1]
+                self.keep_first_temp = data[2]
+                self.keep_tray_position = data[3]
+    
+    def _apply_table_locked(self, data):
+        """
+        제빙테이블 행 적용 (DATA1: 입수온도 행 인덱스, DATA2~93: 외기온도별 제빙시간 46개 x 2바이트)
+        외기온도 1 (℃, 0~45로 제한)을 열 인덱스로 사용해 제빙시간을 정함
+        """
+        row = data[0]
+        values = [(data[1 + i * 2] << 8) | data[2 + i * 2] for i in range(46)]
+        self.freezing_table[row] = values
+        column = min(45, max(0, int(round(self.temps[0]))))
+        if values[column] > 0:
+            self.icemaking_time = values[column]
+        self._table_applied = True
+    
+    def f0_data(self):
+        """F0 (공통 상태조회) 응답 DATA FIELD"""
+        data = bytearray(F0_LENGTH)
+        with self._lock:
+            for i, temp in enumerate(self.temps):
+                data[i] = _sign_magnitude(temp)
+            data[13:18] = bytes(self.nos_valves)
+            data[18:33] = bytes(self.feed_valves)
+            data[38] = self.filter_reed
+            data[39] = self.front_reed
+        return bytes(data)
+    
+    def f1_data(self):
+        """F1 (냉동 상태조회) 응답 DATA FIELD - F1_COLD_SYSTEM_DATA_FIELD 구조체 순서"""
+        data = bytearray(F1_LENGTH)
+        with self._lock:
+            step = self.ice_step
+            if step == STEP_ICEMAKING:
+                valve, tray = 1, 0          # 제빙 / 제빙 위치
+            elif 41 <= step <= 44:
+                valve, tray = 2, 2          # 핫가스 / 탈빙 위치
+            elif step == 40:
+                valve, tray = 0, 1          # 냉각 / 중간
+            else:
+                valve, tray = 0, 0
+            stable_time = int(time.monotonic() - self._step_started) & 0xFFFF
+            
+            # 공조시스템 (인덱스 0-8)
+            data[0] = valve
+            data[2] = self.compressor_on
+            data[3] = stable_time >> 8
+            data[4] = stable_time & 0xFF
+            data[5] = self.current_rps
+            data[6] = self.error_code
+            data[7] = self.compressor_on
+            # 냉각 (인덱스 15-21)
+            data[15] = 1
+            data[17] = self.cooling_target_rps
+            data[18] = self.cooling_on_temp
+            data[19] = self.cooling_off_temp
+            data[20] = (self.cooling_delay_time >> 8) & 0xFF
+            data[21] = self.cooling_delay_time & 0xFF
+            # 제빙 (인덱스 26-35)
+            data[26] = step
+            data[27] = self.ice_target_rps
+            data[28] = (self.icemaking_time >> 8) & 0xFF
+            data[29] = self.icemaking_time & 0xFF
+            data[30] = (self.tray_in_hz >> 8) & 0xFF
+            data[31] = self.tray_in_hz & 0xFF
+            data[32] = self.swing_on
+            data[33] = self.swing_off
+            data[34] = tray
+            # 보냉 (인덱스 46-50)
+            data[47] = self.keep_target_rps
+            data[48] = self.keep_target_temp
+            data[49] = self.keep_first_temp
+            data[50] = self.keep_tray_position or tray
+            # 드레인 (인덱스 61-64), 얼음탱크 커버 (인덱스 70)
+            data[61] = self.drain_low
+            data[62] = self.drain_high
+            data[63] = 1 if self.drain_low else 0
+            data[64] = self.drain_pump
+            data[70] = self.tank_cover
+        return bytes(data)
+
+
+class DeviceSimulator:
+    """pty 기반 메인 보드 시뮬레이터 (I/O 스레드 1개)"""
+    
+    TICK_INTERVAL = 0.1     # 상태 모델 갱신 간격 (초)
+    NOISE_MAX = 8           # 잡음 주입 시 최대 바이트 수
+    
+    def __init__(self, reply_delay=0.0, jitter=0.0, drop_rate=0.0, corrupt_rate=0.0, noise_rate=0.0,
+                 max_reply_rate=None, stream_rate=0.0, baudrate=None, unknown_reply=0xF0,
+                 step_scale=1.0, seed=None):
+        """
+        Args:
+            reply_delay: 요청 수신 후 응답까지 지연 (초)
+            jitter: 응답 지연 변동 폭 (초, reply_delay ± jitter 균등 분포)
+            drop_rate: 응답 누락 확률 (0~1)
+            corrupt_rate: 응답 프레임의 바이트 1개를 변조할 확률 (0~1)
+            noise_rate: 응답 앞에 잡음 바이트를 넣을 확률 (0~1)
+            max_reply_rate: 최대 응답 주기 (Hz, 초과 요청은 응답 안 함 / None이면 제한 없음)
+            stream_rate: 요청 없이 F0 / F1을 번갈아 보내는 주기 (Hz, 0이면 안 함, inf이면 쉬지 않고 전송)
+            baudrate: 지정하면 프레임 길이만큼 전송 시간을 흉내 냄 (None이면 pty 속도 그대로)
+            unknown_reply: F0/F1/B1~B4 외 CMD에 대한 응답 CMD (None이면 응답 안 함)
+            step_scale: 제빙 STEP 유지 시간 배율
+            seed: 난수 시드 (결함 주입 / 센서값 재현용)
+        """
+        self.reply_delay = reply_delay
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.corrupt_rate = corrupt_rate
+        self.noise_rate = noise_rate
+        self.max_reply_rate = max_reply_rate
+        self.stream_rate = stream_rate
+        self.baudrate = baudrate
+        self.unknown_reply = unknown_reply
+        
+        self.rng = random.Random(seed)
+        self.device = SimulatedDevice(step_scale, random.Random(self.rng.random()))
+        self.decoder = FrameDecoder(STX, ETX, ProtocolHandler.CMD_LENGTH_MAP.keys())
+        
+        self.port_name = None
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._running = False
+        self._last_reply = 0.0
+        self._stream_cmd = 0xF0
+        
+        self.stats = {
+            'rx_frames': 0,     # 정상 수신 요청 수
+            'rx_errors': 0,     # 수신 프레임 오류 수
+            'tx_frames': 0,     # 전송 프레임 수 (스트림 포함)
+            'streamed': 0,      # 요청 없이 전송한 프레임 수
+            'dropped': 0,       # 누락시킨 응답 수
+            'corrupted': 0,     # 변조한 응답 수
+            'noise': 0,         # 잡음을 넣은 횟수
+            'busy': 0,          # 최대 응답 주기 초과로 응답하지 않은 요청 수
+            'tx_bytes': 0
+        }
+        self.rx_by_cmd = {}
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+    
+    def start(self):
+        """pty 생성 후 I/O 스레드 시작"""
+        if self._running:
+            return self.port_name
+        # slave 쪽도 열어 두어 PC 프로그램이 연결 / 해제를 반복해도 pty가 유지되도록 함
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port_name = os.ttyname(self._slave)
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='DeviceSimulator', daemon=True)
+        self._thread.start()
+        return self.port_name
+    
+    def stop(self):
+        """I/O 스레드 종료 후 pty 닫기"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = self._slave = None
+    
+    def get_stats(self):
+        """시뮬레이터 통계 (수신 CMD별 요청 수 포함)"""
+        stats = dict(self.stats)
+        stats['rx_by_cmd'] = {f'0x{cmd:02X}': count for cmd, count in self.rx_by_cmd.items()}
+        stats['ice_step'] = self.device.ice_step
+        return stats
+    
+    def _run(self):
+        """I/O 스레드: 요청 수신 → 응답, 상태 모델 갱신, 스트림 전송"""
+        next_tick = time.monotonic()
+        next_stream = next_tick
+        
+        while self._running:
+            now = time.monotonic()
+            if now >= next_tick:
+                self.device.tick(now)
+                next_tick = now + self.TICK_INTERVAL
+            
+            timeout = next_tick - now
+            if self.stream_rate > 0:
+                if now >= next_stream:
+                    self._stream()
+                    next_stream = now if self.stream_rate == float('inf') else next_stream + 1.0 / self.stream_rate
+                    if next_stream < now:
+                        next_stream = now       # 따라잡기 전송 방지
+                timeout = min(timeout, max(0.0, next_stream - time.monotonic()))
+            
+            readable, _, _ = select.select([self._master], [], [], max(0.0, timeout))
+            if not readable:
+                continue
+            try:
+                data = os.read(self._master, 4096)
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError:
+                time.sleep(0.05)    # slave가 닫힌 순간 등
+                continue
+            
+            for packet in self.decoder.feed(data):
+                if packet.is_error:
+                    self.stats['rx_errors'] += 1
+                else:
+                    self._handle_request(packet)
+    
+    def _handle_request(self, frame):
+        """요청 1개 처리 (펌웨어 AT_UART_Rx_Process / Protocol_Make_Cmd와 같은 응답 CMD 선택)"""
+        cmd = frame.cmd
+        self.stats['rx_frames'] += 1
+        self.rx_by_cmd[cmd] = self.rx_by_cmd.get(cmd, 0) + 1
+        
+        if cmd in (0xB1, 0xB2, 0xB3, 0xB4):
+            self.device.apply_command(cmd, frame.data_field)
+        
+        if cmd == 0xF0:
+            reply = build_frame(0xF0, self.device.f0_data())
+        elif cmd in (0xF1, 0xB3):
+            reply = build_frame(0xF1, self.device.f1_data())
+        elif cmd in (0xB1, 0xB2, 0xB4):
+            reply = build_frame(cmd, frame.data_field)
+        elif self.unknown_reply is not None:
+            reply = self._status_frame(self.unknown_reply)
+        else:
+            return
+        
+        now = time.monotonic()
+        if self.max_reply_rate and now - self._last_reply < 1.0 / self.max_reply_rate:
+            self.stats['busy'] += 1
+            return
+        if self.rng.random() < self.drop_rate:
+            self.stats['dropped'] += 1
+            return
+        
+        delay = self.reply_delay
+        if self.jitter:
+            delay += self.rng.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        self._last_reply = time.monotonic()
+        self._send(reply)
+    
+    def _status_frame(self, cmd):
+        """상태응답 프레임 (F0 / F1)"""
+        if cmd == 0xF1:
+            return build_frame(0xF1, self.device.f1_data())
+        return build_frame(0xF0, self.device.f0_data())
+    
+    def _stream(self):
+        """요청 없이 상태응답 전송 (F0 / F1 번갈아)"""
+        self.stats['streamed'] += 1
+        self._send(self._status_frame(self._stream_cmd))
+        self._stream_cmd = 0xF1 if self._stream_cmd == 0xF0 else 0xF0
+    
+    def _send(self, frame):
+        """결함 주입 후 전송"""
+        data = bytearray(frame)
+        if self.rng.random() < self.corrupt_rate:
+            index = self.rng.randrange(1, len(data) - 1)
+            data[index] ^= self.rng.randrange(1, 256)
+            self.stats['corrupted'] += 1
+        if self.rng.random() < self.noise_rate:
+            noise = bytes(self.rng.randrange(256) for _ in range(self.rng.randint(1, self.NOISE_MAX)))
+            data[0:0] = noise
+            self.stats['noise'] += 1
+        
+        if self.baudrate:
+            # 전송 시간이 지난 뒤 쓰기 (실제 UART처럼 마지막 바이트가 전송 시간 후에 도착)
+            time.sleep(len(data) * 10 / self.baudrate)
+        self._write(data)
+        self.stats['tx_frames'] += 1
+    
+    def _write(self, data):
+        """master에 전부 쓰기 (PC가 읽지 않아 버퍼가 가득 차면 비워질 때까지 대기, 종료 시 나머지 버림)"""
+        view = memoryview(data)
+        while view and self._running:
+            try:
+                written = os.write(self._master, view)
+                view = view[written:]
+                self.stats['tx_bytes'] += written
+            except BlockingIOError:
+                select.select([], [self._master], [], 0.1)
+
+
+def _parse_rate(text):
+    """--stream 값 변환 ('max' → inf)"""
+    return float('inf') if text == 'max' else float(text)
+
+
+def main():
+    """명령줄 실행: pty를 만들고 경로와 통계를 주기적으로 출력"""
+    parser = argparse.ArgumentParser(description="메인 보드 프로토콜 시뮬레이터 (Linux pty)")
+    parser.add_argument('--delay', type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="응답 지연 변동 폭 (초)")
+    parser.add_argument('--drop', type=float, default=0.0, help="응답 누락 확률 (0~1)")
+    parser.add_argument('--corrupt', type=float, default=0.0, help="응답 바이트 변조 확률 (0~1)")
+    parser.add_argument('--noise', type=float, default=0.0, help="잡음 바이트 주입 확률 (0~1)")
+    parser.add_argument('--max-rate', type=float, default=None, help="최대 응답 주기 (Hz)")
+    parser.add_argument('--stream', type=_parse_rate, default=0.0, help="요청 없이 상태응답 전송 주기 (Hz 또는 max)")
+    parser.add_argument('--baudrate', type=int, default=None, help="전송 시간을 흉내 낼 통신 속도")
+    parser.add_argument('--step-scale', type=float, default=1.0, help="제빙 STEP 유지 시간 배율")
+    parser.add_argument('--seed', type=int, default=None, help="난수 시드")
+    parser.add_argument('--interval', type=float, default=2.0, help="통계 출력 간격 (초)")
+    args = parser.parse_args()
+    
+    simulator = DeviceSimulator(reply_delay=args.delay, jitter=args.jitter, drop_rate=args.drop,
+                                corrupt_rate=args.corrupt, noise_rate=args.noise, max_reply_rate=args.max_rate,
+                                stream_rate=args.stream, baudrate=args.baudrate, step_scale=args.step_scale,
+                                seed=args.seed)
+    print(f"시뮬레이터 포트: {simulator.start()}")
+    try:
+        while True:
+            time.sleep(args.interval)
+            print(simulator.get_stats())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == '__main__':
+    main()
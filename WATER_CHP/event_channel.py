@@ -0,0 +1,248 @@
+"""
+수신 / 상태 이벤트 채널 모듈
+SerialCommunication.receive_queue / status_queue로 쓰던 무제한 queue.Queue를 대신합니다.
+GUI 메인 루프가 멈춘 동안(파일 대화상자, 제빙테이블 표 생성 등) 이벤트가 끝없이 쌓이지 않도록
+이벤트를 종류별 등급(ChannelClass)으로 나누고 등급마다 용량과 초과 시 처리 방식을 정합니다.
+
+- KEEP: 버리지 않음 (상태응답, 연결 / 오류 이벤트)
+  backpressure=True이면 용량을 넘을 때 on_backpressure(True), 용량의 절반 이하로 줄면 on_backpressure(False)
+  (SerialCommunication은 상태조회를 일시 중지해서 상태응답이 더 쌓이지 않게 함)
+- COALESCE: 아직 꺼내지 않은 같은 등급 이벤트에 merge 함수로 합침 (최신 값 / 누적 값만 의미 있는 이벤트)
+- SAMPLE: 용량을 넘으면 sample_every개 중 1개만 받고, 용량의 2배를 넘으면 모두 버림 (송신 / 시스템 로그)
+- 버린 이벤트가 있으면 drain() 결과 끝에 ('CHANNEL_DROPPED', {등급: 통계}) 이벤트 1개를 추가
+- 등급별 통계: 대기 수, 최대 대기 수(high-water), 받은 수, 버린 수, 합친 수
+
+queue.Queue와 같이 put() / get_nowait()를 지원하므로 기존 put 호출은 그대로 사용합니다.
+
+사용 예:
+    channel = EventChannel({'log': ChannelClass(SAMPLE, capacity=200)}, lambda item: 'log')
+    channel.put(('SYSTEM', "메시지"))
+    events = channel.drain()
+"""
+import queue
+import threading
+from collections import deque
+
+
+# 용량 초과 시 처리 방식
+KEEP = 'keep'           # 버리지 않음 (backpressure로 생산 측을 늦춤)
+COALESCE = 'coalesce'   # 대기 중인 이벤트에 합침
+SAMPLE = 'sample'       # 일부만 받음
+
+DROPPED_EVENT = 'CHANNEL_DROPPED'
+
+
+class ChannelClass:
+    """이벤트 등급별 용량 / 초과 시 처리 방식"""
+    
+    __slots__ = ('policy', 'capacity', 'sample_every', 'merge', 'backpressure')
+    
+    def __init__(self, policy=KEEP, capacity=None, sample_every=10, merge=None, backpressure=False):
+        """
+        Args:
+            policy: KEEP / COALESCE / SAMPLE
+            capacity: 대기 이벤트 수 상한 (None이면 제한 없음, COALESCE는 사용하지 않음)
+            sample_every: SAMPLE 등급이 용량을 넘었을 때 받는 간격 (N개 중 1개)
+            merge: COALESCE 등급의 합치기 함수 merge(대기 중인 payload, 새 payload) → 합친 payload
+            backpressure: KEEP 등급이 용량을 넘으면 on_backpressure 호출
+        """
+        if policy == COALESCE and merge is None:
+            raise ValueError("COALESCE 등급에는 merge 함수가 필요합니다")
+        self.policy = policy
+        self.capacity = capacity
+        self.sample_every = sample_every
+        self.merge = merge
+        self.backpressure = backpressure
+
+
+class EventChannel:
+    """등급별 용량 제한이 있는 이벤트 채널 (여러 생산 스레드, 소비 스레드 1개)"""
+    
+    def __init__(self, classes, classify, default_class=None, on_backpressure=None):
+        """
+        Args:
+            classes: 등급 이름 → ChannelClass
+            classify: 이벤트(kind, payload) → 등급 이름 함수 (None 또는 모르는 이름이면 default_class)
+            default_class: 기본 등급 이름 (None이면 제한 없는 KEEP 등급 '_default')
+            on_backpressure: backpressure 상태 변경 알림 함수 (True: 시작, False: 해제)
+                             (시작은 생산 스레드, 해제는 drain을 호출한 스레드에서 호출됨)
+        """
+        self._classes = dict(classes)
+        if default_class is None:
+            default_class = '_default'
+            self._classes.setdefault(default_class, ChannelClass())
+        self._default = default_class
+        self._classify = classify
+        self.on_backpressure = on_backpressure
+        
+        self._lock = threading.Lock()
+        self._items = deque()       # [등급 이름, kind, payload]
+        self._coalescing = {}       # COALESCE 등급 → 아직 꺼내지 않은 항목
+        self._backpressure = set()  # backpressure 중인 등급
+        # 등급 → [대기 수, 최대 대기 수, 받은 수, 버린 수, 합친 수, 용량 초과 후 들어온 수]
+        self._stats = {name: [0, 0, 0, 0, 0, 0] for name in self._classes}
+        self._reported = {name: 0 for name in self._classes}    # 마지막으로 알린 버린 수
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def qsize(self):
+        return len(self._items)
+    
+    def empty(self):
+        return not self._items
+    
+    def put(self, item, block=True, timeout=None):
+        """
+        이벤트 추가 (queue.Queue.put과 같은 형식, 막히지 않음)
+        
+        Returns:
+            bool: 추가 / 합쳤으면 True, 버렸으면 False
+        """
+        kind, payload = item
+        name = self._classify(item)
+        if name not in self._classes:
+            name = self._default
+        cls = self._classes[name]
+        notify = False
+        
+        with self._lock:
+            stats = self._stats[name]
+            stats[2] += 1
+            
+            if cls.policy == COALESCE:
+                pending = self._coalescing.get(name)
+                if pending is not None:
+                    pending[2] = cls.merge(pending[2], payload)
+                    stats[4] += 1
+                    return True
+                entry = [name, kind, payload]
+                self._coalescing[name] = entry
+            else:
+                if cls.capacity is not None and stats[0] >= cls.capacity:
+                    if cls.policy == SAMPLE:
+                        stats[5] += 1
+                        if stats[0] >= 2 * cls.capacity or stats[5] % cls.sample_every:
+                            stats[3] += 1
+                            return False
+                    elif cls.backpressure and name not in self._backpressure:
+                        self._backpressure.add(name)
+                        notify = True
+                entry = [name, kind, payload]
+            
+            self._items.append(entry)
+            stats[0] += 1
+            if stats[0] > stats[1]:
+                stats[1] = stats[0]
+        
+        if notify and self.on_backpressure is not None:
+            self.on_backpressure(True)
+        return True
+    
+    put_nowait = put
+    
+    def get_nowait(self):
+        """이벤트 1개 꺼내기 (queue.Queue.get_nowait와 같이 비어 있으면 queue.Empty)"""
+        with self._lock:
+            if not self._items:
+                raise queue.Empty
+            entry = self._pop_locked()
+        self._check_release()
+        return entry[1], entry[2]
+    
+    def drain(self, max_items=None):
+        """
+        대기 중인 이벤트를 한 번에 꺼냄 (지난 drain 이후 버린 이벤트가 있으면 끝에 CHANNEL_DROPPED 이벤트 추가)
+        
+        Args:
+            max_items: 최대 개수 (None이면 전부)
+        
+        Returns:
+            list: [(kind, payload), ...]
+        """
+        events = []
+        with self._lock:
+            count = len(self._items) if max_items is None else min(max_items, len(self._items))
+            for _ in range(count):
+                entry = self._pop_locked()
+                events.append((entry[1], entry[2]))
+            
+            report = {}
+            for name, stats in self._stats.items():
+                if stats[3] != self._reported[name]:
+                    report[name] = {'dropped': stats[3] - self._reported[name], 'high_water': stats[1]}
+                    self._reported[name] = stats[3]
+            if report:
+                events.append((DROPPED_EVENT, report))
+        
+        self._check_release()
+        return events
+    
+    def _pop_locked(self):
+        entry = self._items.popleft()
+        name = entry[0]
+        stats = self._stats[name]
+        stats[0] -= 1
+        if self._coalescing.get(name) is entry:
+            del self._coalescing[name]
+        if stats[0] == 0:
+            stats[5] = 0
+        return entry
+    
+    def _check_release(self):
+        """용량의 절반 이하로 줄어든 등급의 backpressure 해제"""
+        if not self._backpressure:
+            return
+        with self._lock:
+            for name in list(self._backpressure):
+                if self._stats[name][0] <= self._classes[name].capacity // 2:
+                    self._backpressure.discard(name)
+            released = not self._backpressure
+        if released and self.on_backpressure is not None:
+            self.on_backpressure(False)
+    
+    @property
+    def backpressure(self):
+        """backpressure 중인 등급이 있으면 True"""
+        return bool(self._backpressure)
+    
+    def clear(self):
+        """대기 이벤트 모두 버림 (통계는 유지, backpressure 해제)"""
+        with self._lock:
+            self._items.clear()
+            self._coalescing.clear()
+            for stats in self._stats.values():
+                stats[0] = 0
+                stats[5] = 0
+        self._check_release()
+    
+    def reset_stats(self):
+        """통계 초기화 (대기 수는 유지)"""
+        with self._lock:
+            for name, stats in self._stats.items():
+                stats[1:] = [stats[0], 0, 0, 0, 0]
+                self._reported[name] = 0
+    
+    def get_stats(self):
+        """
+        등급별 통계
+        
+        Returns:
+            dict: {등급: {'policy', 'capacity', 'pending', 'high_water', 'put', 'dropped', 'coalesced',
+                   'backpressure'}}
+        """
+        result = {}
+        with self._lock:
+            for name, stats in self._stats.items():
+                cls = self._classes[name]
+                result[name] = {
+                    'policy': cls.policy,
+                    'capacity': cls.capacity,
+                    'pending': stats[0],
+                    'high_water': stats[1],
+                    'put': stats[2],
+                    'dropped': stats[3],
+                    'coalesced': stats[4],
+                    'backpressure': name in self._backpressure
+                }
+        return result
@@ -5,7 +5,6 @@ Excel 파일을 업로드하고 Sheet를 선택하는 기능을 제공합니다.
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
-import openpyxl
 
 
 class ExcelSheetSelector:
@@ -40,6 +39,9 @@ class ExcelSheetSelector:
             return None
         
         try:
+            # openpyxl은 Excel 파일을 실제로 열 때만 로드 (프로그램 시작 시간 단축)
+            import openpyxl
+            
             # Excel 파일 열기 (data_only=True로 수식이 아닌 값만 읽기)
             self.workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
             self.selected_file_path = file_path
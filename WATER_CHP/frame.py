@@ -0,0 +1,173 @@
+"""
+수신 프레임 객체 모듈
+디코더가 만드는 정상 프레임(Frame)과 오류 정보(FrameError), 중복 상태응답 알림(StatusUnchanged)을
+__slots__ 객체로 표현합니다.
+DATA FIELD는 수신 프레임 사본의 memoryview로 보관하고, 오류 코드는 정수로 저장합니다.
+HEX 문자열과 오류 상세 메시지는 로그 출력 등으로 실제로 읽힐 때만 만들어집니다.
+
+패킷 구조: STX(1) + TX_ID(1) + CMD(1) + DATA_LEN(1) + DATA(N) + CRC_HIGH(1) + CRC_LOW(1) + ETX(1)
+"""
+
+
+# 오류 코드
+ERR_INVALID_START = 1           # 1단계: 첫 바이트가 STX가 아님
+ERR_UNDEFINED_CMD = 2           # 2단계: 정의되지 않은 CMD
+ERR_ETX_POSITION_MISMATCH = 3   # 4단계: 예상 위치에 ETX 없음
+ERR_CRC_MISMATCH = 4            # 5단계: CRC 불일치
+ERR_PACKET_TOO_SHORT = 5        # parse_packet: 최소 길이 미만
+ERR_LENGTH_MISMATCH = 6         # parse_packet: DATA_LEN과 실제 길이 불일치
+ERR_INVALID_STX = 7             # parse_packet: STX 오류
+ERR_INVALID_ETX = 8             # parse_packet: ETX 오류
+ERR_PARSE_EXCEPTION = 9         # parse_packet: 파싱 중 예외
+
+# 오류 코드 → 이름 (기존 'error' 문자열과 동일)
+ERROR_NAMES = {
+    ERR_INVALID_START: 'INVALID_START',
+    ERR_UNDEFINED_CMD: 'UNDEFINED_CMD',
+    ERR_ETX_POSITION_MISMATCH: 'ETX_POSITION_MISMATCH',
+    ERR_CRC_MISMATCH: 'CRC_MISMATCH',
+    ERR_PACKET_TOO_SHORT: 'PACKET_TOO_SHORT',
+    ERR_LENGTH_MISMATCH: 'LENGTH_MISMATCH',
+    ERR_INVALID_STX: 'INVALID_STX',
+    ERR_INVALID_ETX: 'INVALID_ETX',
+    ERR_PARSE_EXCEPTION: 'PARSE_EXCEPTION'
+}
+
+
+def to_hex(data):
+    """바이트열을 'XX XX XX' 형식 문자열로 변환"""
+    return ' '.join(f'{b:02X}' for b in data)
+
+
+class Frame:
+    """CRC 검증을 통과한 수신 프레임"""
+    
+    __slots__ = ('tx_id', 'cmd', 'data_length', 'crc', 'raw', 'data_field', 'timestamp', 'first_byte_ns')
+    
+    is_error = False
+    
+    def __init__(self, tx_id, cmd, data_length, crc, raw):
+        """
+        Args:
+            tx_id: 송신 장치 ID
+            cmd: CMD 값
+            data_length: DATA FIELD 길이
+            crc: 수신 CRC16 값
+            raw: 프레임 전체 바이트 (STX ~ ETX)
+        """
+        self.tx_id = tx_id
+        self.cmd = cmd
+        self.data_length = data_length
+        self.crc = crc
+        self.raw = raw
+        self.data_field = memoryview(raw)[4:4 + data_length]
+        self.timestamp = None   # 마지막 바이트 수신 시각 (time.monotonic_ns, 수신 스레드에서 설정)
+        self.first_byte_ns = None   # 첫 바이트(STX)를 읽은 시각 (time.monotonic_ns, 수신 스레드에서 설정)
+    
+    @property
+    def hex_data(self):
+        """DATA FIELD HEX 문자열 (없으면 '없음')"""
+        return to_hex(self.data_field) if self.data_length else '없음'
+    
+    @property
+    def raw_hex(self):
+        """프레임 전체 HEX 문자열"""
+        return to_hex(self.raw)
+    
+    def __repr__(self):
+        return f'Frame(tx_id=0x{self.tx_id:02X}, cmd=0x{self.cmd:02X}, data_length={self.data_length})'
+
+
+class FrameError:
+    """프레임 검증 실패 정보 (상세 메시지와 HEX 문자열은 읽을 때 생성)"""
+    
+    __slots__ = ('code', 'raw', 'skipped', 'tx_id', 'cmd', 'data_length', 'received', 'expected')
+    
+    is_error = True
+    
+    def __init__(self, code, raw, skipped=0, tx_id=None, cmd=None, data_length=None,
+                 received=None, expected=None):
+        """
+        Args:
+            code: 오류 코드 (ERR_*)
+            raw: 오류 위치의 원시 바이트 (재동기화 시 건너뛴 구간 앞부분)
+            skipped: 재동기화로 건너뛴 바이트 수 (0이면 재동기화 없음)
+            tx_id / cmd / data_length: 헤더에서 읽은 값 (알 수 있는 경우)
+            received / expected: 오류 코드별 수신값 / 기대값
+        """
+        self.code = code
+        self.raw = raw
+        self.skipped = skipped
+        self.tx_id = tx_id
+        self.cmd = cmd
+        self.data_length = data_length
+        self.received = received
+        self.expected = expected
+    
+    @property
+    def error(self):
+        """오류 이름 (예: 'CRC_MISMATCH')"""
+        return ERROR_NAMES.get(self.code, 'UNKNOWN')
+    
+    @property
+    def raw_hex(self):
+        """원시 바이트 HEX 문자열"""
+        return to_hex(self.raw)
+    
+    @property
+    def detail(self):
+        """오류 상세 메시지"""
+        code = self.code
+        if code == ERR_INVALID_START:
+            text = f'통신 시작 오류: 첫 바이트가 STX(0x{self.expected:02X})가 아님 (수신: 0x{self.received:02X})'
+        elif code == ERR_UNDEFINED_CMD:
+            text = f'정의되지 않은 CMD: 0x{self.cmd:02X} (TX_ID: 0x{self.tx_id:02X})'
+        elif code == ERR_ETX_POSITION_MISMATCH:
+            text = (f'ETX 위치 오류: 예상 위치[{6 + self.data_length}]에 ETX(0x{self.expected:02X}) 없음 '
+                    f'(수신: 0x{self.received:02X})')
+        elif code == ERR_CRC_MISMATCH:
+            text = f'CRC 불일치: 수신 0x{self.received:04X}, 계산 0x{self.expected:04X}'
+        elif code == ERR_PACKET_TOO_SHORT:
+            text = f'패킷 길이 부족: {self.received}바이트 (최소 {self.expected}바이트 필요)'
+        elif code == ERR_LENGTH_MISMATCH:
+            text = (f'패킷 길이 불일치: 예상 {self.expected}바이트, 실제 {self.received}바이트 '
+                    f'(DATA_LEN={self.data_length})')
+        elif code == ERR_INVALID_STX:
+            text = f'잘못된 STX: 0x{self.received:02X} (예상: 0x{self.expected:02X})'
+        elif code == ERR_INVALID_ETX:
+            text = f'잘못된 ETX: 0x{self.received:02X} (예상: 0x{self.expected:02X})'
+        elif code == ERR_PARSE_EXCEPTION:
+            text = f'파싱 중 예외 발생: {self.received}'
+        else:
+            text = '상세 정보 없음'
+        
+        if self.skipped:
+            text += f' - {self.skipped}바이트 건너뛰고 재동기화'
+        return text
+    
+    def __repr__(self):
+        return f'FrameError({self.error}, skipped={self.skipped})'
+
+
+class StatusUnchanged:
+    """직전 응답과 바이트 단위로 같은 상태응답 수신 알림 (파싱/화면 갱신 생략용)"""
+    
+    __slots__ = ('tx_id', 'cmd', 'timestamp', 'repeat')
+    
+    is_error = False
+    
+    def __init__(self, tx_id, cmd, timestamp, repeat):
+        """
+        Args:
+            tx_id: 송신 장치 ID
+            cmd: 상태조회 CMD
+            timestamp: 수신 시각 (time.monotonic_ns, 원래 프레임의 Frame.timestamp와 같은 기준)
+            repeat: 같은 응답이 연속으로 수신된 횟수
+        """
+        self.tx_id = tx_id
+        self.cmd = cmd
+        self.timestamp = timestamp
+        self.repeat = repeat
+    
+    def __repr__(self):
+        return f'StatusUnchanged(cmd=0x{self.cmd:02X}, repeat={self.repeat})'
@@ -0,0 +1,226 @@
+"""
+링버퍼 기반 프로토콜 프레임 디코더
+수신 바이트를 고정 크기 링버퍼에 저장하고, 버퍼 안에서 바로 프레임을 검증/추출합니다.
+오류가 발생하면 버퍼 전체를 버리지 않고 다음 STX + 정의된 CMD 헤더까지만 건너뛰어 재동기화합니다.
+
+패킷 구조: STX(1) + TX_ID(1) + CMD(1) + DATA_LEN(1) + DATA(N) + CRC_HIGH(1) + CRC_LOW(1) + ETX(1)
+"""
+import crc16
+from frame import (Frame, FrameError, ERR_INVALID_START, ERR_UNDEFINED_CMD,
+                   ERR_ETX_POSITION_MISMATCH, ERR_CRC_MISMATCH)
+
+
+class FrameDecoder:
+    """고정 크기 링버퍼 프레임 디코더 클래스"""
+    
+    HEADER_SIZE = 4         # STX + TX_ID + CMD + DATA_LEN
+    FRAME_OVERHEAD = 7      # HEADER(4) + CRC(2) + ETX(1)
+    PREVIEW_SIZE = 10       # 오류 정보에 포함할 최대 바이트 수
+    
+    def __init__(self, stx, etx, known_cmds, capacity=4096):
+        """
+        Args:
+            stx: STX 바이트 값
+            etx: ETX 바이트 값
+            known_cmds: 정의된 CMD 값 목록 (헤더 검증용)
+            capacity: 링버퍼 크기 (2의 거듭제곱, 최대 프레임 길이 262바이트 이상)
+        """
+        if capacity & (capacity - 1) or capacity < 512:
+            raise ValueError(f"링버퍼 크기는 512 이상의 2의 거듭제곱이어야 합니다: {capacity}")
+        
+        self.stx = stx
+        self.etx = etx
+        self.known_cmds = frozenset(known_cmds)
+        
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._head = 0      # 읽기 시작 위치
+        self._size = 0      # 버퍼에 저장된 바이트 수
+        
+        # 통계
+        self.frames_decoded = 0
+        self.resync_count = 0
+        self.skipped_bytes = 0
+        self.overflow_bytes = 0
+    
+    @property
+    def buffered(self):
+        """버퍼에 남아있는 (아직 프레임이 완성되지 않은) 바이트 수"""
+        return self._size
+    
+    def reset(self):
+        """버퍼 비우기 (통계는 유지)"""
+        self._head = 0
+        self._size = 0
+    
+    def get_stats(self):
+        """디코더 통계 반환"""
+        return {
+            'frames_decoded': self.frames_decoded,
+            'resync_count': self.resync_count,
+            'skipped_bytes': self.skipped_bytes,
+            'overflow_bytes': self.overflow_bytes,
+            'buffered': self._size
+        }
+    
+    def feed(self, data):
+        """
+        수신 데이터를 버퍼에 추가하고 완성된 프레임을 추출
+        
+        Args:
+            data: 수신 데이터 (bytes / bytearray / memoryview)
+        
+        Returns:
+            list: Frame(정상 패킷) / FrameError(오류 정보) 목록
+        """
+        packets = []
+        view = memoryview(data)
+        
+        while len(view) > 0:
+            free = self.capacity - self._size
+            if free == 0:
+                # 버퍼가 가득 찼는데 프레임이 완성되지 않음 → 가장 오래된 바이트 버림
+                self._advance(1)
+                self.overflow_bytes += 1
+                free = 1
+            
+            chunk = view[:free]
+            view = view[free:]
+            self._write(chunk)
+            self._decode(packets)
+        
+        return packets
+    
+    def _write(self, chunk):
+        """링버퍼 끝에 chunk 복사 (재할당 없이 최대 2회 슬라이스 복사)"""
+        length = len(chunk)
+        start = (self._head + self._size) & self._mask
+        first = min(length, self.capacity - start)
+        self._view[start:start + first] = chunk[:first]
+        if first < length:
+            self._view[0:length - first] = chunk[first:]
+        self._size += length
+    
+    def _advance(self, count):
+        """버퍼 앞에서 count 바이트 소비"""
+        self._head = (self._head + count) & self._mask
+        self._size -= count
+    
+    def _byte(self, offset):
+        """버퍼 앞에서 offset 위치의 바이트"""
+        return self._buf[(self._head + offset) & self._mask]
+    
+    def _copy(self, offset, length):
+        """버퍼 앞에서 offset 위치부터 length 바이트를 bytes로 복사"""
+        start = (self._head + offset) & self._mask
+        end = start + length
+        if end <= self.capacity:
+            return bytes(self._view[start:end])
+        return bytes(self._view[start:]) + bytes(self._view[:end - self.capacity])
+    
+    def _crc(self, length):
+        """버퍼 앞에서 length 바이트의 CRC16 계산 (버퍼가 경계를 넘으면 두 구간을 증분 계산)"""
+        start = self._head
+        end = start + length
+        if end <= self.capacity:
+            return crc16.update(crc16.CRC16_INIT, self._view[start:end])
+        crc = crc16.update(crc16.CRC16_INIT, self._view[start:])
+        return crc16.update(crc, self._view[:end - self.capacity])
+    
+    def _find_stx(self, offset):
+        """버퍼 앞 offset 위치부터 다음 STX 위치 검색 (없으면 -1)"""
+        if offset >= self._size:
+            return -1
+        start = (self._head + offset) & self._mask
+        remaining = self._size - offset
+        first_end = min(start + remaining, self.capacity)
+        
+        pos = self._buf.find(self.stx, start, first_end)
+        if pos >= 0:
+            return offset + (pos - start)
+        
+        wrapped = remaining - (first_end - start)
+        if wrapped > 0:
+            pos = self._buf.find(self.stx, 0, wrapped)
+            if pos >= 0:
+                return offset + (first_end - start) + pos
+        return -1
+    
+    def _find_header(self, offset):
+        """
+        버퍼 앞 offset 위치부터 다음 유효 헤더 후보(STX + 정의된 CMD) 위치 검색
+        CMD 바이트가 아직 도착하지 않은 STX도 후보로 봅니다. (없으면 -1)
+        """
+        pos = self._find_stx(offset)
+        while pos >= 0:
+            if pos + 2 >= self._size or self._byte(pos + 2) in self.known_cmds:
+                return pos
+            pos = self._find_stx(pos + 1)
+        return -1
+    
+    def _resync(self, packets, code, tx_id, cmd, data_length=None, received=None, expected=None, start=1):
+        """
+        start 위치부터 다음 헤더 후보까지 버퍼를 소비하여 재동기화
+        건너뛴 바이트 수를 포함한 FrameError를 packets에 추가합니다.
+        """
+        next_stx = self._find_header(start)
+        skipped = next_stx if next_stx >= 0 else self._size
+        
+        packets.append(FrameError(code, self._copy(0, min(skipped, self.PREVIEW_SIZE)), skipped,
+                                  tx_id, cmd, data_length, received, expected))
+        
+        self._advance(skipped)
+        self.resync_count += 1
+        self.skipped_bytes += skipped
+    
+    def _decode(self, packets):
+        """버퍼에서 완성된 프레임을 모두 추출"""
+        while self._size > 0:
+            # 1단계: STX 확인 - STX가 아니면 다음 헤더 후보까지 건너뜀
+            first = self._byte(0)
+            if first != self.stx:
+                self._resync(packets, ERR_INVALID_START, None, None,
+                             received=first, expected=self.stx, start=0)
+                continue
+            
+            # 최소 헤더 크기 확인
+            if self._size < self.HEADER_SIZE:
+                break
+            
+            # 2단계: CMD 확인
+            tx_id = self._byte(1)
+            cmd = self._byte(2)
+            data_length = self._byte(3)
+            
+            if cmd not in self.known_cmds:
+                self._resync(packets, ERR_UNDEFINED_CMD, tx_id, cmd)
+                continue
+            
+            # 3단계: 패킷이 완전히 도착했는지 확인
+            expected_total = self.FRAME_OVERHEAD + data_length
+            if self._size < expected_total:
+                break
+            
+            # 4단계: ETX 위치 확인
+            etx_pos = expected_total - 1
+            actual_etx = self._byte(etx_pos)
+            if actual_etx != self.etx:
+                self._resync(packets, ERR_ETX_POSITION_MISMATCH, tx_id, cmd, data_length,
+                             received=actual_etx, expected=self.etx)
+                continue
+            
+            # 5단계: CRC 확인 (STX ~ DATA FIELD)
+            crc_pos = self.HEADER_SIZE + data_length
+            crc_received = (self._byte(crc_pos) << 8) | self._byte(crc_pos + 1)
+            crc_calculated = self._crc(crc_pos)
+            if crc_received != crc_calculated:
+                self._resync(packets, ERR_CRC_MISMATCH, tx_id, cmd, data_length,
+                             received=crc_received, expected=crc_calculated)
+                continue
+            
+            # 정상 패킷 (프레임 전체를 1회 복사, DATA FIELD는 그 사본의 memoryview)
+            packets.append(Frame(tx_id, cmd, data_length, crc_received, self._copy(0, expected_total)))
+            self._advance(expected_total)
+            self.frames_decoded += 1
@@ -3,10 +3,9 @@
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading
 import time
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from collections import deque
 
 # matplotlib 설정
@@ -20,12 +19,14 @@ plt.rcParams['font.family'] = ['Malgun Gothic', 'DejaVu Sans', 'sans-serif']
 plt.rcParams['axes.unicode_minus'] = False
 
 from communication import SerialCommunication, DataParser, StatusResponseHandler
+from port_watcher import PortWatcher, PORT_ADDED
 from systems import (
     RefrigerationSystem, CoolingSystem, HVACSystem, IcemakingSystem,
     DrainTankSystem, DrainPumpSystem, ValveSystem
 )
 import constants
 from excel_sheet_selector import ExcelSheetSelector
+from table_upload import TableUploader, build_row_field
 
 
 class MainGUI:
@@ -37,6 +38,13 @@ class MainGUI:
         
         # 통신 모듈 초기화
         self.comm = SerialCommunication()
+        
+        # 포트 목록 감시 (백그라운드 스레드가 목록을 캐시, 꽂거나 뽑으면 포트 선택 목록 자동 갱신)
+        self.port_watcher = PortWatcher()
+        self.comm.port_watcher = self.port_watcher
+        self.port_watcher.add_listener(lambda kind, info: self.root.after(0, self._on_port_event, kind, info))
+        self.port_watcher.start()
+        
         self.data_parser = DataParser()
         self.status_handler = StatusResponseHandler(self.comm.protocol)
         
@@ -44,7 +52,8 @@ class MainGUI:
         self.cooling_system = CoolingSystem(self.root, self.comm, self.log_communication)
         self.hvac_system = HVACSystem(self.root, self.comm, self.log_communication)
         self.icemaking_system = IcemakingSystem(self.root, self.comm, self.log_communication, 
-                                                apply_table_callback=self.apply_icemaking_table)
+                                                apply_table_callback=self.apply_icemaking_table,
+                                                upload_table_callback=self.upload_freezing_table)
         self.refrigeration_system = RefrigerationSystem(self.root, self.comm, self.log_communication)
         self.drain_tank_system = DrainTankSystem(self.root, self.comm, self.log_communication)
         self.drain_pump_system = DrainPumpSystem(self.root, self.comm, self.log_communication)
@@ -59,10 +68,11 @@ class MainGUI:
             'hot_outlet_temp': 0
         }
         
-        # 기타 상태 데이터 (필터리드, 전면커버)
+        # 기타 상태 데이터 (필터리드, 전면커버, 온수 운전상태)
         self.other_status = {
             'filter_detected': False,  # 필터리드 (1: 감지 / 0: 미감지)
-            'front_cover_detected': False  # 전면커버 (1: 감지 / 0: 미감지)
+            'front_cover_detected': False,  # 전면커버 (1: 감지 / 0: 미감지)
+            'heating_operation_status': None  # 온수 운전상태 (CMD 0xF2, 미수신 시 None)
         }
         
         # Excel Sheet 선택 모듈 초기화
@@ -75,8 +85,13 @@ class MainGUI:
         # 통신 디버그 모드 (True: 상세 로그 표시, False: 간단한 로그만 표시)
         self.debug_comm = True  # 통신 문제 디버깅용
         
-        # Heartbeat 재개 타이머 (ice_step == 22일 때 12초 후 재개)
-        self.heartbeat_resume_timer = None
+        # 제빙테이블 전송 (CMD 0xB3, 전송하는 동안 상태조회를 일시 중지하고 F1 응답으로 행별 완료 확인)
+        self.table_uploader = TableUploader(self.comm)
+        self.step22_table_sent = False  # 현재 제빙 STEP 22 구간에서 자동 전송을 시작했는지 여부
+        
+        # 응답 시간 히스토그램 (연결 해제 / 종료 시 latency_export_dir에 CSV 자동 저장)
+        self.latency_window = None
+        self.latency_export_dir = os.getcwd()
         
         # 그래프 데이터
         self.graph_data = {
@@ -136,10 +151,9 @@ class MainGUI:
         # GUI 생성
         self.create_widgets()
         
-        # 데이터 모니터링 스레드 시작
+        # 데이터 모니터링 시작 (Tk 메인 루프에서 100ms마다 수신 / 상태 이벤트 처리, 별도 스레드 없음)
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(target=self.monitor_data, daemon=True)
-        self.monitor_thread.start()
+        self.monitor_data()
         
         # GUI 업데이트 시작
         self.update_gui()
@@ -454,17 +468,6 @@ class MainGUI:
         else:
             return 'gray'  # 알 수 없는 값
     
-    def _resume_heartbeat_after_delay(self):
-        """12초 지연 후 heartbeat 재개 (ice_step == 22일 때 호출)"""
-        if self.comm.heartbeat_paused:
-            self.comm.resume_heartbeat()
-            if self.debug_comm:
-                self.log_communication(
-                    f"  [제빙 STEP 22] 12초 경과 후 Heartbeat 자동 재개",
-                    "green"
-                )
-        self.heartbeat_resume_timer = None
-    
     def send_cooling_control(self):
         """냉각 제어 CMD 0xB1 전송 - 입력 모드 토글 방식"""
         if not self.comm.is_connected:
@@ -974,29 +977,9 @@ class MainGUI:
                 return False
             
             # DATA FIELD 생성 (93바이트)
-            # DATA1: 행 인덱스 (1바이트)
-            # DATA2~93: 테이블 데이터 46개 x 2바이트 = 92바이트
-            data_field = bytearray(93)
-            
             # DATA1: 행 인덱스 (0~45)
-            data_field[0] = water_temp_idx
-            
-            # DATA2~DATA93: 테이블 데이터 46개 (B~AU열), 각 2바이트
-            for col_idx in range(46):
-                table_value = int(table_rows[water_temp_idx][col_idx])
-                # 범위 체크 (0~65535)
-                if table_value < 0:
-                    table_value = 0
-                elif table_value > 65535:
-                    table_value = 65535
-                
-                # 2바이트로 변환 (상위 바이트, 하위 바이트)
-                high_byte = (table_value >> 8) & 0xFF  # 상위 바이트
-                low_byte = table_value & 0xFF           # 하위 바이트
-                
-                # DATA2부터 시작, 각 값마다 2바이트 할당
-                data_field[1 + (col_idx * 2)] = high_byte      # 상위 바이트
-                data_field[1 + (col_idx * 2) + 1] = low_byte   # 하위 바이트
+            # DATA2~DATA93: 테이블 데이터 46개 (B~AU열), 각 2바이트 (상위 바이트, 하위 바이트, 0~65535로 제한)
+            data_field = build_row_field(water_temp_idx, table_rows[water_temp_idx])
             
             # 패킷 구조 검증 로그
             if self.debug_comm:
@@ -1036,14 +1019,18 @@ class MainGUI:
             
             # CMD 0xB3 패킷 생성 (내부적으로 STX, TX_ID, CMD, DATA_LEN, CRC, ETX 추가)
             # 최종 패킷 구조: STX(1) + TX_ID(1) + CMD(1) + DATA_LEN(1) + DATA_FIELD(93) + CRC_HIGH(1) + CRC_LOW(1) + ETX(1) = 100바이트
-            # Heartbeat는 제빙 STEP 22 감지 시 이미 일시 중지된 상태
-            success, message = self.comm.send_packet(0xB3, bytes(data_field))
-            
-            # 패킷 전송 후 대기 (전송 완료 대기)
-            time.sleep(0.2)  # 200ms
-            
+            # 전송하는 동안 상태조회를 일시 중지 (메인은 CMD 0xF1로 응답, 응답이 없으면 재전송, 응답 후 상태조회 재개)
+            # 응답 대기는 Future 완료 콜백으로 처리 (GUI 스레드를 멈추지 않음)
             water_temp = int(water_temps[water_temp_idx])
+            if self.table_uploader.busy:
+                success, message = False, "제빙테이블 전송이 이미 진행 중입니다"
+            else:
+                future = self.table_uploader.start(table_rows, rows=[water_temp_idx])
+                success, message = True, ""
+            
             if success:
+                future.add_done_callback(
+                    lambda f: self.root.after(0, self._on_freezing_table_response, f.result(), water_temp_idx))
                 if self.debug_comm:
                     self.log_communication(
                         f"[자동] 제빙테이블 전송 성공: 입수온도 {water_temp}℃ (행 {water_temp_idx})",
@@ -1066,6 +1053,61 @@ class MainGUI:
             self.log_communication(f"제빙테이블 전송 오류: {str(e)}", "red")
             return False
 
+    def _on_freezing_table_response(self, result, water_temp_idx):
+        """CMD 0xB3 행 전송 결과 처리 (TableUploader 전송 완료 시 GUI 스레드에서 호출)"""
+        if not result['completed']:
+            self.log_communication(f"제빙테이블 적용 확인 실패 (행 {water_temp_idx}): {result['error']}", "red")
+        elif self.debug_comm:
+            self.log_communication(f"  제빙테이블 적용 확인 (행 {water_temp_idx}, CMD 0xF1 응답 수신, "
+                                   f"{result['ack_ms'][0]:.0f}ms)", "green")
+    
+    def upload_freezing_table(self):
+        """제빙테이블 전체 행(46행)을 CMD 0xB3으로 일괄 전송 (행마다 응답 확인, 행별 재전송)"""
+        if not self.comm.is_connected:
+            messagebox.showwarning("경고", "시리얼 포트가 연결되지 않았습니다.")
+            return
+        if not self.freezing_table_loaded or self.freezing_table_data is None:
+            messagebox.showwarning("경고", "제빙테이블을 먼저 적용(로드)해주세요.")
+            return
+        if self.table_uploader.busy:
+            self.log_communication("제빙테이블 전송이 이미 진행 중입니다.", "orange")
+            return
+        if not messagebox.askyesno(
+            "확인",
+            "현재 메인 펌웨어는 받은 행을 제빙시간 테이블 1행에 덮어쓰므로\n"
+            "전체 전송 후에는 마지막으로 보낸 행만 적용됩니다.\n\n"
+            "제빙테이블 전체 행을 전송하시겠습니까?"
+        ):
+            return
+        
+        try:
+            future = self.table_uploader.start(self.freezing_table_data['table_data'],
+                                               on_progress=self._on_table_upload_progress)
+        except Exception as e:
+            self.log_communication(f"제빙테이블 전송 오류: {str(e)}", "red")
+            return
+        
+        uploader = self.table_uploader
+        self.log_communication(
+            f"제빙테이블 일괄 전송 시작: {uploader.progress[1]}행 (행마다 응답 확인, "
+            f"행 간격 {uploader.row_spacing() * 1000:.0f}ms, 전송 중 상태조회 일시 중지)",
+            "purple"
+        )
+        future.add_done_callback(lambda f: self.root.after(0, self._on_table_upload_done, f.result()))
+    
+    def _on_table_upload_progress(self, done, total):
+        """일괄 전송 진행 알림 (전송 스레드에서 호출, 10행마다 로그)"""
+        if done % 10 == 0 and done < total and self.debug_comm:
+            self.root.after(0, self.log_communication, f"  제빙테이블 전송 중: {done}/{total}행", "gray")
+    
+    def _on_table_upload_done(self, result):
+        """일괄 전송 결과 처리 (GUI 스레드)"""
+        summary = TableUploader.format_result(result)
+        if result['completed']:
+            self.log_communication(f"제빙테이블 일괄 전송 완료: {summary}", "green")
+        else:
+            self.log_communication(f"제빙테이블 일괄 전송 실패: {summary}", "red")
+    
     def toggle_icemaking_operation(self, event):
         """제빙 동작 토글 (대기<->동작)"""
         if not self.icemaking_edit_mode:
@@ -1440,7 +1482,7 @@ class MainGUI:
         drain_tank_frame.columnconfigure(0, weight=1)
     
     def create_other_status_area(self, parent):
-        """기타 상태 섹션 생성 (필터리드, 전면커버)"""
+        """기타 상태 섹션 생성 (필터리드, 전면커버, 온수 운전상태)"""
         other_frame = ttk.LabelFrame(parent, text="기타", padding="2")
         other_frame.grid(row=0, column=3, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(2, 0))
         
@@ -1466,6 +1508,16 @@ class MainGUI:
                                                                     width=8, relief="raised")
         self.other_status_labels['front_cover_detected'].pack(side=tk.RIGHT)
         
+        # 온수 운전상태 (CMD 0xF2)
+        heating_frame = ttk.Frame(other_frame)
+        heating_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=1)
+        heating_frame.columnconfigure(0, weight=1)
+        ttk.Label(heating_frame, text="온수운전:", font=("Arial", 9), width=10).pack(side=tk.LEFT)
+        self.other_status_labels['heating_operation_status'] = tk.Label(heating_frame, text="-", 
+                                                                        fg="white", bg="darkgray", font=("Arial", 8, "bold"),
+                                                                        width=8, relief="raised")
+        self.other_status_labels['heating_operation_status'].pack(side=tk.RIGHT)
+        
         other_frame.columnconfigure(0, weight=1)
     
     def create_control_sections(self, parent):
@@ -1611,6 +1663,16 @@ class MainGUI:
                                        state="disabled")
         self.log_clear_btn.grid(row=6, column=0, sticky=(tk.W, tk.E), pady=(3, 0))
         
+        # 응답 시간 히스토그램 보기 버튼
+        self.latency_btn = ttk.Button(right_frame, text="응답시간",
+                                      command=self.show_latency_viewer)
+        self.latency_btn.grid(row=7, column=0, sticky=(tk.W, tk.E), pady=(3, 0))
+        
+        # 원시 바이트 캡처 시작 / 중지 버튼
+        self.capture_btn = ttk.Button(right_frame, text="RAW 캡처",
+                                      command=self.toggle_raw_capture)
+        self.capture_btn.grid(row=8, column=0, sticky=(tk.W, tk.E), pady=(3, 0))
+        
         right_frame.columnconfigure(0, weight=1)
         
         # 포트 목록 초기화
@@ -1618,17 +1680,38 @@ class MainGUI:
     
     def refresh_ports(self):
         """포트 목록 새로고침"""
+        self.port_watcher.rescan()
         ports = self.comm.get_available_ports()
         self.port_combo['values'] = ports
         if ports:
             self.port_combo.set(ports[0])
         self.log_communication(f"포트 새로고침: {len(ports)}개 포트 발견", "blue")
     
+    def _on_port_event(self, kind, info):
+        """포트 추가 / 제거 이벤트 처리 (포트 감시 스레드 → root.after로 GUI 스레드에서 호출)"""
+        if not hasattr(self, 'port_combo'):
+            return
+        current = self.port_var.get()
+        ports = self.comm.get_available_ports()
+        self.port_combo['values'] = ports
+        current_device = current.split(" - ")[0] if current else ""
+        if not any(port.split(" - ")[0] == current_device for port in ports):
+            # 선택한 포트가 뽑힘 - 연결 중이면 그대로 두고(재연결 대기), 아니면 새 포트 선택
+            if not self.comm.is_connected:
+                self.port_combo.set(info.label() if kind == PORT_ADDED else (ports[0] if ports else ""))
+        elif not current and ports:
+            self.port_combo.set(ports[0])
+        
+        if kind == PORT_ADDED:
+            self.log_communication(f"포트 연결됨: {info.label()}", "blue")
+        else:
+            self.log_communication(f"포트 분리됨: {info.device}", "orange")
+    
     def toggle_debug_mode(self):
         """통신 디버그 모드 토글"""
         self.debug_comm = self.debug_var.get()
         if self.debug_comm:
-            self.log_communication("🔍 통신 디버그 모드 활성화 (RAW 데이터 표시)", "blue")
+            self.log_communication("🔍 통신 디버그 모드 활성화 (RAW 바이트는 'RAW 캡처'로 기록)", "blue")
         else:
             self.log_communication("통신 디버그 모드 비활성화", "gray")
     
@@ -1678,6 +1761,8 @@ class MainGUI:
         else:
             success, message = self.comm.disconnect()
             if success:
+                self.export_latency_on_session_end()
+                self.stop_raw_capture()
                 self.connect_btn.config(text="연결")
                 self.status_label.config(text="연결 안됨", fg="red")
                 self.port_combo.config(state="readonly")
@@ -1723,103 +1808,116 @@ class MainGUI:
             self.log_communication(f"CMD 전송 오류: {str(e)}", "red")
     
     def monitor_data(self):
-        """데이터 모니터링 스레드 - 디버깅 로그 포함"""
-        while self.monitoring_active:
-            received_data = self.comm.get_received_data()
-            for msg_type, data in received_data:
-                if msg_type == 'PACKET':
-                    # 패킷 파싱 전 RAW 데이터 로깅
-                    if hasattr(self, 'debug_comm') and self.debug_comm:
-                        if 'tx_id' in data and 'cmd' in data:
-                            # 정상 패킷
-                            pass  # process_received_packet에서 처리
-                        else:
-                            # 파싱 오류 정보
-                            self.log_communication(
-                                f"[디버그] 패킷 파싱 정보: {data}",
-                                "orange"
-                            )
-                    self.process_received_packet(data)
-                elif msg_type == 'SENT':
-                    self.log_sent_data(data)
-                elif msg_type == 'ERROR':
-                    self.log_communication(f"❌ 통신 오류: {data}", "red")
-                elif msg_type == 'RAW_DATA':
-                    # RAW 데이터 수신 로그 (Heartbeat 제외)
-                    if hasattr(self, 'debug_comm') and self.debug_comm:
-                        # Heartbeat 패킷인지 확인 (0x02 0xXX 0x0F ... 형태)
-                        raw_bytes = data.get('bytes', '')
-                        # "02 01 0F" 또는 "02 02 0F" 패턴이 있으면 heartbeat으로 간주
-                        is_heartbeat = ('02 01 0F' in raw_bytes or '02 02 0F' in raw_bytes)
-                        
-                        if not is_heartbeat:
-                            pass
-                            # self.log_communication(
-                            #     f"[수신 RAW] {data['bytes']} ({data['length']}바이트)",
-                            #     "purple"
-                            # )
-            
-            status_updates = self.comm.get_status_updates()
-            for status_type, message in status_updates:
-                color = "purple" if status_type == "SYSTEM" else "red"
-                self.log_communication(f"상태: {message}", color)
-            
-            time.sleep(0.1)
+        """데이터 모니터링 - 수신 / 상태 이벤트 처리 후 100ms 뒤 다시 실행 (Tk 메인 루프에서 호출)"""
+        if not self.monitoring_active:
+            return
+        # 다음 실행 예약 (처리 중 예외가 나도 모니터링은 계속)
+        self.root.after(100, self.monitor_data)
+        
+        received_data = self.comm.get_received_data()
+        for msg_type, data in received_data:
+            if msg_type == 'PACKET':
+                # 패킷 파싱 전 RAW 데이터 로깅
+                if hasattr(self, 'debug_comm') and self.debug_comm:
+                    if not data.is_error:
+                        # 정상 패킷
+                        pass  # process_received_packet에서 처리
+                    else:
+                        # 파싱 오류 정보 (상세 내용은 process_received_packet에서 출력)
+                        self.log_communication(
+                            f"[디버그] 패킷 파싱 정보: {data!r}",
+                            "orange"
+                        )
+                self.process_received_packet(data)
+            elif msg_type == 'UNCHANGED':
+                # 직전과 같은 상태응답 - 파싱/시스템 갱신 없이 그래프 샘플만 추가
+                self.process_unchanged_status(data)
+            elif msg_type == 'SENT_BATCH':
+                # 한 번에 전송한 프레임 묶음 (이벤트 1개)
+                for packet in data:
+                    self.log_sent_data(packet)
+            elif msg_type == 'SENT':
+                self.log_sent_data(data)
+            elif msg_type == 'ERROR':
+                self.log_communication(f"❌ 통신 오류: {data}", "red")
+            elif msg_type == 'LINK_LOST':
+                # 포트 끊김 - 재연결될 때까지 그래프 선이 이어지지 않도록 끊김 시각에 빈 샘플 추가
+                self.mark_graph_gap(data['time'])
+            elif msg_type == 'LINK_RESTORED':
+                self.log_communication(
+                    f"포트 재연결됨 (끊김 {data['duration']:.1f}초: "
+                    f"{data['start']:%H:%M:%S} ~ {data['end']:%H:%M:%S})", "purple")
+            elif msg_type == 'CHANNEL_DROPPED':
+                self.log_channel_dropped("수신", data)
+        
+        status_updates = self.comm.get_status_updates()
+        for status_type, message in status_updates:
+            if status_type == 'CHANNEL_DROPPED':
+                self.log_channel_dropped("상태", message)
+                continue
+            color = "purple" if status_type == "SYSTEM" else "red"
+            self.log_communication(f"상태: {message}", color)
+    
+    def log_channel_dropped(self, channel_name, report):
+        """
+        이벤트 채널에서 버린 이벤트 수 로그 (GUI 처리가 밀린 동안 발생)
+        
+        Args:
+            channel_name: 채널 이름 (로그 표시용)
+            report: {등급: {'dropped', 'high_water'}}
+        """
+        parts = [f"{name} {counts['dropped']}건 버림 (최대 대기 {counts['high_water']}건)"
+                 for name, counts in report.items()]
+        self.log_communication(f"⚠️ {channel_name} 이벤트 처리 지연: {', '.join(parts)}", "orange")
     
     # ============================================
     # 7. process_received_packet에 CMD 0xB2 수신 처리 추가
     # ============================================
-    def process_received_packet(self, packet_info):
-        """수신된 프로토콜 패킷 처리 - 성공/실패 로그 추가"""
+    def process_received_packet(self, frame):
+        """수신된 프로토콜 패킷 처리 - 성공/실패 로그 추가
+        
+        Args:
+            frame: communication 모듈의 Frame(정상) 또는 FrameError(오류) 객체
+        """
         try:
             # 패킷 파싱 에러 체크
-            if 'error' in packet_info:
-                # 파싱 실패
-                error_type = packet_info.get('error', 'UNKNOWN')
-                error_detail = packet_info.get('detail', '상세 정보 없음')
-                raw_data = packet_info.get('raw_data', '')
-                
-                # 에러 타입별 로그 색상 및 메시지
-                error_messages = {
-                    'INVALID_START': '❌ [1단계 실패] STX 확인 실패',
-                    'UNDEFINED_CMD': '❌ [2단계 실패] CMD 확인 실패',
-                    'ETX_POSITION_MISMATCH': '❌ [4단계 실패] ETX 위치 확인 실패',
-                    'CRC_MISMATCH': '❌ [4단계 실패] CRC 검증 실패',
-                    'PACKET_TOO_SHORT': '❌ 패킷 길이 부족',
-                    'LENGTH_MISMATCH': '❌ 패킷 길이 불일치',
-                    'INVALID_STX': '❌ STX 오류',
-                    'INVALID_ETX': '❌ ETX 오류',
-                    'PARSE_EXCEPTION': '❌ 파싱 예외'
-                }
-                
+            if frame.is_error:
+                # 파싱 실패 - 상세 메시지/RAW HEX는 디버그 로그를 출력할 때만 생성
                 if self.debug_comm:
+                    error_messages = {
+                        'INVALID_START': '❌ [1단계 실패] STX 확인 실패',
+                        'UNDEFINED_CMD': '❌ [2단계 실패] CMD 확인 실패',
+                        'ETX_POSITION_MISMATCH': '❌ [4단계 실패] ETX 위치 확인 실패',
+                        'CRC_MISMATCH': '❌ [4단계 실패] CRC 검증 실패',
+                        'PACKET_TOO_SHORT': '❌ 패킷 길이 부족',
+                        'LENGTH_MISMATCH': '❌ 패킷 길이 불일치',
+                        'INVALID_STX': '❌ STX 오류',
+                        'INVALID_ETX': '❌ ETX 오류',
+                        'PARSE_EXCEPTION': '❌ 파싱 예외'
+                    }
+                    
+                    error_type = frame.error
                     error_msg = error_messages.get(error_type, f"❌ 패킷 수신 실패: {error_type}")
                     self.log_communication(error_msg, "red")
-                    self.log_communication(f"   사유: {error_detail}", "orange")
+                    self.log_communication(f"   사유: {frame.detail}", "orange")
                     
-                    if raw_data:
-                        self.log_communication(f"   RAW: {raw_data}", "gray")
+                    if frame.raw:
+                        self.log_communication(f"   RAW: {frame.raw_hex}", "gray")
                     
-                    # 버퍼 초기화 안내
-                    if error_type in ['INVALID_START', 'UNDEFINED_CMD', 'ETX_POSITION_MISMATCH', 'CRC_MISMATCH']:
-                        self.log_communication(f"   ⚠️  수신 버퍼 초기화됨", "orange")
+                    # 재동기화 안내 (건너뛴 바이트만 버리고 뒤의 패킷은 유지)
+                    if frame.skipped:
+                        self.log_communication(f"   ⚠️  수신 재동기화: {frame.skipped}바이트 건너뜀", "orange")
                 
                 return
             
             # 정상 패킷
-            if 'tx_id' not in packet_info or 'cmd' not in packet_info:
-                self.log_communication("❌ 패킷 수신 실패: 필수 필드 누락", "red")
-                return
-            
-            tx_id = packet_info['tx_id']
-            cmd = packet_info['cmd']
-            data_field = packet_info['data_field']
+            tx_id = frame.tx_id
+            cmd = frame.cmd
+            data_field = frame.data_field
             
             device_names = {0x01: "PC", 0x02: "MAIN", 0x03: "FRONT"}
             tx_name = device_names.get(tx_id, f"0x{tx_id:02X}")
             
-            hex_data = " ".join([f"{b:02X}" for b in data_field]) if data_field else "없음"
-            
             # CMD 0xF0 (공통 상태조회) 처리
             if cmd == 0xF0:
                 # POLLING [메인 → PC] 공통 상태응답 처리
@@ -1827,8 +1925,8 @@ class MainGUI:
                     if self.debug_comm:
                         pass
                         # self.log_communication(f"✅ 패킷 수신 성공: {tx_name}, CMD 0x{cmd:02X} (공통 상태조회)", "green")
-                        # self.log_communication(f"   데이터: {hex_data}", "gray")
-                    self.process_common_status_response(data_field, tx_id)
+                        # self.log_communication(f"   데이터: {frame.hex_data}", "gray")
+                    self.process_common_status_response(data_field, tx_id, self.frame_time(frame.timestamp))
                 else:
                     pass
             # CMD 0xF1 (냉동상태조회) 처리
@@ -1838,21 +1936,25 @@ class MainGUI:
                     if self.debug_comm:
                         pass
                         # self.log_communication(f"✅ 패킷 수신 성공: {tx_name}, CMD 0x{cmd:02X} (냉동 상태조회)", "green")
-                        # self.log_communication(f"   데이터: {hex_data}", "gray")
+                        # self.log_communication(f"   데이터: {frame.hex_data}", "gray")
                     self.process_freezing_status_response(data_field, tx_id)
                 else:
                     pass
+            # CMD 0xF2 (순간온수상태조회) 처리
+            elif cmd == 0xF2:
+                # POLLING [메인 → PC] 온수 상태응답 처리
+                if tx_id == 0x02:  # 메인 → PC
+                    self.process_heating_status_response(data_field, tx_id)
             else:
                 if self.debug_comm:
-                    log_msg = f"✅ 패킷 수신 성공: {tx_name}, CMD 0x{cmd:02X}, 데이터: {hex_data}"
+                    log_msg = f"✅ 패킷 수신 성공: {tx_name}, CMD 0x{cmd:02X}, 데이터: {frame.hex_data}"
                     self.log_communication(log_msg, "green")
             
             # CMD별 데이터 처리
             if cmd in [0xB1, 0xB2, 0xB3, 0xB4, 0xC0]:
                 # CMD 0xB1 수신 처리 (냉각 제어 응답)
                 if cmd == 0xB1 and len(data_field) >= 5:
-                    # 응답을 받았으므로 재전송 중지
-                    self.comm.stop_b1_retry()
+                    # 재전송은 수신 스레드에서 응답 CMD를 확인하여 자동으로 중지됨
                     
                     target_rps = data_field[0]  # DATA 1: Target RPS
                     on_temp_int = data_field[1]  # DATA 2: 냉각 ON 온도 (unsigned char, 10을 곱한 값)
@@ -1880,8 +1982,7 @@ class MainGUI:
                 
                 # CMD 0xB2 수신 처리 (제빙 제어 응답)
                 if cmd == 0xB2 and len(data_field) >= 5:
-                    # 응답을 받았으므로 재전송 중지
-                    self.comm.stop_b2_retry()
+                    # 재전송은 수신 스레드에서 응답 CMD를 확인하여 자동으로 중지됨
                     
                     target_rps = data_field[0]  # DATA 1: TARGET RPS
                     water_capacity = (data_field[1] << 8) | data_field[2]  # DATA 2-3: 입수용량 (2바이트)
@@ -1904,8 +2005,7 @@ class MainGUI:
                 
                 # CMD 0xB4 수신 처리 (보냉 제어 응답)
                 if cmd == 0xB4 and len(data_field) >= 4:
-                    # 응답을 받았으므로 재전송 중지
-                    self.comm.stop_b4_retry()
+                    # 재전송은 수신 스레드에서 응답 CMD를 확인하여 자동으로 중지됨
                     
                     target_rps = data_field[0]  # DATA 1: TARGET RPS (unsigned char)
                     
@@ -1941,7 +2041,7 @@ class MainGUI:
                         self.log_communication(f"  CMD 0xB4 응답 수신 - 재전송 중지됨", "green")
                 
                 try:
-                    data_string = data_field.decode('utf-8', errors='ignore')
+                    data_string = bytes(data_field).decode('utf-8', errors='ignore')
                     self.parse_and_update_data(data_string)
                 except:
                     pass
@@ -1949,8 +2049,25 @@ class MainGUI:
         except Exception as e:
             self.log_communication(f"패킷 처리 오류: {str(e)}", "red")
     
-    def process_common_status_response(self, data_field, tx_id=None):
-        """CMD 0xF0 (공통 상태조회) 처리 - 40바이트"""
+    def process_unchanged_status(self, unchanged):
+        """
+        직전 응답과 같은 상태응답 처리 (communication 모듈의 StatusUnchanged)
+        시스템 데이터와 화면은 이미 같은 값이므로 갱신하지 않고, CMD 0xF0 응답마다 추가되던
+        그래프 샘플만 수신 시각으로 추가하여 시계열 간격을 유지합니다.
+        """
+        if unchanged.cmd == 0xF0 and unchanged.tx_id == 0x02:
+            self.update_all_graph_data(self.frame_time(unchanged.timestamp))
+    
+    @staticmethod
+    def frame_time(timestamp_ns):
+        """프레임 수신 시각(time.monotonic_ns)을 그래프용 datetime으로 변환 (None이면 현재 시각)"""
+        now = datetime.now()
+        if timestamp_ns is None:
+            return now
+        return now - timedelta(microseconds=(time.monotonic_ns() - timestamp_ns) // 1000)
+    
+    def process_common_status_response(self, data_field, tx_id=None, received_at=None):
+        """CMD 0xF0 (공통 상태조회) 처리 - 40바이트 (received_at: 그래프 샘플 시각, 기본값: 현재 시각)"""
         try:
             if not data_field or len(data_field) == 0:
                 return
@@ -1972,8 +2089,8 @@ class MainGUI:
             # 센서 데이터 업데이트
             if parsed_data.get('sensor_data'):
                 self.sensor_data.update(parsed_data['sensor_data'])
-                # 센서 데이터가 업데이트되면 그래프 데이터도 업데이트
-                self.update_all_graph_data()
+                # 센서 데이터가 업데이트되면 그래프 데이터도 업데이트 (UNCHANGED 샘플과 같은 수신 시각 기준)
+                self.update_all_graph_data(received_at)
             
             # 밸브 상태 업데이트
             if parsed_data.get('valve_states'):
@@ -1992,6 +2109,25 @@ class MainGUI:
         except Exception as e:
             self.log_communication(f"공통 상태조회 처리 오류: {str(e)}", "red")
     
+    def process_heating_status_response(self, data_field, tx_id=None):
+        """CMD 0xF2 (순간온수상태조회) 처리 - 1바이트"""
+        try:
+            if not data_field or len(data_field) == 0:
+                return
+            
+            if tx_id != 0x02:  # MAIN_ID
+                return
+            
+            # communication.py의 StatusResponseHandler를 사용하여 데이터 파싱
+            parsed_data = self.status_handler.parse_heating_status(data_field, tx_id)
+            
+            # 온수 운전상태 업데이트
+            if parsed_data.get('heating_data'):
+                self.other_status['heating_operation_status'] = parsed_data['heating_data'].get('operation_status')
+        
+        except Exception as e:
+            self.log_communication(f"온수 상태조회 처리 오류: {str(e)}", "red")
+    
     def process_freezing_status_response(self, data_field, tx_id=None):
         """CMD 0xF1 (냉동상태조회) 처리 - 76바이트"""
         try:
@@ -2015,6 +2151,10 @@ class MainGUI:
             # 각 시스템 클래스에 데이터 전달
             if parsed_data.get('hvac_data'):
                 self.hvac_system.update_data(parsed_data['hvac_data'])
+                # 응답 시간 히스토그램을 압축기 상태별로도 기록
+                compressor_state = parsed_data['hvac_data'].get('compressor_state')
+                if compressor_state is not None:
+                    self.comm.latency.set_context(f"압축기 {compressor_state}")
             
             if parsed_data.get('cooling_data'):
                 cooling_data = parsed_data['cooling_data'].copy()
@@ -2031,36 +2171,13 @@ class MainGUI:
                 ice_step = icemaking_data.get('ice_step', 0)
                 icemaking_data['operation'] = self._get_icemaking_operation_from_step(ice_step)
                 
-                # 제빙 STEP에 따른 Heartbeat 제어
-                if ice_step == 22:
-                    if not self.comm.heartbeat_paused:
-                        self.comm.pause_heartbeat()
-                        if self.debug_comm:
-                            self.log_communication(
-                                f"  [제빙 STEP 22] 상태조회 일시 중지 (12초 후 자동 재개 예정)",
-                                "orange"
-                            )
-                        
-                        if self.heartbeat_resume_timer is not None:
-                            self.heartbeat_resume_timer.cancel()
-                        
-                        self.heartbeat_resume_timer = threading.Timer(12.0, self._resume_heartbeat_after_delay)
-                        self.heartbeat_resume_timer.start()
-                else:
-                    if self.heartbeat_resume_timer is not None:
-                        self.heartbeat_resume_timer.cancel()
-                        self.heartbeat_resume_timer = None
-                    
-                    if self.comm.heartbeat_paused:
-                        self.comm.resume_heartbeat()
-                        if self.debug_comm:
-                            self.log_communication(
-                                f"  [제빙 STEP {ice_step}] 상태조회 재개",
-                                "orange"
-                            )
-                
-                # 제빙테이블 자동 전송 처리
-                if ice_step == 22 and self.freezing_table_loaded and self.freezing_table_data is not None:
+                # 제빙테이블 자동 전송 처리 (STEP 22 구간마다 1회, 상태조회 일시 중지 / 재개는 TableUploader가 처리)
+                if ice_step != 22:
+                    self.step22_table_sent = False
+                elif self.step22_table_sent or self.table_uploader.busy:
+                    pass
+                elif self.freezing_table_loaded and self.freezing_table_data is not None:
+                    self.step22_table_sent = True
                     if self.debug_comm:
                         self.log_communication(
                             f"  제빙 STEP이 22입니다. 제빙테이블 자동 전송을 시작합니다...",
@@ -2089,7 +2206,7 @@ class MainGUI:
                         
                         if self.debug_comm:
                             if success:
-                                self.log_communication(f"  제빙테이블 자동 전송 완료", "green")
+                                self.log_communication(f"  제빙테이블 자동 전송 시작 (응답 대기 중)", "green")
                             else:
                                 self.log_communication(f"  제빙테이블 자동 전송 실패", "red")
                     else:
@@ -2098,7 +2215,8 @@ class MainGUI:
                                 f"  온수입수온도 {hot_inlet_temp}℃에 해당하는 테이블 행을 찾을 수 없습니다.",
                                 "orange"
                             )
-                elif ice_step == 22 and not self.freezing_table_loaded:
+                elif not self.freezing_table_loaded:
+                    self.step22_table_sent = True
                     if self.debug_comm:
                         self.log_communication(
                             f"  제빙 STEP이 22이지만 제빙테이블이 로드되지 않았습니다.",
@@ -2333,6 +2451,134 @@ class MainGUI:
                 self.log_communication(f"로그 저장 실패: {str(e)}", "red")
                 messagebox.showerror("오류", f"로그 저장 중 오류가 발생했습니다.\n{str(e)}")
     
+    def show_latency_viewer(self):
+        """CMD별 응답 시간(요청 쓰기 ~ 응답 첫 바이트) 히스토그램 요약 창 (1초마다 갱신)"""
+        if self.latency_window is not None and self.latency_window.winfo_exists():
+            self.latency_window.lift()
+            return
+        
+        viewer = tk.Toplevel(self.root)
+        viewer.title("CMD별 응답 시간")
+        viewer.geometry("760x420")
+        viewer.transient(self.root)
+        self.latency_window = viewer
+        
+        main_frame = ttk.Frame(viewer, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        columns = ('cmd', 'context', 'count', 'min', 'p50', 'p90', 'p99', 'max', 'mean', 'retried', 'lost')
+        headings = ('CMD', '상황', '응답 수', '최소(ms)', 'p50(ms)', 'p90(ms)', 'p99(ms)', '최대(ms)', '평균(ms)',
+                    '재전송 제외', '응답 없음')
+        tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=10)
+        for column, heading in zip(columns, headings):
+            tree.heading(column, text=heading)
+            tree.column(column, width=110 if column == 'context' else 62, anchor=tk.CENTER)
+        tree.pack(fill=tk.BOTH, expand=True)
+        
+        info_label = ttk.Label(main_frame, font=("Arial", 8))
+        info_label.pack(pady=(5, 0))
+        
+        # 상태조회 전송 시각 (예정 시각 격자 기준 지터 / 건너뛴 주기)
+        clock_label = ttk.Label(main_frame, font=("Consolas", 9), justify=tk.LEFT)
+        clock_label.pack(pady=(5, 0))
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=(5, 0))
+        ttk.Button(button_frame, text="CSV 저장", command=self.export_latency, width=12).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="초기화", command=self.reset_latency_stats, width=12).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="닫기", command=viewer.destroy, width=12).pack(side=tk.LEFT, padx=2)
+        
+        def cell(value):
+            return '-' if value is None else f"{value:.1f}"
+        
+        def refresh():
+            if not viewer.winfo_exists():
+                return
+            tree.delete(*tree.get_children())
+            for row in self.comm.get_latency_stats():
+                tree.insert('', tk.END, values=(
+                    f"0x{row['cmd']:02X}", row['context'] or '전체', row['count'], cell(row['min_ms']),
+                    cell(row['p50_ms']), cell(row['p90_ms']), cell(row['p99_ms']), cell(row['max_ms']),
+                    cell(row['mean_ms']), row['retried'], row['lost']))
+            started = datetime.fromtimestamp(self.comm.latency.started).strftime('%H:%M:%S')
+            info_label.config(text=f"기록 시작 {started} | 요청 쓰기 ~ 응답 첫 바이트 | 재전송한 요청은 제외")
+            clock_label.config(text="상태조회 전송 시각 (ms, 쓰기 = 예정 시각부터 포트에 쓸 때까지)\n"
+                                    + self.comm.poll_clock.format_table())
+            viewer.after(1000, refresh)
+        
+        refresh()
+    
+    def reset_latency_stats(self):
+        """응답 시간 히스토그램 / 상태조회 전송 시각 통계 초기화"""
+        self.comm.latency.reset()
+        self.comm.poll_clock.reset_stats()
+    
+    def export_latency(self):
+        """응답 시간 히스토그램을 CSV로 저장 (파일 선택)"""
+        file_path = filedialog.asksaveasfilename(
+            title="응답 시간 히스토그램 저장",
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV 파일", "*.csv"),
+                ("모든 파일", "*.*")
+            ],
+            initialfile=f"latency_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        
+        if file_path:
+            try:
+                count = self.comm.latency.export_csv(file_path)
+                self.log_communication(f"응답 시간 저장 완료: {os.path.basename(file_path)} ({count}개 히스토그램)",
+                                       "green")
+            except Exception as e:
+                self.log_communication(f"응답 시간 저장 실패: {str(e)}", "red")
+                messagebox.showerror("오류", f"응답 시간 저장 중 오류가 발생했습니다.\n{str(e)}")
+    
+    def toggle_raw_capture(self):
+        """원시 바이트 캡처 시작 / 중지 (RX / TX 바이트를 시각과 함께 바이너리 파일에 기록)"""
+        if self.comm.capture is not None:
+            self.stop_raw_capture()
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            title="RAW 캡처 파일 저장",
+            defaultextension=".bin",
+            initialfile=f"capture_{datetime.now().strftime('%Y%m%d_%H%M%S')}.bin",
+            filetypes=[("캡처 파일", "*.bin"), ("모든 파일", "*.*")]
+        )
+        if not file_path:
+            return
+        try:
+            self.comm.start_capture(file_path)
+            self.capture_btn.config(text="RAW 캡처 중지")
+            self.log_communication(f"RAW 캡처 시작: {file_path}", "blue")
+        except Exception as e:
+            self.log_communication(f"RAW 캡처 시작 실패: {str(e)}", "red")
+            messagebox.showerror("오류", f"캡처 파일을 열 수 없습니다.\n{str(e)}")
+    
+    def stop_raw_capture(self):
+        """원시 바이트 캡처 중지 (캡처 중이 아니면 무시)"""
+        stats = self.comm.stop_capture()
+        if stats is None:
+            return
+        self.capture_btn.config(text="RAW 캡처")
+        self.log_communication(
+            f"RAW 캡처 저장: {stats['path']} (RX {stats['rx_bytes']}바이트, TX {stats['tx_bytes']}바이트, "
+            f"{stats['chunks']}건, 보기: py raw_capture.py <파일>)", "green")
+    
+    def export_latency_on_session_end(self):
+        """연결 해제 / 종료 시 응답 시간 히스토그램 자동 저장 (기록이 있을 때만, latency_export_dir)"""
+        if not any(row['count'] for row in self.comm.get_latency_stats()):
+            return
+        file_path = os.path.join(self.latency_export_dir,
+                                 f"latency_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        try:
+            self.comm.latency.export_csv(file_path)
+            self.comm.latency.reset()
+            self.log_communication(f"응답 시간 히스토그램 자동 저장: {file_path}", "gray")
+        except Exception as e:
+            self.log_communication(f"응답 시간 자동 저장 실패: {str(e)}", "red")
+    
     def clear_log(self):
         """통신 로그 삭제"""
         result = messagebox.askyesno(
@@ -2442,9 +2688,14 @@ class MainGUI:
         except (KeyError, ValueError):
             pass
     
-    def update_all_graph_data(self):
-        """모든 그래프 데이터 업데이트"""
-        current_time = datetime.now()
+    def update_all_graph_data(self, current_time=None):
+        """모든 그래프 데이터 업데이트
+        
+        Args:
+            current_time: 샘플 시각 (기본값: 현재 시각)
+        """
+        if current_time is None:
+            current_time = datetime.now()
         self.all_graph_data['time'].append(current_time)
         
         # 센서 데이터
@@ -2486,6 +2737,13 @@ class MainGUI:
         self.all_graph_data['drain_tank_level'].append(tank_level)
         self.all_graph_data['drain_pump_state'].append(pump_state)
     
+    def mark_graph_gap(self, gap_time):
+        """그래프 데이터에 끊김 표시 샘플(NaN) 추가 - matplotlib은 NaN 구간에서 선을 잇지 않음"""
+        self.all_graph_data['time'].append(gap_time)
+        for key, values in self.all_graph_data.items():
+            if key != 'time':
+                values.append(float('nan'))
+    
     def update_gui(self):
         """GUI 업데이트"""
         # 밸브 시스템은 자체적으로 GUI를 업데이트하므로 여기서는 처리하지 않음
@@ -2554,7 +2812,7 @@ class MainGUI:
         # 드레인 펌프 상태 업데이트 (시스템 클래스의 update_gui 메서드 사용)
         self.drain_pump_system._update_gui()
         
-        # 기타 상태 업데이트 (필터리드, 전면커버)
+        # 기타 상태 업데이트 (필터리드, 전면커버, 온수 운전상태)
         if hasattr(self, 'other_status_labels'):
             # 필터리드 상태
             if 'filter_detected' in self.other_status_labels:
@@ -2571,6 +2829,16 @@ class MainGUI:
                     self.other_status_labels['front_cover_detected'].config(text="감지", bg="darkgreen")
                 else:
                     self.other_status_labels['front_cover_detected'].config(text="미감지", bg="darkgray")
+            
+            # 온수 운전상태 (펌웨어 u8HeatingOpStatus 값 그대로 표시, 0이 아니면 강조)
+            if 'heating_operation_status' in self.other_status_labels:
+                heating_status = self.other_status.get('heating_operation_status')
+                if heating_status is None:
+                    self.other_status_labels['heating_operation_status'].config(text="-", bg="darkgray")
+                elif heating_status:
+                    self.other_status_labels['heating_operation_status'].config(text=str(heating_status), bg="darkgreen")
+                else:
+                    self.other_status_labels['heating_operation_status'].config(text="0", bg="darkgray")
 
         # 보냉시스템 데이터 업데이트
         refrigeration_data = self.refrigeration_system.get_data()
@@ -2869,8 +3137,11 @@ class MainGUI:
     def on_closing(self):
         """프로그램 종료 처리"""
         self.monitoring_active = False
+        self.port_watcher.stop()
         if self.comm.is_connected:
             self.comm.disconnect()
+            self.export_latency_on_session_end()
+        self.stop_raw_capture()
         self.root.destroy()
 
 
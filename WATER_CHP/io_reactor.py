@@ -0,0 +1,233 @@
+"""
+공유 I/O 리액터 모듈
+여러 SerialCommunication 세션(포트별 1개)의 수신 / 송신 / 상태조회 / 재전송 타이머를 스레드 하나로 처리합니다.
+포트마다 수신 / 송신 / Heartbeat / 재전송 타이머 스레드를 두는 대신 selectors로 모든 포트 fd를 함께 대기하고,
+송신 스케줄러(TxScheduler)에 프레임이 추가되거나 재전송 명령이 추가되면 깨우기용 소켓으로 리액터를 깨웁니다.
+SerialCommunication.connect()는 reactor를 지정하지 않으면 포트 전용 리액터를 만들어 사용합니다 (use_reactor).
+
+- POSIX: 포트 fd를 selector에 등록 (데이터 도착 시 SerialReceiver.read_nowait로 읽음)
+- fd가 없는 포트 (Windows 등): POLL_INTERVAL 간격으로 in_waiting을 확인해서 읽음
+- 상태조회: 세션별 SerialCommunication._heartbeat_step이 알려주는 다음 예정 시각(poll_clock 격자)까지 select 대기
+- 재전송: 세션별 RetransmitManager.run_due가 알려주는 다음 재전송 / 타임아웃 시각까지 select 대기
+- 송신: tx_frame_gap이 0이면 대기 프레임을 묶어서 write 1회, 0보다 크면 프레임 간격이 지날 때마다 1개씩 전송
+
+사용 예:
+    reactor = IoReactor()
+    comm.connect('/dev/ttyUSB0', 9600, reactor=reactor)
+"""
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+from serial_receiver import SerialReceiver
+
+
+class _Session:
+    """리액터에 등록된 세션"""
+    
+    __slots__ = ('comm', 'receiver', 'registered', 'tx_ready')
+    
+    def __init__(self, comm, receiver):
+        self.comm = comm
+        self.receiver = receiver
+        self.registered = False # selector 등록 여부
+        self.tx_ready = 0.0     # tx_frame_gap > 0일 때 다음 프레임을 보낼 수 있는 시각 (time.monotonic)
+
+
+class IoReactor:
+    """여러 시리얼 세션을 스레드 하나로 처리하는 리액터"""
+    
+    MAX_WAIT = 0.1          # 최대 대기 시간 (초, 설정 변경 반영 주기)
+    POLL_INTERVAL = 0.01    # fd가 없는 포트의 수신 확인 간격 (초)
+    
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self._selector.register(self._wake_recv, selectors.EVENT_READ, None)
+        
+        self._lock = threading.Lock()
+        self._sessions = {}         # SerialCommunication → _Session
+        self._ops = deque()         # 리액터 스레드에서 처리할 등록 / 해제 요청
+        self._thread = None
+        self._running = False
+        
+        # 통계
+        self.loop_count = 0         # select 반복 횟수
+        self.wakeup_count = 0       # 깨우기 소켓으로 깨어난 횟수
+    
+    def __len__(self):
+        return len(self._sessions)
+    
+    def attach(self, comm):
+        """연결된 세션 등록 (SerialCommunication.connect에서 호출)"""
+        receiver = SerialReceiver(comm.serial_connection, timeout=0)
+        comm.receiver = receiver
+        comm.tx.on_submit = self.wakeup
+        comm.retransmit.set_external_loop(self.wakeup)
+        
+        with self._lock:
+            self._ops.append(('attach', _Session(comm, receiver), None))
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name='IoReactor', daemon=True)
+                self._thread.start()
+        self.wakeup()
+    
+    def detach(self, comm):
+        """세션 해제 (SerialCommunication.disconnect에서 호출, 리액터가 처리할 때까지 최대 1초 대기)"""
+        comm.tx.on_submit = None
+        done = threading.Event()
+        with self._lock:
+            if not self._running:
+                self._sessions.pop(comm, None)
+                return
+            self._ops.append(('detach', comm, done))
+        self.wakeup()
+        if threading.current_thread() is not self._thread:
+            done.wait(1.0)
+    
+    def wakeup(self):
+        """리액터 깨우기 (다른 스레드에서 송신 프레임 추가 / 설정 변경 시)"""
+        try:
+            self._wake_send.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # 이미 깨우기 요청이 쌓여 있음
+    
+    def close(self):
+        """리액터 종료 (등록된 세션은 호출 측에서 먼저 disconnect)"""
+        with self._lock:
+            self._running = False
+        self.wakeup()
+        if self._thread is not None and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=1.0)
+        self._selector.close()
+        self._wake_recv.close()
+        self._wake_send.close()
+    
+    def _apply_ops(self):
+        """등록 / 해제 요청 처리 (리액터 스레드)"""
+        while True:
+            with self._lock:
+                if not self._ops:
+                    return
+                op, target, done = self._ops.popleft()
+            
+            if op == 'attach':
+                session = target
+                self._sessions[session.comm] = session
+                if session.receiver.fd is not None:
+                    self._selector.register(session.receiver.fd, selectors.EVENT_READ, session)
+                    session.registered = True
+            else:
+                session = self._sessions.pop(target, None)
+                if session is not None:
+                    self._unregister(session)
+                done.set()
+    
+    def _unregister(self, session):
+        """selector 감시 해제"""
+        if session.registered:
+            try:
+                self._selector.unregister(session.receiver.fd)
+            except (KeyError, ValueError, OSError):
+                pass
+            session.registered = False
+    
+    def _run(self):
+        """리액터 스레드"""
+        while True:
+            with self._lock:
+                if not self._running:
+                    break
+            self._apply_ops()
+            self.loop_count += 1
+            
+            # 상태조회 / 재전송 / 송신 처리 후 다음 상태조회 / 재전송 시각까지 대기 시간 계산
+            now = time.monotonic()
+            timeout = self.MAX_WAIT
+            for session in list(self._sessions.values()):
+                comm = session.comm
+                if comm.heartbeat_active and comm.is_connected:
+                    try:
+                        wake = comm._heartbeat_step()
+                        timeout = min(timeout, wake - now)
+                    except Exception as e:
+                        comm.status_queue.put(('ERROR', f"상태조회 전송 오류: {str(e)}"))
+                wake = comm.retransmit.run_due(now)
+                if wake is not None:
+                    timeout = min(timeout, wake - now)
+                wake = self._flush(session, now)
+                if wake is not None:
+                    timeout = min(timeout, wake - now)
+                if not session.registered:
+                    timeout = min(timeout, self.POLL_INTERVAL)
+            
+            # 수신 대기
+            for key, _ in self._selector.select(max(0.0, timeout)):
+                session = key.data
+                if session is None:
+                    self.wakeup_count += 1
+                    try:
+                        while self._wake_recv.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                else:
+                    self._read(session)
+            
+            # fd가 없는 포트는 도착 여부를 직접 확인
+            for session in list(self._sessions.values()):
+                if not session.registered:
+                    self._read(session)
+    
+    def _read(self, session):
+        """세션 수신 처리"""
+        comm = session.comm
+        if comm not in self._sessions:
+            return
+        try:
+            data = session.receiver.read_nowait()
+            if data is not None:
+                comm._handle_received(data, session.receiver.last_arrival_ns)
+        except Exception as e:
+            # 수신 스레드와 같이 해당 세션만 중지하고 포트 끊김 처리 (auto_reconnect이면 재연결 후 다시 등록됨)
+            self._unregister(session)
+            self._sessions.pop(comm, None)
+            comm._on_link_lost(f"수신 오류: {str(e)}")
+    
+    def _flush(self, session, now):
+        """
+        세션의 송신 대기 프레임 전송 (리액터 스레드는 잠들 수 없으므로 프레임 간격은 전송 가능 시각으로 지킴)
+        
+        Returns:
+            float: 간격 때문에 남겨 둔 프레임이 있으면 다음 전송 가능 시각, 없으면 None
+        """
+        comm = session.comm
+        try:
+            if not (comm.is_connected and comm.link_up):
+                return None
+            if comm.tx_frame_gap <= 0:
+                # 대기 중인 프레임을 묶어서 write 1회 (묶음 크기 제한을 넘으면 다음 묶음으로)
+                while True:
+                    batch = comm.tx.get_batch(comm.tx_batch_frames, timeout=0, max_bytes=comm.tx_batch_bytes)
+                    if not batch:
+                        return None
+                    comm._write_batch(batch)
+            
+            if now < session.tx_ready:
+                return session.tx_ready if len(comm.tx) else None
+            data = comm.tx.get(timeout=0)
+            if data is None:
+                return None
+            comm._write_batch([data])
+            session.tx_ready = time.monotonic() + comm.tx_frame_spacing(data)
+            return session.tx_ready if len(comm.tx) else None
+        except Exception as e:
+            self._unregister(session)
+            self._sessions.pop(comm, None)
+            comm._on_link_lost(f"송신 오류: {str(e)}")
+            return None
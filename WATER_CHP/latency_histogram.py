@@ -0,0 +1,337 @@
+"""
+CMD별 왕복 시간(RTT) 히스토그램 모듈
+요청을 포트에 쓴 시각부터 대응하는 응답의 첫 바이트가 도착한 시각까지를 CMD별 고정 크기 히스토그램에 기록합니다.
+
+- 히스토그램: HDR 방식 로그-선형 구간 (마이크로초 단위, 2배 범위마다 SUB_BUCKETS개 구간 → 상대 오차 약 3%)
+  구간 수가 고정(MAX_US까지 736개)이므로 측정 수와 관계없이 메모리 일정
+- 요청 / 응답 매칭: 응답 CMD별로 보낸 순서대로 대기 (B3는 F1으로 응답, 나머지는 같은 CMD)
+  재전송(mark_retry 후 전송)한 요청은 어느 전송의 응답인지 알 수 없으므로 기록하지 않음 (Karn 규칙)
+  재전송이 아닌데 같은 패킷을 다시 보내면(다음 주기 상태조회) 이전 요청은 응답 없음으로 집계,
+  응답 없이 max_wait초가 지난 요청도 응답 없음으로 집계
+- 상황별 분리: set_context(이름)를 지정하면 CMD 전체 히스토그램과 함께 (CMD, 이름) 히스토그램에도 기록
+  (예: 압축기 동작 / 미동작에 따른 응답 시간 비교)
+- 내보내기: export_csv()로 요약(백분위) + 구간별 개수 저장
+
+사용 예:
+    recorder = LatencyRecorder(response_cmds={0xB3: 0xF1})
+    recorder.on_sent(packet, sent_ns)
+    recorder.on_response(0xF0, first_byte_ns)
+    print(recorder.format_table())
+"""
+import csv
+import threading
+import time
+from array import array
+from collections import deque
+
+
+SUB_BITS = 5
+SUB_BUCKETS = 1 << SUB_BITS     # 2배 범위마다 구간 수
+MAX_US = (1 << 27) - 1          # 최대 기록 값 (약 134초, 넘으면 마지막 구간)
+
+
+def _bucket_index(value):
+    """값(us) → 구간 번호 (2 × SUB_BUCKETS 미만은 1us 구간, 이후 2배마다 구간 폭 2배)"""
+    if value < 2 * SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BITS - 1
+    return SUB_BUCKETS * shift + (value >> shift)
+
+
+def _bucket_range(index):
+    """구간 번호 → (하한 us, 상한 us) (상한 포함)"""
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = index // SUB_BUCKETS - 1
+    low = (index - SUB_BUCKETS * shift) << shift
+    return low, low + (1 << shift) - 1
+
+
+BUCKET_COUNT = _bucket_index(MAX_US) + 1
+
+
+class LatencyHistogram:
+    """고정 크기 로그-선형 지연 시간 히스토그램 (마이크로초)"""
+    
+    __slots__ = ('_counts', 'count', 'total_us', 'min_us', 'max_us', 'overflow')
+    
+    def __init__(self):
+        self._counts = array('L', bytes(array('L').itemsize * BUCKET_COUNT))
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = None
+        self.overflow = 0           # MAX_US를 넘어 마지막 구간에 기록한 수
+    
+    def record(self, value_us):
+        """지연 시간 1개 기록 (us, 음수는 0으로)"""
+        value = max(0, int(value_us))
+        if value > MAX_US:
+            self.overflow += 1
+            value = MAX_US
+        self._counts[_bucket_index(value)] += 1
+        self.count += 1
+        self.total_us += value
+        if self.min_us is None or value < self.min_us:
+            self.min_us = value
+        if self.max_us is None or value > self.max_us:
+            self.max_us = value
+    
+    def merge(self, other):
+        """다른 히스토그램의 기록을 더함"""
+        for index, count in enumerate(other._counts):
+            if count:
+                self._counts[index] += count
+        self.count += other.count
+        self.total_us += other.total_us
+        self.overflow += other.overflow
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        if other.max_us is not None and (self.max_us is None or other.max_us > self.max_us):
+            self.max_us = other.max_us
+    
+    def percentile(self, percent):
+        """
+        백분위 값 (us, 해당 구간의 상한, 기록이 없으면 None)
+        
+        Args:
+            percent: 0 ~ 100
+        """
+        if not self.count:
+            return None
+        target = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(_bucket_range(index)[1], self.max_us)
+        return self.max_us
+    
+    def mean(self):
+        """평균 (us, 기록이 없으면 None)"""
+        return self.total_us / self.count if self.count else None
+    
+    def buckets(self):
+        """기록이 있는 구간 목록 [(하한 us, 상한 us, 개수), ...]"""
+        return [_bucket_range(index) + (count,) for index, count in enumerate(self._counts) if count]
+    
+    def summary(self):
+        """
+        요약 통계 (ms)
+        
+        Returns:
+            dict: {'count', 'min_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms', 'mean_ms'} (기록이 없으면 값은 None)
+        """
+        def ms(value):
+            return None if value is None else value / 1000
+        return {
+            'count': self.count,
+            'min_ms': ms(self.min_us),
+            'p50_ms': ms(self.percentile(50)),
+            'p90_ms': ms(self.percentile(90)),
+            'p99_ms': ms(self.percentile(99)),
+            'max_ms': ms(self.max_us),
+            'mean_ms': ms(self.mean())
+        }
+
+
+class LatencyRecorder:
+    """요청 전송 / 응답 수신 시각으로 CMD별 RTT 히스토그램 기록 (송신 / 수신 스레드에서 호출)"""
+    
+    def __init__(self, response_cmds=None, max_wait=2.0):
+        """
+        Args:
+            response_cmds: 요청 CMD → 응답 CMD (없는 CMD는 같은 CMD로 응답, 예: {0xB3: 0xF1})
+            max_wait: 응답을 기다리는 최대 시간 (초, 지나면 응답 없음으로 집계)
+        """
+        self.response_cmds = dict(response_cmds or {})
+        self.max_wait = max_wait
+        self.context = None         # 현재 상황 이름 (set_context)
+        
+        self._lock = threading.Lock()
+        self._waiting = {}          # 응답 CMD → deque([요청 CMD, 전송 시각(ns), 재전송 여부, 패킷])
+        self._retry_next = set()    # 다음 전송을 재전송으로 볼 패킷 (mark_retry)
+        self._histograms = {}       # CMD 또는 (CMD, 상황 이름) → LatencyHistogram
+        self._counters = {}         # CMD → [전송 수, 기록 수, 재전송으로 제외한 수, 응답 없음 수]
+        self.started = time.time()  # 기록 시작 시각 (reset 시 갱신)
+    
+    def set_context(self, name):
+        """이후 기록할 응답의 상황 이름 (None이면 CMD 전체 히스토그램에만 기록)"""
+        self.context = name
+    
+    def mark_retry(self, packet):
+        """packet의 다음 전송은 재전송 (응답을 기다리는 같은 패킷과 함께 RTT 기록에서 제외)"""
+        with self._lock:
+            self._retry_next.add(bytes(packet))
+    
+    def on_sent(self, packet, sent_ns):
+        """
+        요청을 포트에 쓴 시각 기록
+        
+        Args:
+            packet: 보낸 패킷 (STX ~ ETX)
+            sent_ns: 쓴 시각 (time.monotonic_ns)
+        """
+        packet = bytes(packet)
+        cmd = packet[2]
+        response_cmd = self.response_cmds.get(cmd, cmd)
+        with self._lock:
+            waiting = self._waiting.get(response_cmd)
+            if waiting is None:
+                waiting = self._waiting[response_cmd] = deque()
+            self._expire_locked(waiting, sent_ns)
+            
+            retried = packet in self._retry_next
+            self._retry_next.discard(packet)
+            for entry in list(waiting):
+                if entry[3] == packet:
+                    if retried:
+                        entry[2] = True     # 응답이 어느 전송의 것인지 알 수 없음
+                    else:
+                        waiting.remove(entry)   # 같은 요청을 새로 보냄 → 이전 요청은 응답 없음
+                        self._cmd_counters(cmd)[3] += 1
+            waiting.append([cmd, sent_ns, retried, packet])
+            self._cmd_counters(cmd)[0] += 1
+    
+    def on_response(self, cmd, first_byte_ns):
+        """
+        응답 첫 바이트 도착 시각으로 가장 먼저 보낸 대기 요청의 RTT 기록
+        
+        Returns:
+            float: 기록한 RTT (ms), 대기 요청이 없거나 재전송이라 제외했으면 None
+        """
+        with self._lock:
+            waiting = self._waiting.get(cmd)
+            if not waiting:
+                return None
+            self._expire_locked(waiting, first_byte_ns)
+            if not waiting:
+                return None
+            
+            request_cmd, sent_ns, retried, _ = waiting.popleft()
+            counters = self._cmd_counters(request_cmd)
+            if retried:
+                counters[2] += 1
+                return None
+            
+            value_us = (first_byte_ns - sent_ns) / 1000
+            counters[1] += 1
+            self._histogram_locked(request_cmd).record(value_us)
+            if self.context is not None:
+                self._histogram_locked((request_cmd, self.context)).record(value_us)
+            return value_us / 1000
+    
+    def forget_waiting(self):
+        """응답 대기 요청 모두 제거 (포트 재연결 / 연결 해제 시, 히스토그램은 유지)"""
+        with self._lock:
+            self._waiting.clear()
+            self._retry_next.clear()
+    
+    def reset(self):
+        """히스토그램 / 통계 초기화"""
+        with self._lock:
+            self._waiting.clear()
+            self._retry_next.clear()
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = time.time()
+    
+    def _expire_locked(self, waiting, now_ns):
+        """max_wait가 지난 대기 요청을 응답 없음으로 제거"""
+        limit = now_ns - int(self.max_wait * 1e9)
+        while waiting and waiting[0][1] < limit:
+            self._cmd_counters(waiting.popleft()[0])[3] += 1
+    
+    def _cmd_counters(self, cmd):
+        counters = self._counters.get(cmd)
+        if counters is None:
+            counters = self._counters[cmd] = [0, 0, 0, 0]
+        return counters
+    
+    def _histogram_locked(self, key):
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram()
+        return histogram
+    
+    def histogram(self, cmd, context=None):
+        """
+        히스토그램 복사본 (기록이 없으면 None)
+        
+        Args:
+            cmd: 요청 CMD
+            context: 상황 이름 (None이면 CMD 전체)
+        """
+        key = cmd if context is None else (cmd, context)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                return None
+            copy = LatencyHistogram()
+            copy.merge(histogram)
+            return copy
+    
+    def get_stats(self):
+        """
+        CMD / 상황별 요약 통계
+        
+        Returns:
+            list: [{'cmd', 'context', 'sent', 'recorded', 'retried', 'lost', 'count', 'min_ms', 'p50_ms', 'p90_ms',
+                    'p99_ms', 'max_ms', 'mean_ms'}, ...] (CMD 순, CMD 전체 다음에 상황별)
+        """
+        with self._lock:
+            # 응답을 하나도 기록하지 못한 CMD(재전송 / 응답 없음만 있는 경우)도 CMD 전체 행으로 포함
+            keys = set(self._histograms) | set(self._counters)
+            rows = []
+            for key in sorted(keys, key=lambda key: (key, '') if isinstance(key, int) else key):
+                cmd, context = (key, None) if isinstance(key, int) else key
+                sent, recorded, retried, lost = self._counters.get(cmd, (0, 0, 0, 0))
+                row = {'cmd': cmd, 'context': context, 'sent': sent, 'recorded': recorded,
+                       'retried': retried, 'lost': lost}
+                row.update((self._histograms.get(key) or LatencyHistogram()).summary())
+                rows.append(row)
+            return rows
+    
+    def format_table(self):
+        """get_stats()를 고정 폭 텍스트 표로 변환"""
+        def cell(value):
+            return '-' if value is None else f"{value:.1f}"
+        
+        lines = [f"{'CMD':<6} {'상황':<10} {'응답수':>6} {'최소':>7} {'p50':>7} {'p90':>7} {'p99':>7} {'최대':>7} "
+                 f"{'재전송':>5} {'응답없음':>6}"]
+        for row in self.get_stats():
+            lines.append(
+                f"0x{row['cmd']:02X}   {row['context'] or '전체':<10} {row['count']:>6} {cell(row['min_ms']):>7} "
+                f"{cell(row['p50_ms']):>7} {cell(row['p90_ms']):>7} {cell(row['p99_ms']):>7} "
+                f"{cell(row['max_ms']):>7} {row['retried']:>5} {row['lost']:>6}"
+            )
+        return '\n'.join(lines)
+    
+    def export_csv(self, path):
+        """
+        요약 + 구간별 개수를 CSV로 저장 (Excel에서 바로 열 수 있도록 UTF-8 BOM)
+        
+        Returns:
+            int: 저장한 히스토그램 수
+        """
+        stats = self.get_stats()
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(['# 기록 시작', time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started))])
+            writer.writerow(['CMD', '상황', '전송', '응답', '재전송 제외', '응답 없음',
+                             '최소(ms)', 'p50(ms)', 'p90(ms)', 'p99(ms)', '최대(ms)', '평균(ms)'])
+            for row in stats:
+                writer.writerow([f"0x{row['cmd']:02X}", row['context'] or '전체', row['sent'], row['count'],
+                                 row['retried'], row['lost'], row['min_ms'], row['p50_ms'], row['p90_ms'],
+                                 row['p99_ms'], row['max_ms'], row['mean_ms']])
+            
+            writer.writerow([])
+            writer.writerow(['CMD', '상황', '구간 하한(ms)', '구간 상한(ms)', '개수'])
+            for row in stats:
+                histogram = self.histogram(row['cmd'], row['context'])
+                if histogram is None:
+                    continue
+                for low, high, count in histogram.buckets():
+                    writer.writerow([f"0x{row['cmd']:02X}", row['context'] or '전체',
+                                     low / 1000, high / 1000, count])
+        return len(stats)
@@ -0,0 +1,181 @@
+"""
+상태조회 전송 시각 격자 모듈
+상태조회(F0/F1/F2)를 CMD별로 time.monotonic_ns 기준 정수 ns 격자(시작 시각 + k × 주기)에 맞춰 보냅니다.
+전송 후 sleep(주기)로 기다리던 방식은 실제 주기가 (주기 + 처리 시간 + 대기열 시간)이 되어 오래 돌리면 밀리지만,
+격자는 실제로 보낸 시각이 아니라 예정 시각에서 다음 시각을 계산하므로 늦게 깨어나도 누적되지 않습니다.
+time.time()을 쓰지 않으므로 NTP 보정 / 서머타임 등 시스템 시계 변경의 영향을 받지 않습니다.
+
+- 밀린 주기: 다음 예정 시각까지 지났으면 몰아서 보내지 않고 건너뛰고 missed로 집계 (격자는 유지)
+- 미룬 주기: 응답 대기 제한(적응형 상태조회) 때문에 예정 시각에 보내지 못한 경우 deferred로 집계
+- 주기 변경: 마지막 예정 시각부터 새 주기로 격자를 이어감
+- 지터: 예정 시각 ~ 송신 대기열 추가 시각(issue), 예정 시각 ~ 포트에 쓴 시각(write)을 CMD별 히스토그램에 기록
+
+사용 예:
+    clock = PollClock(stagger=0.1)
+    slot = clock.due(0xF0, 5.0, now_ns)
+    if slot <= now_ns:
+        send()
+        clock.advance(0xF0, now_ns, issued=True)
+"""
+import threading
+
+from latency_histogram import LatencyHistogram
+
+
+class PollClock:
+    """CMD별 상태조회 예정 시각 격자와 지터 / 밀림 통계"""
+    
+    def __init__(self, stagger=0.1):
+        """
+        Args:
+            stagger: CMD별 첫 예정 시각 간격 (초, 같은 시점에 몰리지 않도록 분산)
+        """
+        self.stagger = stagger
+        self._lock = threading.Lock()
+        self._grids = {}        # CMD → [다음 예정 시각(ns), 주기(ns), 이번 예정 시각을 미룬 적 있음, 보낸 예정 시각(ns)]
+        self._stats = {}        # CMD → [보낸 수, 건너뛴 수, 미룬 수, issue 히스토그램, write 히스토그램,
+                                #        첫 쓰기 시각(ns), 마지막 쓰기 시각(ns), 쓰기 수]
+    
+    def reset(self):
+        """격자 초기화 (다음 due()부터 새 시작 시각, 통계는 유지)"""
+        with self._lock:
+            self._grids.clear()
+    
+    def reset_stats(self):
+        """지터 / 밀림 통계 초기화"""
+        with self._lock:
+            self._stats.clear()
+    
+    def due(self, cmd, rate, now_ns):
+        """
+        CMD의 다음 예정 시각 (격자가 없으면 now_ns + 등록 순서 × stagger에서 시작)
+        
+        Args:
+            cmd: 상태조회 CMD
+            rate: 현재 전송 주기 (Hz, 0보다 커야 함, 적응형 주기처럼 매번 달라져도 됨)
+            now_ns: 현재 시각 (time.monotonic_ns)
+        
+        Returns:
+            int: 예정 시각 (ns)
+        """
+        period_ns = max(1, round(1e9 / rate))
+        with self._lock:
+            grid = self._grids.get(cmd)
+            if grid is None:
+                grid = self._grids[cmd] = [now_ns + round(len(self._grids) * self.stagger * 1e9), period_ns,
+                                           False, None]
+            elif grid[1] != period_ns:
+                # 주기 변경 - 직전 예정 시각 기준으로 다음 예정 시각을 다시 계산
+                grid[0] += period_ns - grid[1]
+                grid[1] = period_ns
+            return grid[0]
+    
+    def remove(self, cmd):
+        """CMD 격자 제거 (주기 0, 다시 due()하면 새로 시작)"""
+        with self._lock:
+            self._grids.pop(cmd, None)
+    
+    def defer(self, cmd):
+        """예정 시각이 지났지만 응답 대기 제한 때문에 보내지 못함 (예정 시각 유지, 예정 시각당 1회 집계)"""
+        with self._lock:
+            grid = self._grids.get(cmd)
+            if grid is not None and not grid[2]:
+                grid[2] = True
+                self._cmd_stats(cmd)[2] += 1
+    
+    def advance(self, cmd, now_ns, issued=True):
+        """
+        예정 시각 처리 후 다음 예정 시각으로 이동 (밀린 예정 시각은 건너뜀)
+        
+        Args:
+            cmd: 상태조회 CMD
+            now_ns: 현재 시각 (time.monotonic_ns)
+            issued: 이번 예정 시각에 상태조회를 보냈으면 True (일시 중지 / 재연결 중 건너뛰면 False)
+        
+        Returns:
+            int: 다음 예정 시각 (ns)
+        """
+        with self._lock:
+            grid = self._grids[cmd]
+            slot, period_ns = grid[0], grid[1]
+            stats = self._cmd_stats(cmd)
+            if issued:
+                stats[0] += 1
+                stats[3].record((now_ns - slot) // 1000)
+                grid[3] = slot
+            
+            slot += period_ns
+            if slot <= now_ns:
+                missed = (now_ns - slot) // period_ns + 1
+                slot += missed * period_ns
+                if issued:
+                    stats[1] += missed
+            grid[0] = slot
+            grid[2] = False
+            return slot
+    
+    def on_written(self, cmd, written_ns):
+        """상태조회를 포트에 쓴 시각 기록 (송신 스레드 / 리액터에서 호출, 보낸 예정 시각당 1회)"""
+        with self._lock:
+            grid = self._grids.get(cmd)
+            if grid is None or grid[3] is None:
+                return
+            slot, grid[3] = grid[3], None
+            stats = self._cmd_stats(cmd)
+            stats[4].record((written_ns - slot) // 1000)
+            if stats[5] is None:
+                stats[5] = written_ns
+            stats[6] = written_ns
+            stats[7] += 1
+    
+    def _cmd_stats(self, cmd):
+        """CMD별 통계 항목 (없으면 생성, 잠금 보유 상태에서 호출)"""
+        stats = self._stats.get(cmd)
+        if stats is None:
+            stats = self._stats[cmd] = [0, 0, 0, LatencyHistogram(), LatencyHistogram(), None, None, 0]
+        return stats
+    
+    def get_stats(self):
+        """
+        CMD별 전송 시각 통계
+        
+        Returns:
+            dict: {CMD: {'period_ms', 'issued', 'missed', 'deferred', 'issue_p50_ms', 'issue_p99_ms',
+                         'issue_max_ms', 'write_p50_ms', 'write_p99_ms', 'write_max_ms', 'mean_interval_ms'}}
+                  (issue / write는 예정 시각부터 늦은 시간, mean_interval_ms는 실제 쓰기 간격 평균)
+        """
+        with self._lock:
+            result = {}
+            for cmd, (issued, missed, deferred, issue, write, first, last, writes) in self._stats.items():
+                grid = self._grids.get(cmd)
+                issue_summary = issue.summary()
+                write_summary = write.summary()
+                result[cmd] = {
+                    'period_ms': grid[1] / 1e6 if grid is not None else None,
+                    'issued': issued,
+                    'missed': missed,
+                    'deferred': deferred,
+                    'issue_p50_ms': issue_summary['p50_ms'],
+                    'issue_p99_ms': issue_summary['p99_ms'],
+                    'issue_max_ms': issue_summary['max_ms'],
+                    'write_p50_ms': write_summary['p50_ms'],
+                    'write_p99_ms': write_summary['p99_ms'],
+                    'write_max_ms': write_summary['max_ms'],
+                    'mean_interval_ms': (last - first) / (writes - 1) / 1e6 if writes > 1 else None
+                }
+            return result
+    
+    def format_table(self):
+        """get_stats()를 고정 폭 텍스트 표로 변환"""
+        def cell(value):
+            return '-' if value is None else f"{value:.1f}"
+        
+        lines = [f"{'CMD':<6} {'주기':>7} {'실제간격':>8} {'전송':>6} {'건너뜀':>6} {'미룸':>5} "
+                 f"{'쓰기p50':>7} {'쓰기p99':>7} {'쓰기최대':>8}"]
+        for cmd, row in sorted(self.get_stats().items()):
+            lines.append(
+                f"0x{cmd:02X}   {cell(row['period_ms']):>7} {cell(row['mean_interval_ms']):>8} {row['issued']:>6} "
+                f"{row['missed']:>6} {row['deferred']:>5} {cell(row['write_p50_ms']):>7} "
+                f"{cell(row['write_p99_ms']):>7} {cell(row['write_max_ms']):>8}"
+            )
+        return '\n'.join(lines)
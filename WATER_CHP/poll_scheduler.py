@@ -0,0 +1,311 @@
+"""
+적응형 상태조회 주기 모듈
+상태조회(F0/F1/F2) 요청 ~ 응답 왕복 시간(RTT)과 통신 속도별 전송 시간(wire time)을 CMD별로 측정하여
+링크를 넘치게 하지 않는 가장 높은 조회 주기를 계산합니다. 설정한 주기(poll_rates)는 상한으로 사용합니다.
+
+- stop-and-wait: 응답을 받은 뒤(또는 응답 제한 시간이 지난 뒤)에 다음 상태조회 전송
+  안전 조건: Σ(주기 × RTT) ≤ target_load (응답을 기다리는 동안 링크를 다른 조회가 쓰지 않음)
+- windowed: 응답을 기다리는 상태조회를 window개까지 허용
+  안전 조건: Σ(주기 × 요청/응답 전송 시간) ≤ target_load
+- RTT는 TCP와 같은 방식의 평활 RTT(SRTT) / 편차(RTTVAR)로 관리하고, 응답 제한 시간은 SRTT + 4 × RTTVAR
+- 응답 없음 판단: 응답 제한 시간 초과 외에도
+  · 다른 상태조회 CMD의 응답이 조회 요청 + 응답 전송 시간 이후에 오면 그 조회는 응답 없음
+    (메인은 요청 순서대로 응답, F2 요청에 F0으로 응답하는 test_uart_comm.c 포함)
+  · 조회를 보낸 뒤 응답으로 처리되지 않은 바이트를 받고 응답 프레임 1개 전송 시간 동안 수신이 없으면 응답 없음
+    (F2 요청에 cmd 0x00으로 응답하는 App_Comm_Protocol.c, CRC 오류 응답 등)
+- 달성 주기: 최근 RATE_WINDOW초 동안 받은 응답 수 기준
+
+예: 9600bps에서 F1 요청(7바이트) + 응답(83바이트) = 90바이트 → 약 94ms
+"""
+import threading
+import time
+from collections import deque
+
+
+MODE_STOP_AND_WAIT = 'stop-and-wait'
+MODE_WINDOWED = 'windowed'
+
+FRAME_OVERHEAD = 7      # STX + TX_ID + CMD + LEN + CRC(2) + ETX
+BITS_PER_BYTE = 10      # 시작 비트 + 8비트 + 정지 비트
+
+
+class PollScheduler:
+    """상태조회 RTT / 전송 시간 측정과 안전한 조회 주기 계산"""
+    
+    RATE_WINDOW = 2.0       # 달성 주기 계산 구간 (초)
+    MIN_RTO = 0.05          # 최소 응답 제한 시간 (초)
+    TURNAROUND = 0.005      # RTT 측정 전 메인 응답 준비 시간 추정값 (초)
+    
+    def __init__(self, request_lengths, response_lengths, baudrate=9600, mode=MODE_STOP_AND_WAIT,
+                 window=2, target_load=0.8):
+        """
+        Args:
+            request_lengths: CMD → 요청 DATA FIELD 길이 (PC → 메인)
+            response_lengths: CMD → 응답 DATA FIELD 길이 (메인 → PC)
+            baudrate: 통신 속도
+            mode: MODE_STOP_AND_WAIT / MODE_WINDOWED
+            window: windowed 모드에서 응답을 기다릴 수 있는 최대 상태조회 수
+            target_load: 상태조회가 사용할 최대 링크 사용률 (나머지는 제어 명령용 여유)
+        """
+        self.request_lengths = request_lengths
+        self.response_lengths = response_lengths
+        self.baudrate = baudrate
+        self.mode = mode
+        self.window = window
+        self.target_load = target_load
+        
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._outstanding = deque()     # 응답 대기 [CMD, 전송 요청 시각(ns), 실제 전송 시각(ns) 또는 None]
+        self._srtt = {}                 # CMD → 평활 RTT (초)
+        self._rttvar = {}               # CMD → RTT 편차 (초)
+        self._responses = {}            # CMD → 최근 응답 시각(ns) deque
+        self._sent = {}                 # CMD → 전송 수
+        self._last_sent = {}            # CMD → 마지막 전송 시각(ns)
+        self._lost = {}                 # CMD → 응답 없음 수 (응답 제한 시간 초과 / 다른 응답 / 수신 끊김)
+        self._last_rx_ns = 0            # 마지막 바이트 수신 시각 (ns, on_rx)
+        self._answered_ns = 0           # 마지막으로 조회를 완료한 응답의 수신 시각 (ns)
+        self._unanswered = {}           # CMD → 보냈지만 아직 응답을 받지 않은 조회 수 (최대 window, 달성 주기 집계용)
+    
+    def wire_time(self, cmd):
+        """요청 + 응답 프레임 전송 시간 (초)"""
+        return self.request_time(cmd) + self.response_time(cmd)
+    
+    def request_time(self, cmd):
+        """요청 프레임 전송 시간 (초)"""
+        return (FRAME_OVERHEAD + self.request_lengths.get(cmd, 0)) * BITS_PER_BYTE / self.baudrate
+    
+    def response_time(self, cmd):
+        """응답 프레임 전송 시간 (초)"""
+        return (FRAME_OVERHEAD + self.response_lengths.get(cmd, 0)) * BITS_PER_BYTE / self.baudrate
+    
+    def rtt(self, cmd):
+        """왕복 시간 (초, 측정 전에는 전송 시간 + 응답 준비 시간 추정값)"""
+        srtt = self._srtt.get(cmd)
+        return srtt if srtt is not None else self.wire_time(cmd) + self.TURNAROUND
+    
+    def rto(self, cmd):
+        """응답 제한 시간 (초, 측정 전에는 추정 RTT의 3배)"""
+        srtt = self._srtt.get(cmd)
+        if srtt is None:
+            return max(self.MIN_RTO, 3 * self.rtt(cmd))
+        return max(self.MIN_RTO, srtt + 4 * self._rttvar[cmd])
+    
+    def quiet_time(self, cmd):
+        """
+        수신이 끊긴 뒤 응답 없음으로 판단할 시간 (초, 응답 프레임 1개 전송 시간 + 응답 준비 시간)
+        응답을 받아 RTT를 측정한 CMD는 측정한 응답 제한 시간 이상 (응답 준비가 느린 메인에서 잘못 판단하지 않도록)
+        """
+        quiet = self.response_time(cmd) + self.TURNAROUND
+        srtt = self._srtt.get(cmd)
+        if srtt is not None:
+            quiet = max(quiet, srtt + 4 * self._rttvar[cmd])
+        return quiet
+    
+    def safe_rates(self, ceilings):
+        """
+        상한 주기를 넘지 않는 안전한 CMD별 조회 주기
+        
+        Args:
+            ceilings: CMD → 상한 주기 (Hz, 0이면 조회 안 함)
+        
+        Returns:
+            dict: CMD → 주기 (Hz), 링크가 부족하면 상한 비율을 유지한 채 같은 배율로 낮춤
+        """
+        with self._lock:
+            active = {cmd: rate for cmd, rate in ceilings.items() if rate > 0}
+            if self.mode == MODE_STOP_AND_WAIT:
+                load = sum(rate * self.rtt(cmd) for cmd, rate in active.items())
+            else:
+                load = sum(rate * self.wire_time(cmd) for cmd, rate in active.items())
+        
+        scale = min(1.0, self.target_load / load) if load > 0 else 1.0
+        return {cmd: (rate * scale if rate > 0 else 0.0) for cmd, rate in ceilings.items()}
+    
+    def try_acquire(self, cmd):
+        """
+        상태조회 전송 가능 여부 확인 후 응답 대기 목록에 추가 (heartbeat 스레드에서 호출)
+        
+        Returns:
+            bool: 전송 가능하면 True (응답 대기 등록됨), 응답 대기 중인 조회가 가득 찼으면 False
+        """
+        now = time.monotonic_ns()
+        with self._lock:
+            self._expire_locked(now)
+            limit = 1 if self.mode == MODE_STOP_AND_WAIT else max(1, self.window)
+            if len(self._outstanding) >= limit:
+                return False
+            self._outstanding.append([cmd, now, None])
+            return True
+    
+    def release(self, cmd):
+        """
+        보내지 못한 상태조회의 응답 대기 해제 (송신 대기열에 추가하지 못했거나 마감 시각이 지나 버린 경우)
+        응답 없음으로 집계하지 않음
+        """
+        with self._lock:
+            for entry in self._outstanding:
+                if entry[0] == cmd and entry[2] is None:
+                    self._outstanding.remove(entry)
+                    break
+            else:
+                return
+        self._event.set()
+    
+    def on_sent(self, cmd, sent_ns):
+        """상태조회 실제 전송 시각 기록 (송신 스레드에서 호출)"""
+        with self._lock:
+            for entry in self._outstanding:
+                if entry[0] == cmd and entry[2] is None:
+                    entry[2] = sent_ns
+                    break
+            self._sent[cmd] = self._sent.get(cmd, 0) + 1
+            self._last_sent[cmd] = sent_ns
+            self._unanswered[cmd] = min(self._unanswered.get(cmd, 0) + 1, max(1, self.window))
+    
+    def on_rx(self, arrival_ns):
+        """바이트 수신 시각 기록 (수신 스레드 / 리액터에서 읽을 때마다 호출, 수신 끊김 판단용)"""
+        self._last_rx_ns = arrival_ns
+    
+    def on_response(self, cmd, received_ns):
+        """
+        상태응답 수신 (수신 스레드에서 호출) - 가장 먼저 보낸 같은 CMD 조회의 RTT 측정
+        달성 주기는 보낸 같은 CMD 조회에 대한 응답만 집계 (B3에 대한 F1 응답 등 조회가 아닌 응답 제외)
+        같은 CMD 조회보다 먼저 보낸 조회, 같은 CMD 조회가 없으면 가장 먼저 보낸 조회는 응답 없음으로 처리
+        (가장 먼저 보낸 조회는 요청 + 이 응답 전송 시간 이후에 받은 경우만, 앞서 응답 없음으로 처리한 조회의
+         늦은 응답으로 다음 조회를 완료하지 않도록)
+        """
+        with self._lock:
+            if self._unanswered.get(cmd):
+                self._unanswered[cmd] -= 1
+                responses = self._responses.get(cmd)
+                if responses is None:
+                    responses = self._responses[cmd] = deque()
+                responses.append(received_ns)
+                self._trim_locked(responses, received_ns)
+            
+            matched = None
+            for entry in self._outstanding:
+                if entry[0] == cmd:
+                    matched = entry
+                    break
+            if matched is not None:
+                # 메인은 요청 순서대로 응답하므로 앞서 보낸 조회의 응답은 오지 않음
+                while self._outstanding[0] is not matched:
+                    self._lose_locked(self._outstanding[0])
+                self._outstanding.popleft()
+                self._answered_ns = received_ns
+                if matched[2] is not None:
+                    self._update_rtt_locked(cmd, (received_ns - matched[2]) / 1e9)
+            elif self._outstanding and self._outstanding[0][2] is not None:
+                head_cmd, _, written = self._outstanding[0]
+                if received_ns - written >= (self.request_time(head_cmd) + self.response_time(cmd)) * 1e9:
+                    # 이미 보낸 조회에 다른 CMD로 응답 (F2 → F0 등) - 해당 조회는 응답 없음
+                    self._lose_locked(self._outstanding[0])
+                    self._answered_ns = received_ns
+            self._expire_locked(received_ns)
+        self._event.set()
+    
+    def next_expiry(self):
+        """가장 먼저 응답 없음으로 판단할 시각 (time.monotonic 기준, 응답 대기 없으면 None)"""
+        now = time.monotonic_ns()
+        with self._lock:
+            self._expire_locked(now)
+            if not self._outstanding:
+                return None
+            return min(self._deadline_locked(entry) for entry in self._outstanding) / 1e9
+    
+    def quiet_at(self):
+        """이미 보낸 상태조회의 응답이 더 올 수 있는 마지막 시각 (time.monotonic 기준, 보낸 적 없으면 0.0)"""
+        with self._lock:
+            return max((sent_ns / 1e9 + self.rto(cmd) for cmd, sent_ns in self._last_sent.items()), default=0.0)
+    
+    def wait(self, timeout):
+        """응답 수신 또는 timeout(초)까지 대기 (heartbeat 스레드의 sleep 대신 사용)"""
+        self._event.wait(timeout)
+        self._event.clear()
+    
+    def reset(self):
+        """응답 대기 목록 초기화 (연결 / 상태조회 재개 시, RTT 측정값은 유지)"""
+        with self._lock:
+            self._outstanding.clear()
+            self._unanswered.clear()
+        self._event.set()
+    
+    def achieved_rate(self, cmd):
+        """최근 RATE_WINDOW초 동안의 실제 응답 주기 (Hz)"""
+        with self._lock:
+            responses = self._responses.get(cmd)
+            if not responses:
+                return 0.0
+            self._trim_locked(responses, time.monotonic_ns())
+            return len(responses) / self.RATE_WINDOW
+    
+    def _trim_locked(self, responses, now_ns):
+        """RATE_WINDOW보다 오래된 응답 시각 제거"""
+        limit = now_ns - int(self.RATE_WINDOW * 1e9)
+        while responses and responses[0] < limit:
+            responses.popleft()
+    
+    def _deadline_locked(self, entry):
+        """
+        조회를 응답 없음으로 판단할 시각 (ns)
+        보낸 시각 + 응답 제한 시간, 요청 전송이 끝난 뒤 응답으로 처리되지 않은 바이트를 받았으면
+        마지막 수신 + quiet_time 중 빠른 시각
+        """
+        cmd, requested, written = entry
+        deadline = (written or requested) + int(self.rto(cmd) * 1e9)
+        if written is not None:
+            heard_after = max(written + int(self.request_time(cmd) * 1e9), self._answered_ns)
+            if self._last_rx_ns > heard_after:
+                deadline = min(deadline, self._last_rx_ns + int(self.quiet_time(cmd) * 1e9))
+        return deadline
+    
+    def _expire_locked(self, now_ns):
+        """응답 없음으로 판단할 시각이 지난 조회를 응답 대기 목록에서 제거 (응답 없음으로 집계)"""
+        for entry in list(self._outstanding):
+            if now_ns >= self._deadline_locked(entry):
+                self._lose_locked(entry)
+    
+    def _lose_locked(self, entry):
+        """조회를 응답 대기 목록에서 제거하고 응답 없음으로 집계"""
+        self._outstanding.remove(entry)
+        self._lost[entry[0]] = self._lost.get(entry[0], 0) + 1
+    
+    def _update_rtt_locked(self, cmd, sample):
+        """RTT 측정값 반영 (SRTT: 1/8, RTTVAR: 1/4 가중 평균)"""
+        srtt = self._srtt.get(cmd)
+        if srtt is None:
+            self._srtt[cmd] = sample
+            self._rttvar[cmd] = sample / 2
+        else:
+            self._rttvar[cmd] = 0.75 * self._rttvar[cmd] + 0.25 * abs(srtt - sample)
+            self._srtt[cmd] = 0.875 * srtt + 0.125 * sample
+    
+    def get_stats(self, ceilings):
+        """
+        CMD별 상태조회 통계
+        
+        Args:
+            ceilings: CMD → 상한 주기 (Hz)
+        
+        Returns:
+            dict: {CMD: {'ceiling', 'rate'(계산된 안전 주기), 'achieved'(실제 응답 주기), 'rtt_ms',
+                         'rttvar_ms', 'wire_ms', 'sent', 'lost'}}
+        """
+        rates = self.safe_rates(ceilings)
+        stats = {}
+        for cmd, ceiling in ceilings.items():
+            achieved = self.achieved_rate(cmd)
+            with self._lock:
+                stats[cmd] = {
+                    'ceiling': ceiling,
+                    'rate': rates[cmd],
+                    'achieved': achieved,
+                    'rtt_ms': self.rtt(cmd) * 1000,
+                    'rttvar_ms': self._rttvar.get(cmd, 0.0) * 1000,
+                    'wire_ms': self.wire_time(cmd) * 1000,
+                    'sent': self._sent.get(cmd, 0),
+                    'lost': self._lost.get(cmd, 0)
+                }
+        return stats
@@ -0,0 +1,258 @@
+"""
+시리얼 포트 핫플러그 감시 모듈
+포트 목록을 필요할 때마다 serial.tools.list_ports.comports()로 조회하는 대신 백그라운드 스레드가
+포트 목록(PortInfo)을 캐시해 두고, 바뀐 포트만 비교해서 추가 / 제거 이벤트를 알립니다.
+포트를 열어 보지 않으므로 UI 스레드를 막거나 이미 동작 중인 보드를 방해하지 않습니다.
+
+- Linux: /sys/class/tty 항목 목록(이름 + inode)만 주기적으로 비교하고, 새로 나타난 포트만 sysfs에서 VID / PID / 시리얼 번호를 읽음
+  (실제 장치가 없는 레거시 ttyS 등 platform 장치는 comports()와 같이 제외)
+- 그 외 OS (Windows 등): comports() 결과를 주기적으로 비교
+- 장비 식별: PortInfo.key (USB 시리얼 번호가 있으면 (VID, PID, 시리얼 번호), 없으면 장치 경로)
+  → 다시 꽂아서 /dev/ttyUSB0이 /dev/ttyUSB1로 바뀌어도 같은 장비로 찾을 수 있음
+- 이벤트: add_listener(함수)로 등록, 함수(kind, PortInfo)를 감시 스레드에서 호출 (kind: 'ADDED' / 'REMOVED')
+
+사용 예:
+    watcher = PortWatcher()
+    watcher.add_listener(lambda kind, port: print(kind, port.device))
+    watcher.start()
+    port = watcher.find(vid=0x0403, pid=0x6001, serial_number='A12345')
+"""
+import os
+import sys
+import threading
+
+import serial.tools.list_ports
+
+
+SYSFS_TTY = '/sys/class/tty'
+
+PORT_ADDED = 'ADDED'
+PORT_REMOVED = 'REMOVED'
+
+
+class PortInfo:
+    """시리얼 포트 정보 (포트 목록 캐시 항목)"""
+    
+    __slots__ = ('device', 'vid', 'pid', 'serial_number', 'manufacturer', 'product', 'location', 'description')
+    
+    def __init__(self, device, vid=None, pid=None, serial_number=None, manufacturer=None, product=None,
+                 location=None, description=None):
+        self.device = device
+        self.vid = vid
+        self.pid = pid
+        self.serial_number = serial_number
+        self.manufacturer = manufacturer
+        self.product = product
+        self.location = location
+        self.description = description or product or os.path.basename(device)
+    
+    @property
+    def key(self):
+        """장비 식별 키 (USB 시리얼 번호가 있으면 (VID, PID, 시리얼 번호), 없으면 장치 경로)"""
+        if self.serial_number:
+            return (self.vid, self.pid, self.serial_number)
+        return self.device
+    
+    def matches(self, vid=None, pid=None, serial_number=None, device=None):
+        """지정한 조건(None은 무시)과 모두 같으면 True"""
+        return ((vid is None or self.vid == vid) and (pid is None or self.pid == pid)
+                and (serial_number is None or self.serial_number == serial_number)
+                and (device is None or self.device == device))
+    
+    def label(self):
+        """포트 선택 목록 표시용 문자열 ('COM3 - 설명', SerialCommunication.connect에 그대로 전달 가능)"""
+        return f"{self.device} - {self.description}"
+    
+    def __repr__(self):
+        usb = f", {self.vid:04X}:{self.pid:04X}" if self.vid is not None and self.pid is not None else ""
+        serial_number = f", SN={self.serial_number}" if self.serial_number else ""
+        return f"PortInfo({self.device}{usb}{serial_number})"
+
+
+def _read_attr(path, name):
+    """sysfs 속성 파일 읽기 (없으면 None)"""
+    try:
+        with open(os.path.join(path, name)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _sysfs_port(name):
+    """
+    /sys/class/tty/<name> 항목의 PortInfo (실제 장치가 없는 tty / platform 장치이면 None)
+    """
+    device_link = os.path.join(SYSFS_TTY, name, 'device')
+    if not os.path.exists(device_link):
+        return None     # 가상 터미널 (tty0, ptmx 등)
+    device_path = os.path.realpath(device_link)
+    subsystem = os.path.basename(os.path.realpath(os.path.join(device_path, 'subsystem')))
+    if subsystem == 'platform':
+        return None     # 레거시 ttyS (comports()와 같이 제외)
+    
+    info = PortInfo(f"/dev/{name}")
+    if subsystem in ('usb', 'usb-serial'):
+        # 인터페이스 → USB 장치 디렉터리 (idVendor가 있는 상위 디렉터리)
+        path = device_path
+        while path != '/' and not os.path.exists(os.path.join(path, 'idVendor')):
+            path = os.path.dirname(path)
+        if path != '/':
+            vid = _read_attr(path, 'idVendor')
+            pid = _read_attr(path, 'idProduct')
+            info.vid = int(vid, 16) if vid else None
+            info.pid = int(pid, 16) if pid else None
+            info.serial_number = _read_attr(path, 'serial')
+            info.manufacturer = _read_attr(path, 'manufacturer')
+            info.product = _read_attr(path, 'product')
+            info.location = os.path.basename(path)
+            info.description = info.product or info.description
+    return info
+
+
+def _sysfs_names():
+    """/sys/class/tty 항목 이름 목록 (sysfs가 없으면 None)"""
+    try:
+        return os.listdir(SYSFS_TTY)
+    except OSError:
+        return None
+
+
+def _comports():
+    """serial.tools.list_ports.comports() 결과를 PortInfo 목록으로 변환"""
+    return [PortInfo(port.device, port.vid, port.pid, port.serial_number, port.manufacturer, port.product,
+                     port.location, port.description)
+            for port in serial.tools.list_ports.comports()]
+
+
+def scan_ports():
+    """현재 포트 목록 1회 조회 (감시 스레드 없이 사용, Linux는 sysfs, 그 외는 comports())"""
+    names = _sysfs_names() if sys.platform.startswith('linux') else None
+    if names is None:
+        return _comports()
+    return [info for info in map(_sysfs_port, sorted(names)) if info is not None]
+
+
+class PortWatcher:
+    """백그라운드 포트 목록 감시 (캐시 + 추가 / 제거 이벤트)"""
+    
+    def __init__(self, interval=1.0):
+        """
+        Args:
+            interval: 포트 목록 비교 간격 (초)
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()  # 감시 스레드 / rescan 동시 비교 방지
+        self._ports = {}            # 장치 경로 → PortInfo
+        self._sysfs_seen = {}       # sysfs 항목 이름 → (inode, PortInfo 또는 None) (None: 실제 포트 아님, 다시 읽지 않음)
+        self._use_sysfs = sys.platform.startswith('linux') and _sysfs_names() is not None
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+        
+        # 통계
+        self.scan_count = 0         # 비교 횟수
+        self.change_count = 0       # 추가 / 제거 이벤트 수
+    
+    def add_listener(self, listener):
+        """추가 / 제거 이벤트 함수 등록 (listener(kind, PortInfo), 감시 스레드 또는 rescan 호출 스레드에서 호출)"""
+        with self._lock:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        """이벤트 함수 등록 해제"""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+    
+    def start(self):
+        """첫 목록을 읽고 감시 스레드 시작 (첫 목록은 이벤트 없이 캐시에만 저장)"""
+        if self._thread is not None:
+            return
+        self._scan(notify=False)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch_worker, name='PortWatcher', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """감시 스레드 종료"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+    
+    def rescan(self):
+        """지금 바로 목록 비교 (새로고침 버튼 등, 바뀐 포트는 이벤트로 알림)"""
+        self._scan(notify=True)
+    
+    def ports(self):
+        """캐시된 포트 목록 (장치 경로 순, 조회하지 않음)"""
+        with self._lock:
+            return [self._ports[device] for device in sorted(self._ports)]
+    
+    def get(self, device):
+        """장치 경로의 PortInfo (없으면 None)"""
+        with self._lock:
+            return self._ports.get(device)
+    
+    def find(self, vid=None, pid=None, serial_number=None):
+        """조건에 맞는 첫 포트 (없으면 None, PortInfo.matches 참고)"""
+        for info in self.ports():
+            if info.matches(vid, pid, serial_number):
+                return info
+        return None
+    
+    def _watch_worker(self):
+        """감시 스레드 (interval마다 목록 비교)"""
+        while not self._stop.wait(self.interval):
+            try:
+                self._scan(notify=True)
+            except Exception:
+                pass    # 일시적인 sysfs / 드라이버 오류는 다음 비교에서 다시 확인
+    
+    def _scan(self, notify):
+        """현재 목록과 캐시를 비교해서 갱신 (notify이면 바뀐 포트를 이벤트로 알림)"""
+        with self._scan_lock:
+            self._scan_locked(notify)
+    
+    def _scan_locked(self, notify):
+        if self._use_sysfs:
+            current = self._scan_sysfs()
+        else:
+            current = {info.device: info for info in _comports()}
+        
+        with self._lock:
+            self.scan_count += 1
+            removed = [info for device, info in self._ports.items() if device not in current]
+            added = [info for device, info in current.items() if device not in self._ports]
+            # 같은 경로에 다른 장비가 다시 꽂힌 경우 (비교 간격 안에 분리 → 연결)
+            for device, info in current.items():
+                old = self._ports.get(device)
+                if old is not None and old.key != info.key:
+                    removed.append(old)
+                    added.append(info)
+            self._ports = current
+            self.change_count += len(added) + len(removed)
+            listeners = list(self._listeners) if notify else []
+        
+        for listener in listeners:
+            for info in removed:
+                listener(PORT_REMOVED, info)
+            for info in added:
+                listener(PORT_ADDED, info)
+    
+    def _scan_sysfs(self):
+        """sysfs 항목 이름 / inode만 비교하고 새 항목(비교 간격 안에 다시 꽂힌 항목 포함)만 속성을 읽음"""
+        seen = {}
+        for name in _sysfs_names() or []:
+            try:
+                inode = os.lstat(os.path.join(SYSFS_TTY, name)).st_ino
+            except OSError:
+                continue    # 읽는 사이에 제거됨
+            cached = self._sysfs_seen.get(name)
+            if cached is not None and cached[0] == inode:
+                seen[name] = cached
+            else:
+                seen[name] = (inode, _sysfs_port(name))
+        self._sysfs_seen = seen
+        return {info.device: info for _, info in seen.values() if info is not None}
@@ -0,0 +1,342 @@
+"""
+PC연동 프로토콜 사양서(Excel) → 프로토콜 정의 모듈(protocol_spec.py) 생성기
+사양서 워크북(Doc/1. 프로토콜/PC연동_프로토콜_V*.xlsx)에서 CMD별 DATA FIELD 길이와
+상태조회(CMD 0xF0 / 0xF1 / 0xF2) 필드 목록을 읽어 protocol_spec.py로 출력합니다.
+프로그램 실행 시에는 생성된 protocol_spec.py만 import하므로 openpyxl이 필요 없습니다.
+
+실행:
+    py protocol_codegen.py                  # 최신 버전 사양서로 protocol_spec.py 재생성
+    py protocol_codegen.py 사양서.xlsx       # 지정한 사양서로 재생성
+    py protocol_codegen.py --check          # 사양서 / protocol_spec.py / status_schema.py 불일치 점검
+"""
+import glob
+import hashlib
+import os
+import re
+import sys
+from collections import namedtuple
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SPEC_DIR = os.path.join(BASE_DIR, '..', 'Doc', '1. 프로토콜')
+SPEC_PATTERN = 'PC연동_프로토콜_V*.xlsx'
+OUTPUT_PATH = os.path.join(BASE_DIR, 'protocol_spec.py')
+
+CMD_SHEET_TITLE = '2. CMD의 구성'                 # CMD 구성표가 있는 시트의 제목 셀
+STATUS_SHEET_PATTERN = re.compile(r'CMD\s*0x([0-9A-Fa-f]{2})')
+CMD_PATTERN = re.compile(r'^0x([0-9A-Fa-f]{2})$')
+ENUM_PATTERN = re.compile(r'^\s*(\d+)\s*:\s*(.+?)\s*$')
+HIGH_PATTERN = re.compile(r'HIGH|High|상위')
+LOW_PATTERN = re.compile(r'LOW|Low|하위')
+
+# 사양서에 없지만 코드에서 사용하는 CMD (PC → MAIN DATA FIELD 길이)
+EXTRA_CMD_LENGTHS = {
+    0xC0: (7, '센서값 변경 (개발용, 사양서 미기재)'),
+}
+
+# 사양서와 다르게 구현된 것이 확인된 항목 (CMD, 오프셋(길이는 None), 'scale' / 'length' / 'field') → 사유
+# --check에서 불일치로 보고하지 않습니다.
+KNOWN_DEVIATIONS = {
+    **{(0xF0, offset, 'scale'): '펌웨어가 센서 온도를 1℃ 단위로 송신 (사양서: 0.1℃ 단위)'
+       for offset in range(7)},
+    (0xF2, None, 'length'): '사양서 F2 시트 미작성 - 펌웨어 F2_HEATING_SYSTEM_DATA_FIELD(1바이트) 기준',
+    (0xF2, 0, 'field'): '사양서 F2 시트 미작성 - 펌웨어 u8HeatingOpStatus 기준',
+}
+
+# 사양서 필드 정보
+#   offset: DATA FIELD 내 시작 인덱스 (0부터)
+#   width: 바이트 수 (HIGH/LOW 행이 연속이면 2)
+#   label: 항목명
+#   description: 설명 (단위, 값 목록)
+#   category: 분류
+#   scale: 0.1℃ 단위 항목이면 10, 그 외 None
+#   enum: 값 목록 {값: 설명} (없으면 None)
+SpecField = namedtuple('SpecField', ['offset', 'width', 'label', 'description', 'category', 'scale', 'enum'])
+
+
+def _text(value):
+    """셀 값을 한 줄 문자열로 정리 (None이면 '')"""
+    if value is None:
+        return ''
+    return ' '.join(str(value).split())
+
+
+def find_latest_spec(spec_dir=SPEC_DIR):
+    """사양서 폴더에서 버전(V번호), 날짜 순으로 가장 최신 워크북 경로 반환 (없으면 None)"""
+    candidates = []
+    for path in glob.glob(os.path.join(spec_dir, SPEC_PATTERN)):
+        name = os.path.basename(path)
+        if name.startswith('~$'):       # Excel 임시 파일
+            continue
+        match = re.search(r'_V(\d+)_(\d+)\.xlsx$', name)
+        if match:
+            candidates.append(((int(match.group(1)), match.group(2)), path))
+    return max(candidates)[1] if candidates else None
+
+
+def file_digest(path):
+    """워크북 파일의 SHA-256 (생성물이 최신인지 확인용)"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _parse_enum(description):
+    """'0 : 냉각\\n1 : 제빙' 형식 설명을 {0: '냉각', 1: '제빙'}으로 변환 (값 목록이 아니면 None)"""
+    enum = {}
+    for line in str(description or '').splitlines():
+        match = ENUM_PATTERN.match(line)
+        if not match:
+            return None
+        enum[int(match.group(1))] = match.group(2)
+    return enum or None
+
+
+def read_status_fields(sheet):
+    """
+    상태조회 시트에서 필드 목록 읽기
+    4행부터 B열: DATAFIELD 번호(1부터), C열: 항목명, D열: 설명, E열: 분류
+    설명/분류가 병합 셀이면 값이 첫 행에만 있으므로 빈 셀은 윗 행 값을 이어받습니다.
+    
+    Returns:
+        tuple: (DATA FIELD 길이, SpecField 목록 (Reserved 제외))
+    """
+    rows = []
+    description = None
+    category = ''
+    for index, label, text, group in sheet.iter_rows(min_row=4, min_col=2, max_col=5, values_only=True):
+        if not isinstance(index, int):
+            break
+        if text is not None:
+            description = None if str(text).strip() == '-' else text
+        if group:
+            category = _text(group)
+        rows.append((index, _text(label), description, category))
+    
+    fields = []
+    position = 0
+    while position < len(rows):
+        index, label, description, category = rows[position]
+        width = 1
+        if (HIGH_PATTERN.search(label) and position + 1 < len(rows)
+                and LOW_PATTERN.search(rows[position + 1][1])):
+            width = 2
+        
+        if label and label != 'Reserved':
+            text = str(description or '').strip()
+            fields.append(SpecField(
+                offset=index - 1,
+                width=width,
+                label=HIGH_PATTERN.sub('', label).replace('[]', '').strip() if width == 2 else label,
+                description=_text(text),
+                category=category,
+                scale=10 if '0.1℃' in text else None,
+                enum=_parse_enum(text)
+            ))
+        position += width
+    
+    return len(rows), fields
+
+
+def read_spec(path):
+    """
+    사양서 워크북 읽기
+    
+    Returns:
+        dict: {'source', 'version', 'digest', 'cmd_lengths', 'response_lengths', 'status_fields'}
+    """
+    import openpyxl     # 코드 생성 / 점검 시에만 필요
+    
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        # 상태조회 시트 (시트 이름의 CMD 사용, 시트 내 CMD 셀은 복사 오류가 있어 사용하지 않음)
+        status_fields = {}
+        response_lengths = {}
+        for name in workbook.sheetnames:
+            match = STATUS_SHEET_PATTERN.search(name)
+            if match:
+                cmd = int(match.group(1), 16)
+                response_lengths[cmd], status_fields[cmd] = read_status_fields(workbook[name])
+        
+        # CMD 구성표: 항목 행(C: 이름, D: 길이) 바로 아래 행의 C열에 CMD 값
+        cmd_lengths = {}
+        for name in workbook.sheetnames:
+            rows = list(workbook[name].iter_rows(min_col=2, max_col=4, values_only=True))
+            if not any(_text(row[0]) == CMD_SHEET_TITLE for row in rows):
+                continue
+            for previous, row in zip(rows, rows[1:]):
+                match = CMD_PATTERN.match(_text(row[1]))
+                if not match or not isinstance(previous[2], int):
+                    continue
+                label = _text(previous[1])
+                if _text(previous[0]) == 'POLLING':
+                    # 상태조회(POLLING)는 상태조회 시트의 CMD 전체에 적용
+                    for cmd in status_fields:
+                        cmd_lengths[cmd] = (previous[2], f'{label} - 응답 {response_lengths[cmd]}바이트')
+                else:
+                    cmd_lengths[int(match.group(1), 16)] = (previous[2], label)
+            break
+    finally:
+        workbook.close()
+    
+    if not cmd_lengths:
+        raise ValueError(f"CMD 구성표('{CMD_SHEET_TITLE}')를 찾을 수 없습니다: {path}")
+    
+    version = re.search(r'_V(\d+)_(\d+)', os.path.basename(path))
+    return {
+        'source': os.path.basename(path),
+        'version': f'V{version.group(1)}_{version.group(2)}' if version else '',
+        'digest': file_digest(path),
+        'cmd_lengths': cmd_lengths,
+        'response_lengths': response_lengths,
+        'status_fields': status_fields,
+    }
+
+
+def render(spec):
+    """사양서 정보를 protocol_spec.py 소스로 변환"""
+    lines = [
+        '"""',
+        'PC연동 프로토콜 정의 - protocol_codegen.py로 자동 생성된 파일입니다. 직접 수정하지 마세요.',
+        f'원본: {spec["source"]}',
+        '재생성: py protocol_codegen.py / 점검: py protocol_codegen.py --check',
+        '"""',
+        'from collections import namedtuple',
+        '',
+        '',
+        f'SPEC_SOURCE = {spec["source"]!r}',
+        f'SPEC_VERSION = {spec["version"]!r}',
+        f'SPEC_DIGEST = {spec["digest"]!r}',
+        '',
+        '# CMD와 DATA FIELD LENGTH 매핑 (PC → MAIN)',
+        'CMD_LENGTH_MAP = {',
+    ]
+    cmd_lengths = dict(spec['cmd_lengths'])
+    for cmd, entry in EXTRA_CMD_LENGTHS.items():
+        cmd_lengths.setdefault(cmd, entry)
+    for cmd in sorted(cmd_lengths, key=lambda c: (c < 0xF0, c)):
+        length, label = cmd_lengths[cmd]
+        lines.append(f'    0x{cmd:02X}: {length},  # {label}')
+    lines += [
+        '}',
+        '',
+        '# 상태응답 DATA FIELD LENGTH (MAIN → PC)',
+        'RESPONSE_LENGTH_MAP = {',
+    ]
+    for cmd in sorted(spec['response_lengths']):
+        lines.append(f'    0x{cmd:02X}: {spec["response_lengths"][cmd]},')
+    lines += [
+        '}',
+        '',
+        '# 상태응답 필드 (Reserved 제외)',
+        "SpecField = namedtuple('SpecField', " + repr(list(SpecField._fields)) + ')',
+        '',
+        'STATUS_FIELDS = {',
+    ]
+    for cmd in sorted(spec['status_fields']):
+        lines.append(f'    0x{cmd:02X}: (')
+        for field in spec['status_fields'][cmd]:
+            lines.append(f'        SpecField{tuple(field)!r},')
+        lines.append('    ),')
+    lines += ['}', '']
+    return '\n'.join(lines)
+
+
+def generate(path=None, output=OUTPUT_PATH):
+    """사양서를 읽어 protocol_spec.py 생성, 생성에 사용한 사양서 정보 반환"""
+    path = path or find_latest_spec()
+    if not path:
+        raise FileNotFoundError(f"사양서 워크북을 찾을 수 없습니다: {os.path.join(SPEC_DIR, SPEC_PATTERN)}")
+    spec = read_spec(path)
+    with open(output, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(render(spec))
+    return spec
+
+
+def schema_drift(schema, fields, response_length):
+    """
+    status_schema의 StatusSchema와 사양서 필드 목록 비교
+    
+    Args:
+        schema: StatusSchema
+        fields: SpecField 목록
+        response_length: 사양서의 DATA FIELD 길이
+    
+    Returns:
+        list: 불일치 설명 문자열 목록 (KNOWN_DEVIATIONS 항목 제외)
+    """
+    problems = []
+    cmd = schema.cmd
+    if schema.data_length != response_length and (cmd, None, 'length') not in KNOWN_DEVIATIONS:
+        problems.append(f"CMD 0x{cmd:02X} DATA FIELD 길이: 코드 {schema.data_length}, 사양서 {response_length}")
+    
+    by_offset = {field.offset: SpecField(*field) for field in fields}
+    for field in schema.fields:
+        name = '.'.join(str(key) for key in field.path)
+        where = f"CMD 0x{cmd:02X} DATA{field.offset + 1} ({name})"
+        spec = by_offset.get(field.offset)
+        if spec is None:
+            if (cmd, field.offset, 'field') in KNOWN_DEVIATIONS:
+                continue
+            problems.append(f"{where}: 사양서에서 Reserved 또는 다른 필드의 일부")
+            continue
+        if spec.width != field.width:
+            problems.append(f"{where}: 길이 코드 {field.width}바이트, 사양서 {spec.width}바이트 ({spec.label})")
+        if spec.scale != field.scale and not (spec.scale is None and field.scale in (None, 1.0)):
+            if (cmd, field.offset, 'scale') not in KNOWN_DEVIATIONS:
+                problems.append(f"{where}: 스케일 코드 {field.scale}, 사양서 {spec.scale} ({spec.description})")
+        if field.enum is not None and spec.enum is not None:
+            missing = set(field.enum) - set(spec.enum)
+            if missing:
+                problems.append(f"{where}: 사양서에 없는 값 {sorted(missing)} ({spec.description})")
+    return problems
+
+
+def check(path=None):
+    """
+    사양서 / protocol_spec.py / status_schema.py 불일치 점검
+    
+    Returns:
+        list: 불일치 설명 문자열 목록 (비어 있으면 일치)
+    """
+    path = path or find_latest_spec()
+    if not path:
+        raise FileNotFoundError(f"사양서 워크북을 찾을 수 없습니다: {os.path.join(SPEC_DIR, SPEC_PATTERN)}")
+    spec = read_spec(path)
+    problems = []
+    
+    # 1. 생성물이 사양서와 같은지 (사양서 수정 후 재생성 누락)
+    try:
+        with open(OUTPUT_PATH, encoding='utf-8') as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+    if current != render(spec):
+        problems.append(f"protocol_spec.py가 사양서({spec['source']})와 다릅니다 - py protocol_codegen.py로 재생성 필요")
+    
+    # 2. 코드의 필드 스키마가 사양서와 같은지
+    from status_schema import SCHEMAS
+    for cmd, schema in sorted(SCHEMAS.items()):
+        if cmd not in spec['status_fields']:
+            problems.append(f"CMD 0x{cmd:02X}: 사양서에 상태조회 시트가 없습니다")
+            continue
+        problems += schema_drift(schema, spec['status_fields'][cmd], spec['response_lengths'][cmd])
+    
+    return problems
+
+
+# 독립 실행용
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != '--check']
+    spec_path = args[0] if args else None
+    
+    if '--check' in sys.argv[1:]:
+        drift = check(spec_path)
+        for line in drift:
+            print(f"[불일치] {line}")
+        print("사양서와 코드가 일치합니다." if not drift else f"불일치 {len(drift)}건")
+        sys.exit(1 if drift else 0)
+    
+    result = generate(spec_path)
+    print(f"{result['source']} → {OUTPUT_PATH}")
+    for cmd, (length, label) in sorted(result['cmd_lengths'].items()):
+        print(f"  CMD 0x{cmd:02X}: {length}바이트 ({label})")
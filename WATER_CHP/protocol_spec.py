@@ -0,0 +1,105 @@
+"""
+PC연동 프로토콜 정의 - protocol_codegen.py로 자동 생성된 파일입니다. 직접 수정하지 마세요.
+원본: PC연동_프로토콜_V4_251114.xlsx
+재생성: py protocol_codegen.py / 점검: py protocol_codegen.py --check
+"""
+from collections import namedtuple
+
+
+SPEC_SOURCE = 'PC연동_프로토콜_V4_251114.xlsx'
+SPEC_VERSION = 'V4_251114'
+SPEC_DIGEST = 'bb14ca90af84e4dc982a9d120ced28476d570e5ec016bea928233e84b2f68550'
+
+# CMD와 DATA FIELD LENGTH 매핑 (PC → MAIN)
+CMD_LENGTH_MAP = {
+    0xF0: 0,  # 상태조회 (PC → 메인) - 응답 40바이트
+    0xF1: 0,  # 상태조회 (PC → 메인) - 응답 76바이트
+    0xF2: 0,  # 상태조회 (PC → 메인) - 응답 0바이트
+    0xB1: 5,  # 냉각운전 변경 (PC → 메인)
+    0xB2: 5,  # 제빙운전 변경 (PC ↔ 메인)
+    0xB3: 93,  # 제빙테이블 적용 (PC ↔ 메인)
+    0xB4: 4,  # 보냉운전 변경 (PC ↔ 메인)
+    0xC0: 7,  # 센서값 변경 (개발용, 사양서 미기재)
+}
+
+# 상태응답 DATA FIELD LENGTH (MAIN → PC)
+RESPONSE_LENGTH_MAP = {
+    0xF0: 40,
+    0xF1: 76,
+    0xF2: 0,
+}
+
+# 상태응답 필드 (Reserved 제외)
+SpecField = namedtuple('SpecField', ['offset', 'width', 'label', 'description', 'category', 'scale', 'enum'])
+
+STATUS_FIELDS = {
+    0xF0: (
+        SpecField(0, 1, '외기온도 1', '0.1℃ 단위', '센서류', 10, None),
+        SpecField(1, 1, '입수온도', '0.1℃ 단위', '센서류', 10, None),
+        SpecField(2, 1, '정수온도', '0.1℃ 단위', '센서류', 10, None),
+        SpecField(3, 1, '외기온도 2', '0.1℃ 단위', '센서류', 10, None),
+        SpecField(4, 1, '냉수온도', '0.1℃ 단위', '센서류', 10, None),
+        SpecField(5, 1, '히터 내부온도', '0.1℃ 단위', '센서류', 10, None),
+        SpecField(6, 1, '온수 출수온도', '0.1℃ 단위', '센서류', 10, None),
+        SpecField(13, 1, '밸브 NOS 1 상태', '1 : CLOSE 0 : OPEN', '밸브 상태', None, {1: 'CLOSE', 0: 'OPEN'}),
+        SpecField(14, 1, '밸브 NOS 2 상태', '1 : CLOSE 0 : OPEN', '밸브 상태', None, {1: 'CLOSE', 0: 'OPEN'}),
+        SpecField(15, 1, '밸브 NOS 3 상태', '1 : CLOSE 0 : OPEN', '밸브 상태', None, {1: 'CLOSE', 0: 'OPEN'}),
+        SpecField(16, 1, '밸브 NOS 4 상태', '1 : CLOSE 0 : OPEN', '밸브 상태', None, {1: 'CLOSE', 0: 'OPEN'}),
+        SpecField(17, 1, '밸브 NOS 5 상태', '1 : CLOSE 0 : OPEN', '밸브 상태', None, {1: 'CLOSE', 0: 'OPEN'}),
+        SpecField(18, 1, '밸브 FEED 1 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(19, 1, '밸브 FEED 2 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(20, 1, '밸브 FEED 3 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(21, 1, '밸브 FEED 4 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(22, 1, '밸브 FEED 5 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(23, 1, '밸브 FEED 6 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(24, 1, '밸브 FEED 7 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(25, 1, '밸브 FEED 8 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(26, 1, '밸브 FEED 9 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(27, 1, '밸브 FEED 10 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(28, 1, '밸브 FEED 11 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(29, 1, '밸브 FEED 12 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(30, 1, '밸브 FEED 13 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(31, 1, '밸브 FEED 14 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(32, 1, '밸브 FEED 15 상태', '1 : OPEN 0 : CLOSE', '밸브 상태', None, {1: 'OPEN', 0: 'CLOSE'}),
+        SpecField(38, 1, '필터리드스위치', '1 : 감지 0 : 미감지', '리드스위치', None, {1: '감지', 0: '미감지'}),
+        SpecField(39, 1, '전면커버스위치', '1 : 감지 0 : 미감지', '리드스위치', None, {1: '감지', 0: '미감지'}),
+    ),
+    0xF1: (
+        SpecField(0, 1, '냉매전환밸브 1 현재위치', '0 : 냉각 1 : 제빙 2 : 핫가스 3 : 보냉', '공조시스템', None, {0: '냉각', 1: '제빙', 2: '핫가스', 3: '보냉'}),
+        SpecField(1, 1, '냉매전환밸브 2 현재위치 (병렬 구조)', '0 : 냉각 1 : 제빙 2 : 핫가스 3 : 보냉', '공조시스템', None, {0: '냉각', 1: '제빙', 2: '핫가스', 3: '보냉'}),
+        SpecField(2, 1, '압축기 출력상태', '1 : 가동 0 : 정지', '공조시스템', None, {1: '가동', 0: '정지'}),
+        SpecField(3, 2, '압축기 안정시간', '초 단위', '공조시스템', None, None),
+        SpecField(5, 1, '압축기 현재 RPS', '37 ~ 75', '공조시스템', None, None),
+        SpecField(6, 1, '압축기 에러코드', 'E81 ~ E88?', '공조시스템', None, None),
+        SpecField(7, 1, '압축기 팬 출력상태', '1 : 가동 0 : 정지', '공조시스템', None, {1: '가동', 0: '정지'}),
+        SpecField(8, 1, '얼음탱크 팬 출력상태', '1 : 가동 0 : 정지', '공조시스템', None, {1: '가동', 0: '정지'}),
+        SpecField(15, 1, '운전상태', '1 : 운전 0 : 정지', '냉각 데이터', None, {1: '운전', 0: '정지'}),
+        SpecField(16, 1, '초기 기동여부', '1 : 초기기동 0 : 일반기동', '냉각 데이터', None, {1: '초기기동', 0: '일반기동'}),
+        SpecField(17, 1, '냉각용 목표 RPS', '37 ~ 75', '냉각 데이터', None, None),
+        SpecField(18, 1, 'ON 온도', '0.1℃ 단위', '냉각 데이터', 10, None),
+        SpecField(19, 1, 'OFF 온도', '0.1℃ 단위', '냉각 데이터', 10, None),
+        SpecField(20, 2, '추가 기동시간', 'ms', '냉각 데이터', None, None),
+        SpecField(26, 1, '제빙 STEP', '0 : 더미탈빙 1 ~ : 제빙STEP', '제빙 데이터', None, None),
+        SpecField(27, 1, '제빙용 목표 RPS', '37 ~ 75', '제빙 데이터', None, None),
+        SpecField(28, 2, '제빙시간', '초 단위', '제빙 데이터', None, None),
+        SpecField(30, 2, '입수 용량', 'Hz', '제빙 데이터', None, None),
+        SpecField(32, 1, '스윙바 ON 시간', '0.1초 Ex) 6 : 0.6초', '제빙 데이터', None, None),
+        SpecField(33, 1, '스윙바 OFF 시간', '0.1초', '제빙 데이터', None, None),
+        SpecField(34, 1, '트레이 위치', '0 : 제빙 1 : 중간 2 : 탈빙', '제빙 데이터', None, {0: '제빙', 1: '중간', 2: '탈빙'}),
+        SpecField(35, 1, '얼음걸림 상태', '0 : 없음 1 : 걸림', '제빙 데이터', None, {0: '없음', 1: '걸림'}),
+        SpecField(38, 1, '필터리드스위치', '1 : 감지 0 : 미감지', '제빙 데이터', None, {1: '감지', 0: '미감지'}),
+        SpecField(39, 1, '전면커버스위치', '1 : 감지 0 : 미감지', '제빙 데이터', None, {1: '감지', 0: '미감지'}),
+        SpecField(46, 1, '보냉 STEP', '', '보냉 데이터', None, None),
+        SpecField(47, 1, '보냉용 목표 RPS', '37 ~ 75', '보냉 데이터', None, None),
+        SpecField(48, 1, '보냉 목표온도', '0.1℃ 단위', '보냉 데이터', 10, None),
+        SpecField(49, 1, '보냉 첫 목표온도', '0.1℃ 단위', '보냉 데이터', 10, None),
+        SpecField(50, 1, '보냉 트레이 위치', '0 : 제빙 1 : 중간 2 : 탈빙', '보냉 데이터', None, {0: '제빙', 1: '중간', 2: '탈빙'}),
+        SpecField(61, 1, '드레인탱크 저수위', '1 : 감지 0 : 미감지', '드레인 탱크', None, {1: '감지', 0: '미감지'}),
+        SpecField(62, 1, '드레인탱크 만수위', '1 : 감지 0 : 미감지', '드레인 탱크', None, {1: '감지', 0: '미감지'}),
+        SpecField(63, 1, '수위 상태', '0 : 없음 1 : 저수위 2 : 중수위 3 : 만수위 4 : 에러', '드레인 탱크', None, {0: '없음', 1: '저수위', 2: '중수위', 3: '만수위', 4: '에러'}),
+        SpecField(64, 1, '드레인 펌프 출력상태', '1 : 가동 0 : 정지', '드레인 탱크', None, {1: '가동', 0: '정지'}),
+        SpecField(70, 1, '얼음탱크 커버', '1 : 열림 0 : 닫힘', '기타', None, {1: '열림', 0: '닫힘'}),
+    ),
+    0xF2: (
+    ),
+}
@@ -0,0 +1,139 @@
+"""
+원시 바이트 캡처 모듈
+포트에서 읽은 / 포트에 쓴 바이트를 가공 없이 시각과 함께 바이너리 파일에 기록합니다.
+읽을 때마다 HEX 문자열을 만들어 'RAW_DATA' 이벤트로 보내던 방식을 대신하며,
+SerialCommunication.start_capture()로 켰을 때만 기록합니다 (꺼져 있으면 None 확인 1회).
+HEX 변환은 캡처 파일을 보는 쪽(read_capture / format_record / 명령줄 실행)에서만 합니다.
+
+파일 형식 (little-endian):
+    헤더: MAGIC(8바이트) + 시작 시각 monotonic_ns(int64) + 시작 시각 time.time()(double)
+    레코드: 시각 monotonic_ns(int64) + 방향(uint8, RX=0 / TX=1) + 길이(uint32) + 바이트
+
+사용 예:
+    comm.start_capture('capture.bin')
+    ...
+    comm.stop_capture()
+    py raw_capture.py capture.bin
+"""
+import argparse
+import struct
+import threading
+import time
+from datetime import datetime
+
+
+MAGIC = b'WCHPCAP1'
+HEADER = struct.Struct('<qd')
+RECORD = struct.Struct('<qBI')
+
+RX = 0
+TX = 1
+DIRECTION_NAMES = {RX: 'RX', TX: 'TX'}
+
+
+class RawCapture:
+    """원시 바이트 캡처 파일 (수신 스레드 / 송신 스레드에서 함께 기록)"""
+    
+    def __init__(self, path, max_bytes=None):
+        """
+        Args:
+            path: 캡처 파일 경로 (덮어씀)
+            max_bytes: 기록할 최대 바이트 수 (None이면 제한 없음, 넘으면 이후 데이터는 기록하지 않음)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+        self._file.write(HEADER.pack(time.monotonic_ns(), time.time()))
+        
+        # 통계
+        self.chunk_count = 0        # 기록한 덩어리 수
+        self.byte_count = {RX: 0, TX: 0}    # 방향별 기록한 바이트 수
+        self.skipped_bytes = 0      # max_bytes를 넘어 기록하지 않은 바이트 수
+    
+    @property
+    def closed(self):
+        return self._file is None
+    
+    def write(self, direction, data, timestamp_ns):
+        """
+        바이트 덩어리 기록
+        
+        Args:
+            direction: RX / TX
+            data: 바이트 (bytes / bytearray / memoryview, 호출 후 재사용되어도 됨)
+            timestamp_ns: 읽은 / 쓴 시각 (time.monotonic_ns)
+        """
+        length = len(data)
+        with self._lock:
+            if self._file is None:
+                return
+            if self.max_bytes is not None and self.byte_count[RX] + self.byte_count[TX] + length > self.max_bytes:
+                self.skipped_bytes += length
+                return
+            self._file.write(RECORD.pack(timestamp_ns, direction, length))
+            self._file.write(data)
+            self.chunk_count += 1
+            self.byte_count[direction] += length
+    
+    def close(self):
+        """캡처 종료"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def get_stats(self):
+        """캡처 통계 (path, chunks, rx_bytes, tx_bytes, skipped_bytes)"""
+        return {
+            'path': self.path,
+            'chunks': self.chunk_count,
+            'rx_bytes': self.byte_count[RX],
+            'tx_bytes': self.byte_count[TX],
+            'skipped_bytes': self.skipped_bytes
+        }
+
+
+def read_capture(path):
+    """
+    캡처 파일 읽기
+    
+    Yields:
+        tuple: (시각 datetime, 방향 RX / TX, bytes) - 시각은 헤더의 시작 시각 기준으로 환산
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"캡처 파일이 아닙니다: {path}")
+        start_ns, start_wall = HEADER.unpack(f.read(HEADER.size))
+        while True:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return  # 파일 끝 (기록 중 종료되어 잘린 레코드 포함)
+            timestamp_ns, direction, length = RECORD.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            yield datetime.fromtimestamp(start_wall + (timestamp_ns - start_ns) / 1e9), direction, data
+
+
+def format_record(timestamp, direction, data):
+    """캡처 레코드 1개를 'HH:MM:SS.ffffff RX 02 02 F0 ...' 형식 텍스트로 변환"""
+    return f"{timestamp:%H:%M:%S.%f} {DIRECTION_NAMES.get(direction, '?')} {data.hex(' ').upper()}"
+
+
+def main():
+    """명령줄 실행: 캡처 파일을 HEX 텍스트로 출력"""
+    parser = argparse.ArgumentParser(description="원시 바이트 캡처 파일 보기")
+    parser.add_argument('path', help="캡처 파일 경로")
+    parser.add_argument('--direction', choices=['RX', 'TX'], help="한 방향만 출력")
+    args = parser.parse_args()
+    
+    for timestamp, direction, data in read_capture(args.path):
+        if args.direction and DIRECTION_NAMES.get(direction) != args.direction:
+            continue
+        print(format_record(timestamp, direction, data))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,491 @@
+"""
+재전송 / 응답 확인 관리 모듈
+응답을 받을 때까지 재전송해야 하는 명령(CMD 0xB1, 0xB2, 0xB3, 0xB4 등)을 CMD별로 추적합니다.
+CMD마다 재전송 스레드를 두는 대신 타이머 스레드 하나가 다음 재전송 시각이 가장 빠른 명령까지
+잠들었다가 깨어나 재전송하고, 수신 스레드가 넘겨주는 응답 프레임의 CMD로 대기 중인 명령을 자동으로 완료합니다.
+
+- 응답 CMD: B1/B2/B4는 같은 CMD로 에코 응답, B3는 F1(냉동 상태응답)으로 응답 (메인 펌웨어 Protocol_Make_Cmd 기준)
+  B3는 상태조회 F1 응답과 구분할 수 없으므로 기본 정책에 넣지 않고, 상태조회를 멈춘 상태에서만 TABLE_ROW_POLICY로 추적
+- CMD별 재전송 정책(RetryPolicy): 재전송 간격, 간격 증가 배수(backoff), 최대 간격, 최대 시도 횟수, 타임아웃
+- CMD별 통계: 추적 수, 응답 수, 전송 시도 수, 응답까지 걸린 시간, 타임아웃 수
+- 추적 항목마다 concurrent.futures.Future를 두어 응답 Frame / 타임아웃(TimeoutError) / 취소를 알림
+  (Future 완료 콜백은 수신 스레드 또는 타이머 스레드에서 호출됨)
+- hold() / release(): 포트 재연결을 기다리는 동안 재전송 / 타임아웃을 멈추고, 재연결 후 응답을 기다리던 명령을 다시 전송
+- set_external_loop(wakeup): 타이머 스레드 대신 외부 이벤트 루프(io_reactor)가 run_due()로 재전송 / 타임아웃 처리
+"""
+import heapq
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+
+
+class RetryPolicy:
+    """CMD별 재전송 정책"""
+    
+    __slots__ = ('response_cmd', 'interval', 'timeout', 'backoff', 'max_interval', 'max_attempts', 'supersede')
+    
+    def __init__(self, response_cmd=None, interval=0.2, timeout=5.0, backoff=1.0, max_interval=None,
+                 max_attempts=None, supersede=True):
+        """
+        Args:
+            response_cmd: 응답으로 인정할 CMD (None이면 요청과 같은 CMD, 에코 응답)
+            interval: 첫 재전송 간격 (초)
+            timeout: 첫 전송부터 응답을 기다리는 최대 시간 (초)
+            backoff: 재전송할 때마다 간격에 곱하는 배수 (1.0이면 고정 간격)
+            max_interval: 재전송 간격 상한 (초, None이면 제한 없음)
+            max_attempts: 최대 전송 횟수 (첫 전송 포함, None이면 타임아웃까지, 이후에는 타임아웃까지 응답만 대기)
+            supersede: True이면 같은 CMD를 새로 추적할 때 이전 명령은 취소 (최신 설정값만 유효)
+        """
+        if backoff <= 0:
+            raise ValueError(f"backoff는 0보다 커야 합니다: {backoff}")
+        self.response_cmd = response_cmd
+        self.interval = interval
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.max_attempts = max_attempts
+        self.supersede = supersede
+    
+    def replace(self, **changes):
+        """일부 항목만 바꾼 새 정책 생성 (예: policy.replace(timeout=2.0))"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return RetryPolicy(**values)
+
+
+# 기본 재전송 정책 (B1/B2/B4는 기존 재전송 스레드와 같은 200ms 간격 / 5초 타임아웃)
+# CMD 0xC0(센서값 변경, 개발용)은 메인에서 응답 CMD를 정의하지 않아 기본 정책 없음 (set_policy로 지정)
+DEFAULT_POLICIES = {
+    0xB1: RetryPolicy(),
+    0xB2: RetryPolicy(),
+    0xB4: RetryPolicy()
+}
+
+# CMD 0xB3(제빙테이블 행) 재전송 정책 - 응답이 상태조회와 같은 F1이라 기본 정책에 넣으면 5Hz 상태조회의 F1 응답이
+# 대기 중인 B3를 잘못 완료하므로, 상태조회를 일시 중지한 TableUploader만 track / send_request에 직접 지정
+TABLE_ROW_POLICY = RetryPolicy(response_cmd=0xF1, interval=0.5)
+
+
+class InFlight:
+    """응답을 기다리는 명령"""
+    
+    __slots__ = ('cmd', 'packet', 'policy', 'first_sent', 'next_due', 'interval', 'attempts', 'state',
+                 'response', 'seq', 'future', 'restart')
+    
+    # 상태
+    PENDING = 'PENDING'
+    ACKED = 'ACKED'
+    TIMEOUT = 'TIMEOUT'
+    CANCELLED = 'CANCELLED'
+    
+    def __init__(self, cmd, packet, policy, now, seq):
+        self.cmd = cmd
+        self.packet = packet
+        self.policy = policy
+        self.first_sent = now           # 첫 전송 시각 (time.monotonic)
+        self.interval = policy.interval
+        self.next_due = now + policy.interval
+        self.attempts = 1               # 첫 전송 포함 전송 횟수
+        self.state = self.PENDING
+        self.response = None            # 응답 Frame (ACKED인 경우)
+        self.seq = seq
+        self.future = Future()          # 응답 Frame으로 완료 (타임아웃: TimeoutError, 취소: cancelled)
+        self.restart = False            # True이면 다음 재전송에 backoff를 적용하지 않음 (release 후 간격 처음부터)
+    
+    @property
+    def response_cmd(self):
+        """응답으로 인정할 CMD"""
+        return self.cmd if self.policy.response_cmd is None else self.policy.response_cmd
+    
+    def __repr__(self):
+        return f'InFlight(cmd=0x{self.cmd:02X}, state={self.state}, attempts={self.attempts})'
+
+
+class RetransmitManager:
+    """재전송 타이머 하나로 여러 명령의 재전송 / 응답 확인 / 타임아웃을 처리"""
+    
+    def __init__(self, resend, on_timeout=None, policies=None):
+        """
+        Args:
+            resend: 재전송 함수 (resend(packet, interval) - interval은 다음 재전송까지 남은 시간, 초)
+            on_timeout: 타임아웃 알림 함수 (on_timeout(entry), 타이머 스레드 / 외부 루프에서 호출)
+            policies: CMD별 RetryPolicy (기본값: DEFAULT_POLICIES)
+        """
+        self.resend = resend
+        self.on_timeout = on_timeout
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        
+        self._cond = threading.Condition()
+        self._inflight = {}     # 요청 CMD → 응답 대기 중인 명령 (deque, 먼저 보낸 순서)
+        self._timers = []       # (다음 재전송 시각, 순번, InFlight) 힙
+        self._seq = 0
+        self._thread = None
+        self._running = False
+        self._wakeup = None     # 외부 루프 깨우기 함수 (None이면 타이머 스레드 사용)
+        self._held_since = None # hold() 시각 (time.monotonic, 보류 중이 아니면 None)
+        self._stats = {}        # CMD → [추적 수, 응답 수, 전송 시도 수, 타임아웃 수, 취소 수, 응답 시간 합계, 최대 응답 시간]
+    
+    def set_policy(self, cmd, policy):
+        """CMD의 재전송 정책 지정 (이후 track()부터 적용)"""
+        with self._cond:
+            self.policies[cmd] = policy
+    
+    def policy_for(self, cmd, default=None):
+        """CMD의 재전송 정책 (지정되지 않은 CMD는 default, default가 None이면 RetryPolicy() 기본값)"""
+        with self._cond:
+            return self.policies.get(cmd) or default or RetryPolicy()
+    
+    def track(self, cmd, packet, policy=None):
+        """
+        전송한 명령을 응답 대기 목록에 추가 (첫 전송은 호출 측에서 이미 한 것으로 간주)
+        
+        Args:
+            cmd: 요청 CMD
+            packet: 재전송할 패킷 (STX ~ ETX)
+            policy: 재전송 정책 (기본값: set_policy / DEFAULT_POLICIES의 CMD 정책, 없으면 RetryPolicy())
+        
+        Returns:
+            InFlight: 추적 항목
+        """
+        with self._cond:
+            if policy is None:
+                policy = self.policies.get(cmd) or RetryPolicy()
+            superseded = self._cancel_locked(cmd) if policy.supersede else []
+            
+            entry = InFlight(cmd, packet, policy, time.monotonic(), self._seq)
+            self._seq += 1
+            self._inflight.setdefault(cmd, deque()).append(entry)
+            heapq.heappush(self._timers, (entry.next_due, entry.seq, entry))
+            
+            stats = self._cmd_stats(cmd)
+            stats[0] += 1
+            stats[2] += 1
+            
+            wakeup = self._wakeup
+            if wakeup is None:
+                self._start_thread_locked()
+            self._cond.notify()
+        
+        if wakeup is not None:
+            wakeup()
+        
+        # 호출 측에서 Future를 취소하면 재전송도 중지
+        entry.future.add_done_callback(lambda future: future.cancelled() and self._discard(entry))
+        self._cancel_futures(superseded)
+        return entry
+    
+    def on_response(self, frame):
+        """
+        수신 프레임으로 응답 대기 중인 명령 완료 처리 (수신 스레드에서 호출)
+        응답 CMD가 같은 명령이 여러 개면 가장 먼저 보낸 명령을 완료
+        
+        Returns:
+            InFlight: 완료된 명령, 해당하는 명령이 없으면 None
+        """
+        cmd = frame.cmd
+        with self._cond:
+            oldest = None
+            for pending in self._inflight.values():
+                if pending and pending[0].response_cmd == cmd:
+                    if oldest is None or pending[0].seq < oldest.seq:
+                        oldest = pending[0]
+            if oldest is None:
+                return None
+            
+            self._finish_locked(oldest, InFlight.ACKED)
+            oldest.response = frame
+            elapsed = time.monotonic() - oldest.first_sent
+            stats = self._cmd_stats(oldest.cmd)
+            stats[1] += 1
+            stats[5] += elapsed
+            if elapsed > stats[6]:
+                stats[6] = elapsed
+        
+        try:
+            oldest.future.set_result(frame)
+        except InvalidStateError:
+            pass
+        return oldest
+    
+    def cancel(self, cmd):
+        """CMD의 응답 대기 중인 명령을 모두 취소 (재전송 중지)"""
+        with self._cond:
+            cancelled = self._cancel_locked(cmd)
+        self._cancel_futures(cancelled)
+    
+    def cancel_all(self):
+        """응답 대기 중인 명령을 모두 취소 (연결 해제 시)"""
+        cancelled = []
+        with self._cond:
+            for cmd in list(self._inflight):
+                cancelled += self._cancel_locked(cmd)
+        self._cancel_futures(cancelled)
+    
+    def hold(self):
+        """
+        재전송 / 타임아웃 보류 (포트가 끊겨 재연결을 기다리는 동안)
+        보류 중에는 재전송하지 않고, 보류 시간은 응답 대기 시간(타임아웃)에 포함하지 않음
+        """
+        with self._cond:
+            if self._held_since is None:
+                self._held_since = time.monotonic()
+    
+    def release(self, reissue=True):
+        """
+        보류 해제 (재연결 후)
+        
+        Args:
+            reissue: True이면 응답을 기다리던 명령을 바로 다시 전송 (재전송 간격은 처음부터)
+        
+        Returns:
+            list: 다시 전송할 InFlight 목록 (reissue=False이면 빈 목록)
+        """
+        with self._cond:
+            if self._held_since is None:
+                return []
+            now = time.monotonic()
+            held = now - self._held_since
+            self._held_since = None
+            
+            reissued = []
+            for pending in self._inflight.values():
+                for entry in pending:
+                    entry.first_sent += held
+                    if reissue:
+                        # 다음 타이머 처리에서 재전송 1회 + 간격을 policy.interval부터 다시 시작
+                        policy = entry.policy
+                        if policy.max_attempts is not None:
+                            entry.attempts = min(entry.attempts, policy.max_attempts - 1)
+                        entry.interval = policy.interval
+                        entry.restart = True
+                        entry.next_due = now
+                        reissued.append(entry)
+                    else:
+                        entry.next_due += held
+                    heapq.heappush(self._timers, (entry.next_due, entry.seq, entry))
+            self._cond.notify()
+            wakeup = self._wakeup
+        
+        if wakeup is not None:
+            wakeup()
+        return reissued
+    
+    def set_external_loop(self, wakeup):
+        """
+        재전송 타이머를 외부 이벤트 루프에서 처리 (io_reactor의 리액터 스레드에서 run_due 호출)
+        
+        Args:
+            wakeup: 추적 명령 추가 / 보류 해제 시 외부 루프를 깨우는 함수 (None이면 다시 타이머 스레드 사용)
+        """
+        with self._cond:
+            self._wakeup = wakeup
+            if wakeup is not None:
+                # 타이머 스레드 종료 (응답 대기 중인 명령은 유지, 이후 외부 루프가 처리)
+                self._running = False
+                self._cond.notify_all()
+                thread, self._thread = self._thread, None
+            else:
+                thread = None
+                if self._timers:
+                    self._start_thread_locked()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        if wakeup is not None:
+            wakeup()
+    
+    def run_due(self, now=None):
+        """
+        재전송 / 타임아웃 시각이 지난 명령 처리 (외부 루프 사용 시 호출, 재전송 / 타임아웃 알림도 호출 스레드에서 실행)
+        
+        Returns:
+            float: 다음 처리 시각 (time.monotonic), 기다리는 명령이 없거나 보류 중이면 None
+        """
+        with self._cond:
+            if self._held_since is not None:
+                return None
+            resends, expired = self._collect_due_locked(time.monotonic() if now is None else now)
+            next_due = self._timers[0][0] if self._timers else None
+        self._dispatch(resends, expired)
+        return next_due
+    
+    def is_pending(self, cmd):
+        """CMD의 응답을 기다리는 명령이 있는지 여부"""
+        with self._cond:
+            return bool(self._inflight.get(cmd))
+    
+    def _start_thread_locked(self):
+        """타이머 스레드 시작 (잠금 보유 상태에서 호출, 이미 동작 중이면 무시)"""
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._timer_worker, daemon=True)
+            self._thread.start()
+    
+    def close(self):
+        """모든 명령을 취소하고 타이머 스레드 종료"""
+        cancelled = []
+        with self._cond:
+            for cmd in list(self._inflight):
+                cancelled += self._cancel_locked(cmd)
+            self._running = False
+            self._cond.notify_all()
+        self._cancel_futures(cancelled)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+    
+    def _cancel_locked(self, cmd):
+        """CMD의 대기 명령 취소 (잠금 보유 상태에서 호출, Future는 잠금 밖에서 _cancel_futures로 취소)"""
+        cancelled = []
+        pending = self._inflight.get(cmd)
+        while pending:
+            entry = pending[0]
+            self._finish_locked(entry, InFlight.CANCELLED)
+            self._cmd_stats(cmd)[4] += 1
+            cancelled.append(entry)
+        return cancelled
+    
+    @staticmethod
+    def _cancel_futures(entries):
+        """취소된 명령의 Future 취소 (완료 콜백이 다시 요청을 보낼 수 있도록 잠금 밖에서 호출)"""
+        for entry in entries:
+            entry.future.cancel()
+    
+    def _discard(self, entry):
+        """호출 측에서 Future를 취소한 명령을 대기 목록에서 제거"""
+        with self._cond:
+            if entry.state == InFlight.PENDING:
+                self._finish_locked(entry, InFlight.CANCELLED)
+                self._cmd_stats(entry.cmd)[4] += 1
+    
+    def _finish_locked(self, entry, state):
+        """대기 목록에서 제거하고 상태 변경 (타이머 힙 항목은 꺼낼 때 건너뜀)"""
+        entry.state = state
+        pending = self._inflight.get(entry.cmd)
+        if pending:
+            try:
+                pending.remove(entry)
+            except ValueError:
+                pass
+            if not pending:
+                del self._inflight[entry.cmd]
+    
+    def _cmd_stats(self, cmd):
+        """CMD별 통계 항목 (없으면 생성, 잠금 보유 상태에서 호출)"""
+        stats = self._stats.get(cmd)
+        if stats is None:
+            stats = self._stats[cmd] = [0, 0, 0, 0, 0, 0.0, 0.0]
+        return stats
+    
+    def _timer_worker(self):
+        """재전송 타이머 스레드 (다음 재전송 시각까지 대기 후 재전송 / 타임아웃 처리)"""
+        while True:
+            with self._cond:
+                if not self._running:
+                    break
+                
+                if self._held_since is not None:
+                    self._cond.wait()   # release() / close()까지 대기
+                    continue
+                now = time.monotonic()
+                resends, expired = self._collect_due_locked(now)
+                
+                if not resends and not expired:
+                    # 다음 재전송 시각까지 대기 (대기 명령이 없으면 track()/close()까지 대기)
+                    if self._timers:
+                        self._cond.wait(self._timers[0][0] - now)
+                    else:
+                        self._cond.wait()
+                    continue
+            
+            self._dispatch(resends, expired)
+    
+    def _collect_due_locked(self, now):
+        """
+        시각이 지난 타이머 처리 (잠금 보유 상태에서 호출)
+        
+        Returns:
+            tuple: (재전송할 [(패킷, 다음 재전송까지 남은 시간)], 타임아웃된 InFlight 목록)
+        """
+        resends = []
+        expired = []
+        while self._timers and self._timers[0][0] <= now:
+            due, _, entry = heapq.heappop(self._timers)
+            # 끝난 명령 / release()로 시각이 바뀐 이전 힙 항목은 건너뜀
+            if entry.state != InFlight.PENDING or due != entry.next_due:
+                continue
+            
+            policy = entry.policy
+            deadline = entry.first_sent + policy.timeout
+            if now >= deadline:
+                self._finish_locked(entry, InFlight.TIMEOUT)
+                self._cmd_stats(entry.cmd)[3] += 1
+                expired.append(entry)
+                continue
+            
+            # 최대 전송 횟수에 도달하면 타임아웃까지 응답만 대기
+            if policy.max_attempts is not None and entry.attempts >= policy.max_attempts:
+                entry.next_due = deadline
+                heapq.heappush(self._timers, (entry.next_due, entry.seq, entry))
+                continue
+            
+            # 재전송 후 다음 간격 (backoff 적용, 최대 간격 / 남은 타임아웃 이내)
+            entry.attempts += 1
+            self._cmd_stats(entry.cmd)[2] += 1
+            if entry.restart:
+                entry.restart = False
+            else:
+                entry.interval *= policy.backoff
+            if policy.max_interval is not None:
+                entry.interval = min(entry.interval, policy.max_interval)
+            entry.next_due = min(now + entry.interval, deadline)
+            heapq.heappush(self._timers, (entry.next_due, entry.seq, entry))
+            resends.append((entry.packet, entry.next_due - now))
+        return resends, expired
+    
+    def _dispatch(self, resends, expired):
+        """재전송 / 타임아웃 알림 (완료 콜백이 다시 명령을 추적할 수 있도록 잠금 밖에서 호출)"""
+        for packet, interval in resends:
+            try:
+                self.resend(packet, interval)
+            except Exception:
+                pass
+        for entry in expired:
+            try:
+                entry.future.set_exception(TimeoutError(
+                    f"CMD 0x{entry.cmd:02X} 응답 없음 ({entry.policy.timeout}초, {entry.attempts}회 전송)"))
+            except InvalidStateError:
+                pass
+            if self.on_timeout is not None:
+                try:
+                    self.on_timeout(entry)
+                except Exception:
+                    pass
+    
+    def get_stats(self):
+        """
+        CMD별 재전송 통계 반환
+        
+        Returns:
+            dict: {CMD: {'tracked', 'acked', 'attempts', 'timeouts', 'cancelled', 'pending',
+                         'avg_ack_ms', 'max_ack_ms'}}
+        """
+        with self._cond:
+            return {
+                cmd: {
+                    'tracked': tracked,
+                    'acked': acked,
+                    'attempts': attempts,
+                    'timeouts': timeouts,
+                    'cancelled': cancelled,
+                    'pending': len(self._inflight.get(cmd, ())),
+                    'avg_ack_ms': total / acked * 1000 if acked else 0.0,
+                    'max_ack_ms': longest * 1000
+                }
+                for cmd, (tracked, acked, attempts, timeouts, cancelled, total, longest) in self._stats.items()
+            }
+    
+    def reset_stats(self):
+        """재전송 통계 초기화"""
+        with self._cond:
+            self._stats.clear()
@@ -0,0 +1,331 @@
+"""
+다중 포트 장비(리그) 관리 모듈
+내구 시험처럼 여러 대의 장비를 한 프로세스에서 동시에 모니터링합니다.
+장비마다 gui_main.py를 따로 띄우는 대신 SerialCommunication 세션(포트별 1개)을 공유 I/O 리액터 하나로 처리하고,
+장비별 상태 저장소(UnitState)에 마지막 상태응답과 수신 통계만 보관합니다.
+
+- 스레드: 리액터 1개 (+ 응답 대기 명령이 있을 때만 세션별 재전송 타이머)
+- 메모리: 장비별로 마지막 상태응답 프레임과 고정 크기 통계만 보관 (수신 큐에 쌓지 않음)
+- 디코딩: 상태응답은 수신 시 프레임만 보관하고 status() / overview()로 읽을 때 디코딩
+- 핫플러그: watch_unit()으로 USB VID / PID / 시리얼 번호를 등록하면 포트 감시(PortWatcher)가
+  장비를 꽂을 때 자동 연결하고, 다시 꽂아서 포트 이름이 바뀌면 재연결 대상 포트를 바꿈
+
+사용 예:
+    py rig_manager.py COM3 COM4 COM5 --baudrate 9600
+    py rig_manager.py --unit RIG01=0403:6001:A12345 --unit RIG02=0403:6001:A67890
+"""
+import argparse
+import threading
+import time
+from collections import deque
+
+from communication import SerialCommunication
+from io_reactor import IoReactor
+from port_watcher import PortWatcher, PORT_ADDED
+from status_schema import SCHEMAS
+
+
+class UnitState:
+    """
+    장비 1대의 상태 저장소
+    SerialCommunication의 receive_queue / status_queue 대신 연결되어 이벤트를 바로 반영합니다 (put만 사용).
+    """
+    
+    RATE_WINDOW = 5.0       # 수신 주기 계산 구간 (초)
+    EVENT_LOG_SIZE = 32     # 보관할 최근 시스템 / 오류 메시지 수
+    
+    def __init__(self, name, port):
+        self.name = name
+        self.port = port
+        self.connected = False
+        self.link_up = True         # 포트 끊김 후 재연결 대기 중이면 False
+        self._lock = threading.Lock()
+        self._frames = {}           # 상태응답 CMD → 마지막 Frame
+        self._decoded = {}          # 상태응답 CMD → (Frame, 디코딩 결과) 캐시
+        self._arrivals = deque()    # 최근 RATE_WINDOW초 상태응답 도착 시각 (time.monotonic)
+        self.frame_count = 0        # 정상 프레임 수 (중복 상태응답 포함)
+        self.error_count = 0        # 프레임 오류 수
+        self.sent_count = 0         # 송신 프레임 수
+        self.last_seen = None       # 마지막 프레임 수신 시각 (time.monotonic)
+        self.events = deque(maxlen=self.EVENT_LOG_SIZE)  # (시각, 종류, 메시지)
+    
+    def put(self, item):
+        """receive_queue / status_queue 이벤트 반영 (리액터 스레드에서 호출)"""
+        kind, payload = item
+        now = time.monotonic()
+        
+        with self._lock:
+            if kind == 'PACKET':
+                if payload.is_error:
+                    self.error_count += 1
+                    return
+                self._frame_seen(now)
+                if payload.cmd in SCHEMAS:
+                    self._frames[payload.cmd] = payload
+                    self._arrivals.append(now)
+            elif kind == 'UNCHANGED':
+                self._frame_seen(now)
+                self._arrivals.append(now)
+            elif kind == 'SENT_BATCH':
+                self.sent_count += len(payload)
+            elif kind in ('LINK_LOST', 'LINK_RESTORED'):
+                # 포트 끊김 / 재연결 (끊김 구간은 SerialCommunication.get_link_stats()로도 확인)
+                self.link_up = kind == 'LINK_RESTORED'
+                self.events.append((time.time(), kind, payload))
+            elif kind in ('CONNECTED', 'DISCONNECTED', 'ERROR', 'SYSTEM'):
+                if kind == 'CONNECTED':
+                    self.connected = True
+                elif kind == 'DISCONNECTED':
+                    self.connected = False
+                self.events.append((time.time(), kind, payload))
+    
+    def _frame_seen(self, now):
+        self.frame_count += 1
+        self.last_seen = now
+    
+    def status(self, cmd):
+        """상태응답 디코딩 결과 (수신한 적 없으면 None, 같은 프레임은 한 번만 디코딩)"""
+        with self._lock:
+            frame = self._frames.get(cmd)
+            if frame is None:
+                return None
+            cached = self._decoded.get(cmd)
+            if cached is not None and cached[0] is frame:
+                return cached[1]
+        
+        decoded = SCHEMAS[cmd].decode(frame.data_field)
+        with self._lock:
+            self._decoded[cmd] = (frame, decoded)
+        return decoded
+    
+    def rate(self):
+        """최근 RATE_WINDOW초 동안의 상태응답 수신 주기 (Hz, 중복 상태응답 포함)"""
+        limit = time.monotonic() - self.RATE_WINDOW
+        with self._lock:
+            while self._arrivals and self._arrivals[0] < limit:
+                self._arrivals.popleft()
+            return len(self._arrivals) / self.RATE_WINDOW
+    
+    def age(self):
+        """마지막 프레임 수신 후 경과 시간 (초, 수신한 적 없으면 None)"""
+        return None if self.last_seen is None else time.monotonic() - self.last_seen
+
+
+class RigManager:
+    """여러 장비의 SerialCommunication 세션을 공유 리액터 하나로 관리"""
+    
+    def __init__(self, reactor=None):
+        """
+        Args:
+            reactor: 공유 I/O 리액터 (기본값: 새 IoReactor)
+        """
+        self.reactor = reactor or IoReactor()
+        self.units = {}     # 이름 → (SerialCommunication, UnitState)
+        self.port_watcher = None    # watch_unit() 처음 호출 시 시작
+        self._watched = {}  # 이름 → (vid, pid, serial_number, baudrate, poll_rates)
+        self._watch_lock = threading.Lock()     # 포트 감시 스레드 / 호출 스레드 동시 연결 방지
+    
+    def add_unit(self, name, port, baudrate=9600, poll_rates=None):
+        """
+        장비 추가 및 연결
+        
+        Args:
+            name: 장비 이름 (overview 표시용, 중복 불가)
+            port: 포트 이름
+            baudrate: 통신 속도
+            poll_rates: 상태조회 CMD별 주기 (Hz, 기본값: SerialCommunication 기본값)
+        
+        Returns:
+            tuple: (성공 여부, 메시지)
+        """
+        if name in self.units:
+            raise ValueError(f"이미 등록된 장비 이름입니다: {name}")
+        
+        comm = SerialCommunication()
+        state = UnitState(name, port)
+        comm.receive_queue = state
+        comm.status_queue = state
+        if poll_rates is not None:
+            comm.poll_rates = dict(poll_rates)
+        
+        self.units[name] = (comm, state)
+        return comm.connect(port, baudrate, reactor=self.reactor)
+    
+    def watch_unit(self, name, vid=None, pid=None, serial_number=None, baudrate=9600, poll_rates=None):
+        """
+        USB 장비 식별 정보로 장비 등록 (꽂혀 있으면 바로, 아니면 꽂을 때 자동 연결)
+        
+        다시 꽂아서 포트 이름이 바뀌면(/dev/ttyUSB0 → /dev/ttyUSB1 등) 재연결 대기 중인 세션의 포트를 바꿔서
+        SerialCommunication의 재연결이 새 포트로 이어지게 합니다.
+        
+        Args:
+            name: 장비 이름 (중복 불가)
+            vid, pid, serial_number: USB 식별 정보 (None은 무시, 같은 VID / PID 장비가 여러 대면 시리얼 번호 지정)
+            baudrate: 통신 속도
+            poll_rates: 상태조회 CMD별 주기 (Hz)
+        
+        Returns:
+            tuple: (연결 여부, 메시지) - 아직 꽂혀 있지 않으면 (False, "연결 대기")
+        """
+        with self._watch_lock:
+            if name in self.units or name in self._watched:
+                raise ValueError(f"이미 등록된 장비 이름입니다: {name}")
+            self._watched[name] = (vid, pid, serial_number, baudrate, poll_rates)
+        
+        if self.port_watcher is None:
+            self.port_watcher = PortWatcher()
+            self.port_watcher.add_listener(self._on_port_event)
+            self.port_watcher.start()
+        
+        info = self.port_watcher.find(vid, pid, serial_number)
+        if info is None:
+            return False, "연결 대기"
+        return self._attach(name, info)
+    
+    def _on_port_event(self, kind, info):
+        """포트 추가 이벤트 처리 (포트 감시 스레드에서 호출)"""
+        if kind != PORT_ADDED:
+            return      # 분리는 SerialCommunication이 LINK_LOST로 감지하고 재연결 대기
+        with self._watch_lock:
+            names = [name for name, (vid, pid, serial_number, _, _) in self._watched.items()
+                     if info.matches(vid, pid, serial_number)]
+        for name in names:
+            self._attach(name, info)
+    
+    def _attach(self, name, info):
+        """감시 중인 장비를 포트에 연결 (이미 연결된 세션이면 재연결 대상 포트만 변경)"""
+        with self._watch_lock:
+            if name not in self._watched:
+                return False, "감시 중인 장비가 아닙니다"
+            _, _, _, baudrate, poll_rates = self._watched[name]
+            unit = self.units.get(name)
+            if unit is not None:
+                comm, state = unit
+                if comm.is_connected:
+                    if not state.link_up and comm.current_port != info.device:
+                        # 재연결 대기 중 다른 포트 이름으로 다시 꽂힘 - 재연결 작업자가 새 포트를 열도록 변경
+                        old_port = comm.current_port
+                        comm.current_port = info.device
+                        state.port = info.device
+                        state.put(('SYSTEM', f"포트 변경: {old_port} → {info.device}"))
+                    return True, "이미 연결됨"
+                # 처음 연결에 실패한 세션 - 새로 연결
+                self.units.pop(name)
+            return self.add_unit(name, info.device, baudrate, poll_rates)
+    
+    def remove_unit(self, name):
+        """장비 연결 해제 후 제거"""
+        comm, _ = self.units.pop(name)
+        return comm.disconnect()
+    
+    def comm(self, name):
+        """장비의 SerialCommunication (send_request 등 명령 전송용)"""
+        return self.units[name][0]
+    
+    def state(self, name):
+        """장비의 UnitState"""
+        return self.units[name][1]
+    
+    def close(self):
+        """포트 감시 종료, 모든 장비 연결 해제 후 리액터 종료"""
+        if self.port_watcher is not None:
+            self.port_watcher.stop()
+        self._watched.clear()
+        for name in list(self.units):
+            self.remove_unit(name)
+        self.reactor.close()
+    
+    def overview(self):
+        """
+        장비별 요약 (장비 수가 많아도 한 화면에 보이는 1줄 요약)
+        
+        Returns:
+            list: 장비별 dict (name, port, connected, rate, age, frames, errors, reconnects, downtime, cold_temp,
+                  outdoor_temp, compressor, current_rps, ice_step, error_code)
+        """
+        rows = []
+        for name, (comm, state) in self.units.items():
+            common = state.status(0xF0) or {}
+            freezing = state.status(0xF1) or {}
+            sensor = common.get('sensor_data', {})
+            hvac = freezing.get('hvac_data', {})
+            link = comm.get_link_stats()
+            rows.append({
+                'name': name,
+                'port': state.port,
+                'connected': comm.is_connected and link['link_up'],
+                'rate': state.rate(),
+                'age': state.age(),
+                'frames': state.frame_count,
+                'errors': state.error_count,
+                'reconnects': link['reconnect_count'],
+                'downtime': link['downtime_total'],
+                'cold_temp': sensor.get('cold_temp'),
+                'outdoor_temp': sensor.get('outdoor_temp1'),
+                'compressor': hvac.get('compressor_state'),
+                'current_rps': hvac.get('current_rps'),
+                'ice_step': freezing.get('icemaking_data', {}).get('ice_step'),
+                'error_code': hvac.get('error_code')
+            })
+        return rows
+    
+    def format_overview(self):
+        """overview()를 고정 폭 텍스트 표로 변환"""
+        def cell(value, fmt='{}'):
+            return '-' if value is None else fmt.format(value)
+        
+        lines = [f"{'장비':<10} {'포트':<14} {'연결':<4} {'수신Hz':>6} {'경과s':>6} {'프레임':>8} {'오류':>5} {'재연결':>4} "
+                 f"{'냉수℃':>6} {'외기℃':>6} {'압축기':<6} {'RPS':>4} {'STEP':>4} {'에러':>4}"]
+        for row in self.overview():
+            lines.append(
+                f"{row['name']:<10} {row['port']:<14} {'O' if row['connected'] else 'X':<4} "
+                f"{row['rate']:>6.1f} {cell(row['age'], '{:.1f}'):>6} {row['frames']:>8} {row['errors']:>5} {row['reconnects']:>4} "
+                f"{cell(row['cold_temp'], '{:.0f}'):>6} {cell(row['outdoor_temp'], '{:.0f}'):>6} "
+                f"{cell(row['compressor']):<6} {cell(row['current_rps']):>4} {cell(row['ice_step']):>4} "
+                f"{cell(row['error_code']):>4}"
+            )
+        return '\n'.join(lines)
+
+
+def main():
+    """명령줄 실행: 여러 포트를 연결하고 요약 표를 주기적으로 출력"""
+    parser = argparse.ArgumentParser(description="여러 장비 동시 모니터링")
+    parser.add_argument('ports', nargs='*', help="포트 이름 (예: COM3 COM4)")
+    parser.add_argument('--unit', action='append', default=[], metavar='NAME=VID:PID[:SERIAL]',
+                        help="USB 식별 정보로 장비 등록 (꽂을 때 자동 연결, 예: RIG01=0403:6001:A12345)")
+    parser.add_argument('--baudrate', type=int, default=9600, help="통신 속도 (기본값: 9600)")
+    parser.add_argument('--interval', type=float, default=1.0, help="요약 출력 간격 (초, 기본값: 1.0)")
+    args = parser.parse_args()
+    if not args.ports and not args.unit:
+        parser.error("포트 또는 --unit을 지정하세요")
+    
+    manager = RigManager()
+    for index, port in enumerate(args.ports, 1):
+        success, message = manager.add_unit(f"UNIT{index:02d}", port, args.baudrate)
+        if not success:
+            print(f"{port}: {message}")
+    for spec in args.unit:
+        try:
+            name, ids = spec.split('=', 1)
+            fields = ids.split(':', 2)
+            vid, pid = int(fields[0], 16), int(fields[1], 16)
+        except (ValueError, IndexError):
+            parser.error(f"--unit 형식 오류: {spec} (NAME=VID:PID[:SERIAL])")
+        serial_number = fields[2] if len(fields) > 2 else None
+        success, message = manager.watch_unit(name, vid, pid, serial_number, args.baudrate)
+        if not success:
+            print(f"{name}: {message}")
+    
+    try:
+        while True:
+            time.sleep(args.interval)
+            print(manager.format_overview())
+            print()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
+
+
+if __name__ == '__main__':
+    main()
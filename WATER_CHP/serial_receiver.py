@@ -0,0 +1,165 @@
+"""
+시리얼 수신 엔진
+in_waiting 폴링 + sleep 대신 OS에서 데이터 도착을 기다렸다가(select / 타임아웃 read) 도착한 바이트를
+미리 할당한 버퍼로 한 번에 읽어옵니다. 읽기마다 도착 시각(time.monotonic_ns)과 읽은 바이트 수를 기록합니다.
+
+- POSIX: select()로 포트 fd를 대기하고 os.readv()로 버퍼에 바로 읽음 (읽기 중 메모리 할당 없음)
+- 그 외 (Windows 등): read(1) 타임아웃 대기 후 in_waiting 만큼 한 번에 읽어 버퍼에 복사
+"""
+import os
+import select
+import time
+from collections import deque
+
+import serial
+
+
+class SerialReceiver:
+    """블로킹 대기 + 일괄 읽기 시리얼 수신 클래스"""
+    
+    HISTORY_SIZE = 256      # 최근 읽기 기록 개수
+    
+    def __init__(self, port, buffer_size=4096, timeout=0.1):
+        """
+        Args:
+            port: 열린 serial.Serial 객체
+            buffer_size: 1회 읽기 최대 바이트 수 (미리 할당하는 버퍼 크기)
+            timeout: 데이터 대기 최대 시간 (초, 연결 해제 확인 주기)
+        """
+        self.port = port
+        self.timeout = timeout
+        self._buf = bytearray(buffer_size)
+        self._view = memoryview(self._buf)
+        
+        # POSIX는 fd를 직접 select + readv, 그 외는 포트 타임아웃 read
+        self._fd = None
+        if hasattr(os, 'readv'):
+            try:
+                self._fd = port.fileno()
+            except (AttributeError, OSError, NotImplementedError, serial.SerialException):
+                self._fd = None
+        if self._fd is None:
+            port.timeout = timeout
+        
+        # 통계
+        self.read_count = 0         # 데이터를 읽은 횟수
+        self.byte_count = 0         # 읽은 총 바이트 수
+        self.timeout_count = 0      # 데이터 없이 대기 시간이 끝난 횟수
+        self.max_batch = 0          # 1회 읽기 최대 바이트 수
+        self.last_arrival_ns = None # 마지막 데이터 도착 시각 (time.monotonic_ns)
+        self.history = deque(maxlen=self.HISTORY_SIZE)  # 최근 읽기 (도착 시각 ns, 바이트 수)
+    
+    @property
+    def fd(self):
+        """select로 감시할 수 있는 파일 디스크립터 (없으면 None)"""
+        return self._fd
+    
+    @property
+    def mode(self):
+        """수신 방식 ('select' / 'timeout-read')"""
+        return 'select' if self._fd is not None else 'timeout-read'
+    
+    def read(self):
+        """
+        데이터가 도착할 때까지 (최대 timeout) 대기 후 도착한 바이트를 한 번에 읽기
+        
+        Returns:
+            memoryview: 읽은 데이터 (내부 버퍼의 뷰, 다음 read() 호출 전까지만 유효), 타임아웃이면 None
+        """
+        if self._fd is not None:
+            count = self._read_select()
+        else:
+            count = self._read_timeout()
+        
+        if not count:
+            self.timeout_count += 1
+            return None
+        return self._record(count)
+    
+    def read_nowait(self):
+        """
+        대기 없이 이미 도착한 바이트만 읽기 (io_reactor처럼 다른 곳에서 도착을 확인한 경우)
+        
+        Returns:
+            memoryview: 읽은 데이터 (내부 버퍼의 뷰, 다음 읽기 전까지만 유효), 도착한 데이터가 없으면 None
+        """
+        if self._fd is not None:
+            try:
+                count = os.readv(self._fd, [self._buf])
+            except BlockingIOError:
+                return None
+            if count == 0:
+                raise serial.SerialException("장치가 읽기 준비 상태를 알렸지만 데이터가 없습니다 (연결 끊김 또는 포트 중복 사용)")
+        else:
+            waiting = min(self.port.in_waiting, len(self._buf))
+            if waiting <= 0:
+                return None
+            data = self.port.read(waiting)
+            count = len(data)
+            self._view[:count] = data
+        
+        return self._record(count) if count else None
+    
+    def _record(self, count):
+        """읽기 통계 기록 후 읽은 데이터 뷰 반환"""
+        arrival = time.monotonic_ns()
+        self.last_arrival_ns = arrival
+        self.read_count += 1
+        self.byte_count += count
+        if count > self.max_batch:
+            self.max_batch = count
+        self.history.append((arrival, count))
+        return self._view[:count]
+    
+    def _read_select(self):
+        """select로 fd 대기 후 os.readv로 버퍼에 직접 읽기"""
+        ready, _, _ = select.select([self._fd], [], [], self.timeout)
+        if not ready:
+            return 0
+        count = os.readv(self._fd, [self._buf])
+        if count == 0:
+            # 읽기 가능하다고 했는데 데이터가 없음 → 장치 분리 (pyserial과 같은 판단)
+            raise serial.SerialException("장치가 읽기 준비 상태를 알렸지만 데이터가 없습니다 (연결 끊김 또는 포트 중복 사용)")
+        return count
+    
+    def _read_timeout(self):
+        """read(1)로 첫 바이트를 기다린 뒤 이미 도착한 나머지를 한 번에 읽어 버퍼에 복사"""
+        first = self.port.read(1)
+        if not first:
+            return 0
+        self._buf[0] = first[0]
+        count = 1
+        
+        waiting = min(self.port.in_waiting, len(self._buf) - 1)
+        if waiting > 0:
+            rest = self.port.read(waiting)
+            self._view[1:1 + len(rest)] = rest
+            count += len(rest)
+        return count
+    
+    def get_stats(self):
+        """
+        읽기 통계 반환
+        
+        Returns:
+            dict: read_count, byte_count, timeout_count, avg_batch, max_batch,
+                  last_arrival_ns, recent_avg_batch, recent_interval_ms (최근 읽기 간 평균 간격)
+        """
+        recent = list(self.history)
+        recent_avg = sum(count for _, count in recent) / len(recent) if recent else 0.0
+        if len(recent) > 1:
+            recent_interval = (recent[-1][0] - recent[0][0]) / (len(recent) - 1) / 1e6
+        else:
+            recent_interval = 0.0
+        
+        return {
+            'mode': self.mode,
+            'read_count': self.read_count,
+            'byte_count': self.byte_count,
+            'timeout_count': self.timeout_count,
+            'avg_batch': self.byte_count / self.read_count if self.read_count else 0.0,
+            'max_batch': self.max_batch,
+            'last_arrival_ns': self.last_arrival_ns,
+            'recent_avg_batch': recent_avg,
+            'recent_interval_ms': recent_interval
+        }
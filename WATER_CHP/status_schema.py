@@ -0,0 +1,213 @@
+"""
+상태응답 (CMD 0xF0 / 0xF1 / 0xF2) 필드 스키마 모듈
+DATA FIELD의 각 항목(오프셋, 길이, 엔디안, 부호-크기 여부, 스케일, 표시값 테이블)을 한 곳에 선언하고,
+모듈 로드 시 struct.Struct와 변환 테이블로 한 번만 컴파일합니다.
+프레임 디코딩은 unpack_from 1회 + 변환 테이블 조회만 수행합니다.
+"""
+import struct
+from collections import namedtuple
+
+import protocol_spec
+
+
+# 필드 정의
+#   path: 결과 딕셔너리 경로 (예: ('hvac_data', 'current_rps'))
+#   offset: DATA FIELD 내 시작 인덱스 (0부터)
+#   width: 바이트 수 (1 또는 2, 2바이트는 HIGH/LOW 조합)
+#   endian: 'big' (HIGH 먼저) / 'little'
+#   signed: 부호-크기(sign-magnitude) 표현 여부 (MSB=1이면 음수)
+#   scale: 나눌 값 (None이면 정수 그대로, 1.0이면 float 변환만)
+#   enum: 표시값 테이블 (None이면 숫자 그대로)
+#   default: enum 테이블에 없는 값일 때 표시값
+FieldSpec = namedtuple('FieldSpec', ['path', 'offset', 'width', 'endian', 'signed', 'scale', 'enum', 'default'])
+FieldSpec.__new__.__defaults__ = (1, 'big', False, None, None, None)
+
+
+# 표시값 테이블
+FLAG_MAP = {1: True}                                            # 1: True / 그 외: False
+REFRIGERANT_VALVE_MAP = {0: '냉각', 1: '제빙', 2: '핫가스', 3: '보냉'}
+COMPRESSOR_STATE_MAP = {1: '동작중'}
+COOLING_OPERATION_MAP = {1: '가동'}
+ON_OFF_MAP = {1: 'ON'}
+DETECT_MAP = {1: '감지'}
+WATER_LEVEL_MAP = {0: '비어있음', 1: '저수위', 2: '중수위', 3: '만수위', 4: '에러'}
+
+
+# ========== CMD 0xF0 (공통 상태조회) - 40바이트 ==========
+F0_DATA_LENGTH = protocol_spec.RESPONSE_LENGTH_MAP[0xF0]     # 사양서 기준 (py protocol_codegen.py --check로 필드 점검)
+F0_FIELDS = (
+    # 1. 센서류 (DATA1-7, 인덱스 0-6) - 부호-크기 표현, 1℃ 단위
+    FieldSpec(('sensor_data', 'outdoor_temp1'), 0, signed=True, scale=1.0),
+    FieldSpec(('sensor_data', 'hot_inlet_temp'), 1, signed=True, scale=1.0),
+    FieldSpec(('sensor_data', 'purified_temp'), 2, signed=True, scale=1.0),
+    FieldSpec(('sensor_data', 'outdoor_temp2'), 3, signed=True, scale=1.0),
+    FieldSpec(('sensor_data', 'cold_temp'), 4, signed=True, scale=1.0),
+    FieldSpec(('sensor_data', 'hot_internal_temp'), 5, signed=True, scale=1.0),
+    FieldSpec(('sensor_data', 'hot_outlet_temp'), 6, signed=True, scale=1.0),
+    # 2. 밸브 상태 - NOS 1~5 (DATA14-18, 인덱스 13-17), FEED 1~15 (DATA19-33, 인덱스 18-32)
+    *(FieldSpec(('valve_states', 'nos', i), 12 + i, enum=FLAG_MAP, default=False) for i in range(1, 6)),
+    *(FieldSpec(('valve_states', 'feed', i), 17 + i, enum=FLAG_MAP, default=False) for i in range(1, 16)),
+    # 3. 필터리드 (DATA39, 인덱스 38) / 4. 전면커버 (DATA40, 인덱스 39)
+    FieldSpec(('filter_detected',), 38, enum=FLAG_MAP, default=False),
+    FieldSpec(('front_cover_detected',), 39, enum=FLAG_MAP, default=False),
+)
+
+
+# ========== CMD 0xF1 (냉동상태조회) - 76바이트 ==========
+F1_DATA_LENGTH = protocol_spec.RESPONSE_LENGTH_MAP[0xF1]
+F1_FIELDS = (
+    # 1. 공조시스템 (DATA1-15, 인덱스 0-14)
+    FieldSpec(('hvac_data', 'refrigerant_valve_state_1'), 0, enum=REFRIGERANT_VALVE_MAP, default='핫가스'),
+    FieldSpec(('hvac_data', 'refrigerant_valve_state_2'), 1, enum=REFRIGERANT_VALVE_MAP, default='핫가스'),
+    FieldSpec(('hvac_data', 'compressor_state'), 2, enum=COMPRESSOR_STATE_MAP, default='미동작'),
+    FieldSpec(('hvac_data', 'stabilization_time'), 3, width=2),
+    FieldSpec(('hvac_data', 'current_rps'), 5),
+    FieldSpec(('hvac_data', 'error_code'), 6),
+    FieldSpec(('hvac_data', 'dc_fan1'), 7, enum=ON_OFF_MAP, default='OFF'),
+    FieldSpec(('hvac_data', 'dc_fan2'), 8, enum=ON_OFF_MAP, default='OFF'),
+    # 2. 냉각 데이터 (DATA16-26, 인덱스 15-25)
+    FieldSpec(('cooling_data', 'operation_state'), 15, enum=COOLING_OPERATION_MAP, default='대기'),
+    FieldSpec(('cooling_data', 'initial_startup'), 16, enum=FLAG_MAP, default=False),
+    FieldSpec(('cooling_data', 'target_rps'), 17),
+    FieldSpec(('cooling_data', 'on_temp'), 18, scale=10.0),
+    FieldSpec(('cooling_data', 'off_temp'), 19, scale=10.0),
+    FieldSpec(('cooling_data', 'cooling_additional_time'), 20, width=2),
+    # 3. 제빙 데이터 (DATA27-46, 인덱스 26-45)
+    FieldSpec(('icemaking_data', 'ice_step'), 26),
+    FieldSpec(('icemaking_data', 'target_rps'), 27),
+    FieldSpec(('icemaking_data', 'icemaking_time'), 28, width=2),
+    FieldSpec(('icemaking_data', 'water_capacity'), 30, width=2),
+    FieldSpec(('icemaking_data', 'swing_on_time'), 32),
+    FieldSpec(('icemaking_data', 'swing_off_time'), 33),
+    FieldSpec(('icemaking_data', 'tray_position'), 34),
+    FieldSpec(('icemaking_data', 'ice_jam_state'), 35),
+    # 4. 보냉 데이터 (DATA47-61, 인덱스 46-60) - 목표온도는 부호-크기 표현, 0.1℃ 단위
+    FieldSpec(('refrigeration_data', 'target_rps'), 47),
+    FieldSpec(('refrigeration_data', 'target_temp'), 48, signed=True, scale=10.0),
+    FieldSpec(('refrigeration_data', 'target_first_temp'), 49, signed=True, scale=10.0),
+    FieldSpec(('refrigeration_data', 'cur_tray_position'), 50),  # 트레이 위치 (0:제빙, 1:탈빙, 2:이동중, 3:에러)
+    # 5. 드레인 탱크 (DATA62-70, 인덱스 61-69)
+    FieldSpec(('drain_tank_data', 'low_level'), 61, enum=DETECT_MAP, default='미감지'),
+    FieldSpec(('drain_tank_data', 'high_level'), 62, enum=DETECT_MAP, default='미감지'),
+    FieldSpec(('drain_tank_data', 'water_level_state'), 63, enum=WATER_LEVEL_MAP, default='비어있음'),
+    FieldSpec(('drain_pump_data', 'operation_state'), 64, enum=ON_OFF_MAP, default='OFF'),
+    # 6. 얼음탱크 커버 (DATA71, 인덱스 70)
+    FieldSpec(('tank_cover_data', 'state'), 70),
+)
+
+
+# ========== CMD 0xF2 (순간온수상태조회) - 1바이트 ==========
+# 사양서 시트가 아직 비어 있어 펌웨어 F2_HEATING_SYSTEM_DATA_FIELD 구조체 기준으로 정의
+F2_DATA_LENGTH = 1
+F2_FIELDS = (
+    # 1. 온수 시스템 (DATA1, 인덱스 0) - u8HeatingOpStatus (펌웨어 정의값 그대로 표시)
+    FieldSpec(('heating_data', 'operation_status'), 0),
+)
+
+
+def _convert(field, raw):
+    """필드 정의에 따라 원시값(raw)을 표시값으로 변환 (컴파일 시에만 사용)"""
+    value = raw
+    if field.signed:
+        sign_bit = 0x80 << (8 * (field.width - 1))
+        value = -(raw & (sign_bit - 1)) if raw & sign_bit else raw
+    if field.scale is not None:
+        value = float(value) / field.scale
+    if field.enum is not None:
+        value = field.enum.get(value, field.default)
+    return value
+
+
+class StatusSchema:
+    """필드 정의 목록을 struct.Struct + 변환 테이블로 컴파일한 상태응답 스키마"""
+    
+    def __init__(self, cmd, data_length, fields):
+        """
+        Args:
+            cmd: CMD 값 (0xF0, 0xF1 등)
+            data_length: DATA FIELD 길이 (바이트)
+            fields: FieldSpec 목록
+        """
+        self.cmd = cmd
+        self.data_length = data_length
+        self.fields = tuple(sorted(fields, key=lambda f: f.offset))
+        
+        self.struct = self._compile_struct()
+        
+        # decode(data_field) -> dict
+        # DATA FIELD(bytes / bytearray / memoryview, data_length 이상)를 StatusResponseHandler와
+        # 동일한 구조의 딕셔너리로 디코딩
+        self.decode = self._compile_decoder()
+    
+    def _compile_struct(self):
+        """오프셋 순서대로 struct 포맷 생성 (필드 사이 빈 구간은 pad 바이트 'x')"""
+        endians = {f.endian for f in self.fields if f.width > 1}
+        if len(endians) > 1:
+            raise ValueError(f"CMD 0x{self.cmd:02X} 스키마에 엔디안이 섞여 있습니다: {endians}")
+        prefix = '<' if endians == {'little'} else '>'
+        
+        fmt = [prefix]
+        position = 0
+        for field in self.fields:
+            if field.width not in (1, 2):
+                raise ValueError(f"지원하지 않는 필드 길이: {field.path} ({field.width}바이트)")
+            if field.offset < position:
+                raise ValueError(f"필드 구간이 겹칩니다: {field.path} (오프셋 {field.offset})")
+            if field.offset > position:
+                fmt.append(f'{field.offset - position}x')
+            fmt.append('B' if field.width == 1 else 'H')
+            position = field.offset + field.width
+        
+        if position > self.data_length:
+            raise ValueError(f"CMD 0x{self.cmd:02X} 필드가 DATA FIELD 길이({self.data_length})를 벗어납니다")
+        return struct.Struct(''.join(fmt))
+    
+    def _compile_decoder(self):
+        """
+        필드 정의로부터 디코딩 함수를 생성
+        unpack_from 결과를 딕셔너리 리터럴에 바로 채우는 함수를 만들어, 프레임마다 필드 목록을
+        순회하지 않도록 합니다. 1바이트 필드의 변환(부호-크기, 스케일, 표시값)은 256개 결과를
+        미리 계산한 테이블 조회로 처리합니다.
+        """
+        namespace = {'_unpack_from': self.struct.unpack_from}
+        tree = {}
+        for index, field in enumerate(self.fields):
+            expr = f'_v[{index}]'
+            if field.signed or field.scale is not None or field.enum is not None:
+                name = f'_t{index}'
+                if field.width == 1:
+                    namespace[name] = tuple(_convert(field, raw) for raw in range(256))
+                    expr = f'{name}[_v[{index}]]'
+                else:
+                    namespace[name] = lambda raw, field=field: _convert(field, raw)
+                    expr = f'{name}(_v[{index}])'
+            
+            node = tree
+            for key in field.path[:-1]:
+                node = node.setdefault(key, {})
+            node[field.path[-1]] = expr
+        
+        def render(node):
+            items = ', '.join(f'{key!r}: {render(value) if isinstance(value, dict) else value}'
+                              for key, value in node.items())
+            return '{' + items + '}'
+        
+        source = (
+            'def decode(data_field):\n'
+            '    _v = _unpack_from(data_field)\n'
+            f'    return {render(tree)}\n'
+        )
+        exec(compile(source, f'<status_schema 0x{self.cmd:02X}>', 'exec'), namespace)
+        return namespace['decode']
+
+
+# 모듈 로드 시 1회 컴파일
+F0_SCHEMA = StatusSchema(0xF0, F0_DATA_LENGTH, F0_FIELDS)
+F1_SCHEMA = StatusSchema(0xF1, F1_DATA_LENGTH, F1_FIELDS)
+F2_SCHEMA = StatusSchema(0xF2, F2_DATA_LENGTH, F2_FIELDS)
+
+SCHEMAS = {
+    0xF0: F0_SCHEMA,
+    0xF1: F1_SCHEMA,
+    0xF2: F2_SCHEMA
+}
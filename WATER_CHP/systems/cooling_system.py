@@ -254,11 +254,13 @@ class CoolingSystem:
                 self.log_communication(f"  추가시간: {additional_time}초", "gray")
                 self.log_communication(f"  DATA FIELD (HEX): {hex_data}", "gray")
                 
-                # CMD 0xB1 패킷 전송 (우선순위, 응답을 받을 때까지 재전송)
-                success, message = self.comm.send_packet(0xB1, bytes(data_field), priority=True, retry_until_response=True)
+                # CMD 0xB1 요청 전송 (우선순위, 응답을 받을 때까지 재전송, 메인의 에코 응답으로 적용 확인)
+                future = self.comm.send_request(0xB1, bytes(data_field))
+                error = future.exception() if future.done() and not future.cancelled() else None
                 
-                if success:
+                if error is None:
                     self.log_communication(f"  전송 요청 성공 (CMD 0xB1, 5바이트, 우선순위 큐 추가됨)", "green")
+                    future.add_done_callback(lambda f: self.root.after(0, self._on_control_response, f))
                     
                     # 입력 모드 비활성화
                     self.edit_mode = False
@@ -273,13 +275,22 @@ class CoolingSystem:
                     self.send_btn.config(text="입력모드")
                     
                 else:
-                    self.log_communication(f"  전송 실패: {message}", "red")
+                    self.log_communication(f"  전송 실패: {error}", "red")
                     
             except ValueError:
                 messagebox.showerror("오류", "올바른 숫자를 입력해주세요.")
             except Exception as e:
                 self.log_communication(f"냉각 제어 오류: {str(e)}", "red")
     
+    def _on_control_response(self, future):
+        """CMD 0xB1 요청 결과 처리 (send_request의 Future 완료 시 GUI 스레드에서 호출)"""
+        if future.cancelled():
+            self.log_communication("[냉각 제어] 이전 CMD 0xB1 요청 취소 (새 요청으로 대체 또는 연결 해제)", "gray")
+        elif future.exception() is not None:
+            self.log_communication(f"[냉각 제어] 적용 확인 실패: {future.exception()}", "red")
+        else:
+            self.log_communication("[냉각 제어] 메인 적용 확인 (CMD 0xB1 응답 수신)", "green")
+    
     def update_data(self, new_data):
         """데이터 업데이트"""
         self.data.update(new_data)
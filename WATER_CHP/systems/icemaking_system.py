@@ -10,18 +10,20 @@ import constants
 class IcemakingSystem:
     """제빙 시스템 클래스"""
     
-    def __init__(self, root, comm, log_callback, apply_table_callback=None):
+    def __init__(self, root, comm, log_callback, apply_table_callback=None, upload_table_callback=None):
         """
         Args:
             root: Tkinter 루트 윈도우
             comm: SerialCommunication 객체
             log_callback: 로그 출력 콜백 함수
             apply_table_callback: 제빙테이블 적용 콜백 함수 (gui_main의 apply_icemaking_table)
+            upload_table_callback: 제빙테이블 전체 전송 콜백 함수 (gui_main의 upload_freezing_table)
         """
         self.root = root
         self.comm = comm
         self.log_communication = log_callback
         self.apply_table_callback = apply_table_callback
+        self.upload_table_callback = upload_table_callback
         
         # 데이터 저장소
         self.data = {
@@ -53,6 +55,8 @@ class IcemakingSystem:
         # GUI 위젯 참조
         self.labels = {}
         self.send_btn = None
+        self.table_btn = None
+        self.upload_btn = None
     
     def create_widgets(self, parent):
         """제빙 섹션 GUI 위젯 생성"""
@@ -183,6 +187,13 @@ class IcemakingSystem:
                                    command=self._apply_freezing_table, state="disabled")
         self.table_btn.pack(fill=tk.X)
         
+        # 제빙테이블 전체 전송 버튼 (46행 일괄 전송)
+        upload_btn_frame = ttk.Frame(icemaking_frame)
+        upload_btn_frame.grid(row=12, column=0, sticky=(tk.W, tk.E), pady=(5, 1))
+        self.upload_btn = ttk.Button(upload_btn_frame, text="제빙테이블 전체 전송",
+                                     command=self._upload_freezing_table, state="disabled")
+        self.upload_btn.pack(fill=tk.X)
+        
         icemaking_frame.columnconfigure(0, weight=1)
         
         return icemaking_frame
@@ -427,12 +438,21 @@ class IcemakingSystem:
         else:
             self.log_communication("제빙테이블 적용 기능이 연결되지 않았습니다.", "red")
     
+    def _upload_freezing_table(self):
+        """제빙테이블 전체 전송 버튼 클릭 시 호출"""
+        if self.upload_table_callback:
+            self.upload_table_callback()
+        else:
+            self.log_communication("제빙테이블 전체 전송 기능이 연결되지 않았습니다.", "red")
+    
     def set_connection_state(self, connected):
         """연결 상태에 따라 버튼 활성화/비활성화"""
         if self.send_btn:
             self.send_btn.config(state="normal" if connected else "disabled")
         if self.table_btn:
             self.table_btn.config(state="normal" if connected else "disabled")
+        if self.upload_btn:
+            self.upload_btn.config(state="normal" if connected else "disabled")
     
     def get_data(self):
         """현재 데이터 반환"""
@@ -0,0 +1,267 @@
+"""
+제빙테이블 일괄 전송 모듈
+제빙테이블(입수온도 46행 × 외기온도 46열)을 CMD 0xB3 행 단위로 전송합니다.
+행마다 응답(CMD 0xF1)을 기다린 뒤 다음 행을 보내고(stop-and-wait),
+행별 재전송 / 타임아웃은 SerialCommunication의 RetransmitManager로 처리합니다.
+
+- 응답 매칭: F1 응답에는 행 인덱스가 없으므로 응답 1개가 가장 먼저 보낸 미응답 행 1개를 완료 (개수 기준)
+  → 전송하는 동안 상태조회(F0/F1/F2)를 일시 중지하고, 이미 보낸 상태조회의 응답이 끝난 뒤 첫 행 전송
+- 응답 대기 행 수(window): 1만 지원 - 응답을 기다리는 행이 2개 이상이면 요청이 메인에 도착하지 않은 행을
+  다음 행의 F1 응답이 완료시켜 그 행이 빠진 채 전송이 끝남 (응답을 행과 연결할 수 있는 펌웨어에서만 확장 가능)
+- 행 전송 간격: 메인(App_Comm.c)은 응답을 보내기 전까지 들어온 바이트를 버리므로 요청 + 응답 전송 시간 이상
+- 재전송 간격: 응답이 늦게 도착해서 같은 행에 응답이 2번 오면 다음 행이 잘못 완료되므로
+  측정한 행당 처리 시간의 2배 이상으로 사용
+- 결과: 완료 행 수, 전송 시도 수, 전송 바이트, 걸린 시간, 처리량, 행별 응답 시간
+
+참고: 현재 메인 펌웨어(SetFreezingTable)는 받은 행을 제빙시간 테이블 1행에 덮어쓰므로
+      전체 전송 후 적용되는 값은 마지막으로 보낸 행입니다. (device_simulator.py는 행별로 보관)
+
+사용 예:
+    uploader = TableUploader(comm)
+    future = uploader.start(table_data['table_data'])
+    print(future.result()['rows_per_s'])
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from poll_scheduler import FRAME_OVERHEAD, BITS_PER_BYTE
+from retransmit import TABLE_ROW_POLICY
+
+
+TABLE_CMD = 0xB3
+TABLE_RESPONSE_CMD = 0xF1
+TABLE_ROWS = 46             # 입수온도 행 수
+TABLE_COLUMNS = 46          # 외기온도 열 수
+ROW_DATA_LENGTH = 1 + TABLE_COLUMNS * 2  # DATA1: 행 인덱스, DATA2~93: 46개 값 × 2바이트
+
+
+def build_row_field(row_index, values):
+    """
+    제빙테이블 1행의 CMD 0xB3 DATA FIELD 생성
+    
+    Args:
+        row_index: 입수온도 인덱스 (0~45)
+        values: 외기온도 46개 열의 제빙시간 (ms, 0~65535 범위로 제한)
+    
+    Returns:
+        bytes: 93바이트 (행 인덱스 1바이트 + 값마다 상위 바이트, 하위 바이트)
+    """
+    if not 0 <= row_index <= 0xFF:
+        raise ValueError(f"잘못된 행 인덱스: {row_index}")
+    if len(values) < TABLE_COLUMNS:
+        raise ValueError(f"제빙테이블 행의 값이 부족합니다: {len(values)}개 (필요: {TABLE_COLUMNS}개)")
+    
+    data_field = bytearray(ROW_DATA_LENGTH)
+    data_field[0] = row_index
+    for col_idx in range(TABLE_COLUMNS):
+        value = min(max(int(values[col_idx]), 0), 0xFFFF)
+        data_field[1 + col_idx * 2] = value >> 8
+        data_field[2 + col_idx * 2] = value & 0xFF
+    return bytes(data_field)
+
+
+class TableUploader:
+    """제빙테이블 행을 전송하고 행별 응답을 확인 (행마다 응답 후 다음 행 전송)"""
+    
+    POLL_OWNER = 'table_upload'     # pause_heartbeat / resume_heartbeat 주체 이름
+    TURNAROUND = 0.01               # 행 전송 간격에 더하는 메인 응답 준비 시간 (초)
+    
+    def __init__(self, comm, window=1, row_timeout=5.0, max_attempts=5, poll_quiet_timeout=2.0):
+        """
+        Args:
+            comm: SerialCommunication 객체
+            window: 응답을 기다릴 수 있는 최대 행 수 (F1 응답에 행 인덱스가 없으므로 1만 지원)
+            row_timeout: 행별 응답 대기 최대 시간 (초, 재전송 포함)
+            max_attempts: 행별 최대 전송 횟수 (첫 전송 포함)
+            poll_quiet_timeout: 상태조회 일시 중지 후 이미 보낸 조회의 응답을 기다리는 최대 시간 (초)
+        """
+        if window != 1:
+            raise ValueError(f"F1 응답을 행과 연결할 수 없어 응답 대기 행 수는 1만 지원합니다: {window}")
+        self.comm = comm
+        self.window = window
+        self.row_timeout = row_timeout
+        self.max_attempts = max_attempts
+        self.poll_quiet_timeout = poll_quiet_timeout
+        
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._cancelled = False
+        self.progress = (0, 0)      # 현재 전송의 (완료 행 수, 전체 행 수)
+        self.last_result = None     # 마지막 전송 결과 (start()가 반환한 Future의 결과와 같음)
+    
+    @property
+    def busy(self):
+        """전송 중 여부"""
+        with self._lock:
+            return self._thread is not None and self._thread.is_alive()
+    
+    def row_spacing(self):
+        """행 전송 간격 (초, B3 요청 + F1 응답 전송 시간 + 응답 준비 시간)"""
+        baudrate = self.comm.current_baudrate or 9600
+        size = (FRAME_OVERHEAD + ROW_DATA_LENGTH +
+                FRAME_OVERHEAD + self.comm.protocol.STATUS_RESPONSE_LENGTHS[TABLE_RESPONSE_CMD])
+        return size * BITS_PER_BYTE / int(baudrate) + self.TURNAROUND
+    
+    def row_policy(self, service_time=None):
+        """
+        행별 재전송 정책 (set_policy로 지정한 CMD 0xB3 정책, 없으면 retransmit.TABLE_ROW_POLICY 기준, 앞 행을 취소하지 않음)
+        
+        Args:
+            service_time: 측정한 행당 처리 시간 (초, 연속한 응답 간격의 평활값, None이면 row_spacing())
+        """
+        base = self.comm.retransmit.policy_for(TABLE_CMD, TABLE_ROW_POLICY)
+        per_row = max(self.row_spacing(), service_time or 0.0)
+        interval = max(base.interval, 2 * max(1, self.window) * per_row)
+        return base.replace(response_cmd=TABLE_RESPONSE_CMD, interval=interval, timeout=self.row_timeout,
+                            max_attempts=self.max_attempts, supersede=False)
+    
+    def start(self, table_rows, rows=None, on_progress=None):
+        """
+        전송 시작 (전송 스레드에서 처리, 이미 전송 중이면 RuntimeError)
+        
+        Args:
+            table_rows: 제빙테이블 값 (행마다 외기온도 46개 열, ExcelSheetSelector의 'table_data')
+            rows: 보낼 행 인덱스 목록 (기본값: 전체 행, 보낸 순서대로 전송)
+            on_progress: 행이 완료될 때마다 호출 (on_progress(완료 행 수, 전체 행 수), 전송 스레드에서 호출)
+        
+        Returns:
+            concurrent.futures.Future: 결과 dict로 완료 (실패해도 예외 대신 'error'에 사유)
+                {'completed', 'error', 'rows'(완료 행 수), 'total_rows', 'attempts'(재전송 포함 전송 수),
+                 'bytes'(전송 바이트), 'quiet_wait'(상태조회 응답 대기, 초), 'elapsed'(첫 전송 ~ 마지막 응답, 초),
+                 'rows_per_s', 'bytes_per_s'(완료 행 기준), 'ack_ms'(행별 전송 ~ 응답 시간 목록)}
+        """
+        if rows is None:
+            rows = range(len(table_rows))
+        fields = [(row, build_row_field(row, table_rows[row])) for row in rows]
+        
+        future = Future()
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                raise RuntimeError("제빙테이블 전송이 이미 진행 중입니다")
+            self._cancelled = False
+            self._wake.clear()
+            self.progress = (0, len(fields))
+            self._thread = threading.Thread(target=self._run, args=(fields, on_progress, future),
+                                            name='TableUpload', daemon=True)
+            self._thread.start()
+        return future
+    
+    def cancel(self):
+        """전송 취소 (응답 대기 중인 행은 재전송 중지)"""
+        self._cancelled = True
+        self._wake.set()
+    
+    def _run(self, fields, on_progress, future):
+        """전송 스레드"""
+        comm = self.comm
+        result = {
+            'completed': False,
+            'error': None,
+            'rows': 0,
+            'total_rows': len(fields),
+            'attempts': 0,
+            'bytes': 0,
+            'quiet_wait': 0.0,
+            'elapsed': 0.0,
+            'rows_per_s': 0.0,
+            'bytes_per_s': 0.0,
+            'ack_ms': []
+        }
+        frame_length = FRAME_OVERHEAD + ROW_DATA_LENGTH
+        attempts_before = comm.retransmit.get_stats().get(TABLE_CMD, {}).get('attempts', 0)
+        
+        comm.pause_heartbeat(owner=self.POLL_OWNER)
+        try:
+            quiet_started = time.monotonic()
+            quiet = comm.wait_poll_quiet(self.poll_quiet_timeout)
+            result['quiet_wait'] = time.monotonic() - quiet_started
+            if not quiet:
+                result['error'] = "상태조회 응답 대기 시간 초과"
+                return
+            
+            spacing = self.row_spacing()
+            service = None  # 행당 처리 시간 평활값 (초)
+            last_done = None
+            pending = deque(fields)
+            inflight = []   # [행 인덱스, Future, 전송 시각, 완료 시각]
+            started = time.monotonic()
+            next_send = started
+            
+            while True:
+                self._wake.clear()
+                if self._cancelled:
+                    result['error'] = "전송 취소"
+                    break
+                
+                # 완료된 행 정리 (응답은 보낸 순서대로 완료되고, 타임아웃 / 연결 해제는 전송 중단)
+                for item in [item for item in inflight if item[1].done()]:
+                    inflight.remove(item)
+                    row, row_future, sent_at, done_at = item
+                    if row_future.cancelled():
+                        result['error'] = f"행 {row} 전송 취소됨 (연결 해제)"
+                    elif row_future.exception() is not None:
+                        result['error'] = f"행 {row} 응답 없음: {row_future.exception()}"
+                    else:
+                        done_at = done_at or time.monotonic()
+                        result['rows'] += 1
+                        result['ack_ms'].append((done_at - sent_at) * 1000)
+                        sample = done_at - (sent_at if last_done is None else max(sent_at, last_done))
+                        service = sample if service is None else 0.875 * service + 0.125 * sample
+                        last_done = done_at
+                        self.progress = (result['rows'], len(fields))
+                        if on_progress is not None:
+                            on_progress(result['rows'], len(fields))
+                if result['error'] is not None or not (pending or inflight):
+                    break
+                
+                now = time.monotonic()
+                if pending and len(inflight) < max(1, self.window):
+                    if now >= next_send:
+                        row, field = pending.popleft()
+                        item = [row, None, now, None]
+                        item[1] = comm.send_request(TABLE_CMD, field, priority=False,
+                                                    policy=self.row_policy(service))
+                        item[1].add_done_callback(lambda _, item=item: self._on_row_done(item))
+                        inflight.append(item)
+                        next_send = now + spacing
+                        continue
+                    self._wake.wait(next_send - now)
+                else:
+                    self._wake.wait()
+            
+            for item in inflight:
+                item[1].cancel()
+            
+            elapsed = time.monotonic() - started
+            result['completed'] = result['error'] is None
+            result['elapsed'] = elapsed
+            if elapsed > 0:
+                result['rows_per_s'] = result['rows'] / elapsed
+                result['bytes_per_s'] = result['rows'] * frame_length / elapsed
+        finally:
+            result['attempts'] = comm.retransmit.get_stats().get(TABLE_CMD, {}).get('attempts', 0) - attempts_before
+            result['bytes'] = result['attempts'] * frame_length
+            comm.resume_heartbeat(owner=self.POLL_OWNER)
+            self.last_result = result
+            future.set_result(result)
+    
+    def _on_row_done(self, item):
+        """행 Future 완료 콜백 (수신 / 타이머 스레드) - 완료 시각 기록 후 전송 스레드 깨움"""
+        item[3] = time.monotonic()
+        self._wake.set()
+    
+    @staticmethod
+    def format_result(result):
+        """결과 dict를 1줄 요약 문자열로 변환"""
+        acks = result['ack_ms']
+        ack_text = (f", 응답 {min(acks):.0f}/{sum(acks) / len(acks):.0f}/{max(acks):.0f}ms(최소/평균/최대)"
+                    if acks else "")
+        text = (f"{result['rows']}/{result['total_rows']}행, {result['attempts']}회 전송, "
+                f"{result['elapsed']:.2f}초, {result['rows_per_s']:.1f}행/s, "
+                f"{result['bytes_per_s']:.0f}B/s{ack_text}")
+        if result['error'] is not None:
+            text += f" - {result['error']}"
+        return text
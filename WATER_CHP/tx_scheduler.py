@@ -0,0 +1,227 @@
+"""
+송신 스케줄러 모듈
+우선순위 큐 2개를 10ms 간격으로 번갈아 확인하던 송신 방식을 대신하여, 하나의 우선순위 힙과
+조건 변수(threading.Condition)로 송신 스레드를 깨웁니다. 대기 중인 프레임이 없으면 송신 스레드는
+깨어나지 않습니다.
+
+- 우선순위: PRIORITY_COMMAND(제어 명령/재전송) > PRIORITY_NORMAL(일반 전송) > PRIORITY_POLL(상태조회)
+- 같은 우선순위에서는 전송 마감 시각이 빠른 프레임부터, 마감 시각이 같으면 먼저 들어온 순서로 전송
+- 전송 마감 시각(deadline)이 지난 프레임은 전송하지 않고 버림 (다음 주기/재전송이 대신함, on_expired로 알림)
+- dedup=True로 넣은 프레임은 바이트 단위로 같은 프레임이 이미 대기 중이면 추가하지 않음
+- CMD별 대기 시간(큐에 들어간 시각 ~ 송신 스레드가 꺼낸 시각) 통계
+- get_batch: 이미 대기 중인 프레임을 우선순위 순으로 한 번에 꺼냄 (송신 묶음 전송용)
+- discard: 특정 우선순위의 대기 프레임을 버림 (상태조회 일시 중지 시 이미 들어간 상태조회 제거)
+"""
+import heapq
+import threading
+import time
+
+
+# 우선순위 (값이 작을수록 먼저 전송)
+PRIORITY_COMMAND = 0    # 제어 명령 (기존 우선순위 큐, B1/B2/B4 재전송 포함)
+PRIORITY_NORMAL = 1     # 일반 전송 (기존 일반 큐)
+PRIORITY_POLL = 2       # 상태조회 (F0/F1/F2 Heartbeat)
+
+_NO_DEADLINE = float('inf')
+
+
+class TxScheduler:
+    """우선순위 / 전송 마감 시각 기반 송신 대기열"""
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []         # [우선순위, 마감 시각(ns), 순번, 패킷, CMD, 넣은 시각(ns), 중복 키]
+        self._pending = {}      # 중복 키(패킷 바이트) → 대기 중인 항목
+        self._seq = 0
+        self._closed = False
+        self._stats = {}        # CMD → [전송 수, 중복 제외 수, 마감 초과 수, 대기 합계(ns), 최대 대기(ns)]
+        self.on_submit = None   # 프레임 추가 알림 함수 (io_reactor처럼 조건 변수로 대기하지 않는 송신 측용)
+        self.on_expired = None  # 마감 시각이 지나 버린 프레임 알림 함수 on_expired(패킷, 우선순위) (꺼낸 스레드에서 호출)
+    
+    def __len__(self):
+        with self._cond:
+            return len(self._heap)
+    
+    def submit(self, packet, priority=PRIORITY_NORMAL, deadline=None, dedup=False):
+        """
+        전송할 패킷 추가
+        
+        Args:
+            packet: 전송할 패킷 (STX ~ ETX)
+            priority: 우선순위 (PRIORITY_*)
+            deadline: 전송 마감 시각 (time.monotonic_ns 기준, None이면 마감 없음)
+            dedup: True이면 같은 패킷이 이미 대기 중일 때 추가하지 않음 (상태조회/재전송용)
+        
+        Returns:
+            bool: 대기열에 추가했으면 True, 닫혀 있거나 중복으로 제외했으면 False
+        """
+        cmd = packet[2] if len(packet) > 2 else None
+        key = bytes(packet) if dedup else None
+        
+        with self._cond:
+            if self._closed:
+                return False
+            if key is not None and key in self._pending:
+                self._cmd_stats(cmd)[1] += 1
+                return False
+            
+            entry = [priority, _NO_DEADLINE if deadline is None else deadline, self._seq,
+                     packet, cmd, time.monotonic_ns(), key]
+            self._seq += 1
+            heapq.heappush(self._heap, entry)
+            if key is not None:
+                self._pending[key] = entry
+            self._cond.notify()
+        
+        if self.on_submit is not None:
+            self.on_submit()
+        return True
+    
+    def get(self, timeout=None):
+        """
+        다음에 전송할 패킷을 꺼냄 (대기 중인 프레임이 없으면 추가될 때까지 대기)
+        
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 추가되거나 close()될 때까지 대기)
+        
+        Returns:
+            bytes: 전송할 패킷, 시간 초과 또는 close()되었으면 None
+        """
+        batch = self.get_batch(1, timeout)
+        return batch[0] if batch else None
+    
+    def get_batch(self, max_frames, timeout=None, max_bytes=None):
+        """
+        전송할 패킷을 우선순위 순으로 여러 개 꺼냄 (첫 패킷은 get()처럼 대기, 나머지는 이미 대기 중인 것만)
+        
+        Args:
+            max_frames: 최대 패킷 수
+            timeout: 첫 패킷 최대 대기 시간 (초, None이면 추가되거나 close()될 때까지 대기)
+            max_bytes: 최대 합계 바이트 수 (첫 패킷은 크기와 관계없이 포함, None이면 제한 없음)
+        
+        Returns:
+            list: 전송할 패킷 목록, 시간 초과 또는 close()되었으면 빈 목록
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        expired = []
+        batch = []
+        
+        with self._cond:
+            while True:
+                now_ns = time.monotonic_ns()
+                packet = self._pop_locked(now_ns, expired)
+                if packet is not None:
+                    break
+                if self._closed:
+                    break
+                if end is None:
+                    self._cond.wait()
+                else:
+                    remaining = end - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            
+            if packet is not None:
+                batch.append(packet)
+                size = len(packet)
+                while len(batch) < max_frames and self._heap:
+                    if max_bytes is not None and size + len(self._heap[0][3]) > max_bytes:
+                        break
+                    packet = self._pop_locked(now_ns, expired)
+                    if packet is None:
+                        break
+                    batch.append(packet)
+                    size += len(packet)
+        
+        # 버린 프레임 알림은 잠금 밖에서 (알림 함수가 다시 submit할 수 있도록)
+        if expired and self.on_expired is not None:
+            for packet, priority in expired:
+                self.on_expired(packet, priority)
+        return batch
+    
+    def _pop_locked(self, now_ns, expired):
+        """마감 시각이 지나지 않은 다음 패킷을 꺼냄 (없으면 None, 버린 프레임은 expired에 추가, 호출 측에서 잠금 보유)"""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            priority, deadline, _, packet, cmd, queued_ns, key = entry
+            if key is not None:
+                self._pending.pop(key, None)
+            
+            stats = self._cmd_stats(cmd)
+            if deadline < now_ns:
+                stats[2] += 1
+                expired.append((packet, priority))
+                continue
+            
+            wait = now_ns - queued_ns
+            stats[0] += 1
+            stats[3] += wait
+            if wait > stats[4]:
+                stats[4] = wait
+            return packet
+        return None
+    
+    def discard(self, priority):
+        """
+        우선순위가 priority인 대기 프레임을 모두 버림
+        
+        Returns:
+            int: 버린 프레임 수
+        """
+        with self._cond:
+            kept = [entry for entry in self._heap if entry[0] != priority]
+            dropped = len(self._heap) - len(kept)
+            if dropped:
+                for entry in self._heap:
+                    if entry[0] == priority and entry[6] is not None:
+                        self._pending.pop(entry[6], None)
+                heapq.heapify(kept)
+                self._heap = kept
+            return dropped
+    
+    def open(self):
+        """대기열 사용 시작 (연결 시 호출, 이전 연결의 대기 프레임은 버림)"""
+        with self._cond:
+            self._heap.clear()
+            self._pending.clear()
+            self._closed = False
+    
+    def close(self):
+        """대기열 닫기 (대기 중인 프레임은 버리고 get()에서 대기 중인 스레드를 깨움)"""
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._pending.clear()
+            self._cond.notify_all()
+    
+    def _cmd_stats(self, cmd):
+        """CMD별 통계 항목 (없으면 생성, 호출 측에서 잠금 보유)"""
+        stats = self._stats.get(cmd)
+        if stats is None:
+            stats = self._stats[cmd] = [0, 0, 0, 0, 0]
+        return stats
+    
+    def get_stats(self):
+        """
+        CMD별 송신 대기 통계 반환
+        
+        Returns:
+            dict: {CMD: {'sent', 'deduped', 'expired', 'avg_wait_ms', 'max_wait_ms'}}
+        """
+        with self._cond:
+            return {
+                cmd: {
+                    'sent': sent,
+                    'deduped': deduped,
+                    'expired': expired,
+                    'avg_wait_ms': total / sent / 1e6 if sent else 0.0,
+                    'max_wait_ms': longest / 1e6
+                }
+                for cmd, (sent, deduped, expired, total, longest) in self._stats.items()
+            }
+    
+    def reset_stats(self):
+        """송신 대기 통계 초기화"""
+        with self._cond:
+            self._stats.clear()